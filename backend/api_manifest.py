@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import (
     API_JSON_FILE,
@@ -12,7 +13,9 @@ from config import (
     API_MANIFEST_URL,
     HTTP_PROXY_TIMEOUT_SECONDS,
 )
+from http_cache import conditional_get
 from http_client import ensure_http_client, get_http_client
+from host_health import host_health
 from logger import logger
 from utils import (
     backend_path,
@@ -25,6 +28,12 @@ from utils import (
 _APIS_INIT_DONE = False
 _INIT_APIS_LAST_MESSAGE = ""
 
+APPID_PLACEHOLDER = "<appid>"
+
+# Parsed api.json keyed on its (mtime_ns, size); see load_api_manifest().
+_MANIFEST_LOCK = threading.Lock()
+_MANIFEST_CACHE: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]]]] = None
+
 
 def init_apis(content_script_query: str = "") -> str:
     """Initialise the free API manifest if it has not been loaded yet."""
@@ -47,7 +56,7 @@ def init_apis(content_script_query: str = "") -> str:
             # Try primary URL first
             try:
                 logger.log(f"InitApis: Fetching manifest from {API_MANIFEST_URL}")
-                resp = client.get(API_MANIFEST_URL)
+                resp = host_health.call(API_MANIFEST_URL, lambda: conditional_get(client, API_MANIFEST_URL))
                 resp.raise_for_status()
                 manifest_text = resp.text
                 logger.log(
@@ -57,7 +66,10 @@ def init_apis(content_script_query: str = "") -> str:
                 logger.warn(f"InitApis: Primary URL failed ({primary_err}), trying proxy...")
                 try:
                     logger.log(f"InitApis: Fetching manifest from proxy {API_MANIFEST_PROXY_URL}")
-                    resp = client.get(API_MANIFEST_PROXY_URL, timeout=HTTP_PROXY_TIMEOUT_SECONDS)
+                    resp = host_health.call(
+                        API_MANIFEST_PROXY_URL,
+                        lambda: conditional_get(client, API_MANIFEST_PROXY_URL, timeout=HTTP_PROXY_TIMEOUT_SECONDS),
+                    )
                     resp.raise_for_status()
                     manifest_text = resp.text
                     logger.log(
@@ -72,6 +84,7 @@ def init_apis(content_script_query: str = "") -> str:
         normalized = normalize_manifest_text(manifest_text) if manifest_text else ""
         if normalized:
             write_text(api_json_path, normalized)
+            invalidate_api_manifest()
             count = count_apis(normalized)
             message = f"No API's Configured, Loaded {count} Free Ones :D"
             logger.log(f"InitApis: Wrote new api.json with {count} entries")
@@ -110,17 +123,23 @@ def fetch_free_apis_now(content_script_query: str = "") -> str:
         manifest_text = ""
 
         try:
-            resp = client.get(API_MANIFEST_URL, follow_redirects=True)
+            resp = host_health.call(
+                API_MANIFEST_URL, lambda: conditional_get(client, API_MANIFEST_URL, follow_redirects=True)
+            )
             resp.raise_for_status()
             manifest_text = resp.text
             logger.log("LuaTools: Fetched manifest from primary URL")
         except Exception as primary_err:
             logger.warn(f"LuaTools: Primary manifest URL failed ({primary_err}), trying proxy...")
             try:
-                resp = client.get(
+                resp = host_health.call(
                     API_MANIFEST_PROXY_URL,
-                    follow_redirects=True,
-                    timeout=HTTP_PROXY_TIMEOUT_SECONDS,
+                    lambda: conditional_get(
+                        client,
+                        API_MANIFEST_PROXY_URL,
+                        follow_redirects=True,
+                        timeout=HTTP_PROXY_TIMEOUT_SECONDS,
+                    ),
                 )
                 resp.raise_for_status()
                 manifest_text = resp.text
@@ -136,6 +155,7 @@ def fetch_free_apis_now(content_script_query: str = "") -> str:
             return json.dumps({"success": False, "error": "Empty manifest"})
 
         write_text(backend_path(API_JSON_FILE), normalized)
+        invalidate_api_manifest()
         try:
             data = json.loads(normalized)
             count = len([entry for entry in data.get("api_list", [])])
@@ -148,9 +168,56 @@ def fetch_free_apis_now(content_script_query: str = "") -> str:
         return json.dumps({"success": False, "error": str(exc)})
 
 
-def load_api_manifest() -> List[Dict[str, Any]]:
-    """Return the list of enabled APIs from api.json."""
-    path = backend_path(API_JSON_FILE)
+def invalidate_api_manifest() -> None:
+    """Drop the parsed manifest so the next load re-reads api.json."""
+    global _MANIFEST_CACHE
+    with _MANIFEST_LOCK:
+        _MANIFEST_CACHE = None
+
+
+def api_url(api: Dict[str, Any], appid: Any) -> str:
+    """Build the download URL of ``api`` for ``appid`` from its pre-split template."""
+    parts = api.get("url_parts")
+    if not parts:
+        return str(api.get("url", "")).replace(APPID_PLACEHOLDER, str(appid))
+    return str(appid).join(parts)
+
+
+def _compile_api_entry(entry: Any) -> Optional[Dict[str, Any]]:
+    """Validate one api_list entry; returns None for disabled or unusable ones.
+
+    A URL without ``<appid>`` is kept and used verbatim, as before the
+    manifest was precompiled. Entries whose ``url`` is not a string or whose
+    status codes are not numbers are dropped: they used to abort the whole
+    download job when reached.
+    """
+    if not isinstance(entry, dict) or not entry.get("enabled", False):
+        return None
+    template = entry.get("url", "")
+    name = entry.get("name", "Unknown")
+    if not isinstance(template, str):
+        logger.warn(f"LuaTools: Ignoring API '{name}' with a non-string URL")
+        return None
+    try:
+        success_code = int(entry.get("success_code", 200))
+        unavailable_code = int(entry.get("unavailable_code", 404))
+    except (TypeError, ValueError):
+        logger.warn(f"LuaTools: Ignoring API '{name}' with non-numeric status codes")
+        return None
+    compiled = dict(entry)
+    compiled.update(
+        {
+            "name": str(name),
+            "success_code": success_code,
+            "unavailable_code": unavailable_code,
+            # A single part (no placeholder) joins back to the template itself.
+            "url_parts": tuple(template.split(APPID_PLACEHOLDER)),
+        }
+    )
+    return compiled
+
+
+def _parse_api_manifest(path: str) -> List[Dict[str, Any]]:
     text = read_text(path)
     normalized = normalize_manifest_text(text)
     if normalized and normalized != text:
@@ -164,8 +231,37 @@ def load_api_manifest() -> List[Dict[str, Any]]:
     try:
         data = json.loads(text or "{}")
         apis = data.get("api_list", [])
-        return [api for api in apis if api.get("enabled", False)]
     except Exception as exc:
         logger.error(f"LuaTools: Failed to parse api.json: {exc}")
         return []
+    if not isinstance(apis, list):
+        return []
+    return [compiled for compiled in map(_compile_api_entry, apis) if compiled is not None]
+
+
+def load_api_manifest() -> List[Dict[str, Any]]:
+    """Return the list of enabled APIs from api.json.
+
+    The parsed list is cached per process and re-read only when the file's
+    mtime or size changes, or after :func:`invalidate_api_manifest`.
+    """
+    global _MANIFEST_CACHE
+    path = backend_path(API_JSON_FILE)
+    with _MANIFEST_LOCK:
+        try:
+            st = os.stat(path)
+        except OSError:
+            _MANIFEST_CACHE = None
+            return []
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        if _MANIFEST_CACHE is None or _MANIFEST_CACHE[0] != fingerprint:
+            apis = _parse_api_manifest(path)
+            try:
+                # Normalising may have rewritten the file; key on what is on disk now.
+                st = os.stat(path)
+                fingerprint = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+            _MANIFEST_CACHE = (fingerprint, apis)
+        return list(_MANIFEST_CACHE[1])
 
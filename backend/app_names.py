@@ -0,0 +1,138 @@
+"""Persistent app-name cache for the LuaTools backend.
+
+Names live in the ``app_names`` table of the shared SQLite cache together with
+where they came from and when, so a name resolved once (in particular through
+the Steam store API) survives a restart. A bounded LRU in front of the table
+keeps hot lookups off the database. A lookup that found nothing is stored as an
+empty name and only trusted for ``APP_NAME_NEGATIVE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from config import APP_NAME_LRU_SIZE, APP_NAME_NEGATIVE_TTL_SECONDS, CACHE_DB_FILE
+from logger import logger
+from paths import backend_path
+
+SOURCE_LOCAL = "local"  # journal or applist index, both already on disk
+SOURCE_STORE = "store"
+
+
+class AppNameCache:
+    def __init__(self, capacity: int = APP_NAME_LRU_SIZE):
+        self.db_path = backend_path(CACHE_DB_FILE)
+        self.capacity = max(1, int(capacity))
+        self._lock = threading.Lock()
+        # appid -> (name, updated_at); "" is a negative result
+        self._lru: "OrderedDict[int, Tuple[str, int]]" = OrderedDict()
+        self._db_ready = False
+
+    def _ensure_db(self):
+        # Created on first use so importing this module never writes to disk.
+        if not self._db_ready:
+            self._init_db()
+            self._db_ready = True
+
+    def _init_db(self):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS app_names (
+                        appid INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        updated_at INTEGER NOT NULL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: App name DB init failed: {e}")
+
+    def _remember_locked(self, appid: int, name: str, updated_at: int) -> None:
+        self._lru[appid] = (name, updated_at)
+        self._lru.move_to_end(appid)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _usable(name: str, updated_at: int) -> bool:
+        return bool(name) or time.time() - updated_at < APP_NAME_NEGATIVE_TTL_SECONDS
+
+    def get(self, appid: int) -> Optional[str]:
+        """The cached name for ``appid``; ``""`` for a fresh negative, None if unknown or expired."""
+        with self._lock:
+            hit = self._lru.get(appid)
+            if hit is not None:
+                self._lru.move_to_end(appid)
+        if hit is None:
+            try:
+                self._ensure_db()
+                with sqlite3.connect(self.db_path) as conn:
+                    row = conn.execute(
+                        "SELECT name, updated_at FROM app_names WHERE appid = ?", (appid,)
+                    ).fetchone()
+            except Exception as e:
+                logger.warn(f"SkyTools: App name read failed for {appid}: {e}")
+                return None
+            if row is None:
+                return None
+            hit = (row[0] or "", int(row[1] or 0))
+            with self._lock:
+                self._remember_locked(appid, *hit)
+        name, updated_at = hit
+        return name if self._usable(name, updated_at) else None
+
+    def remember(self, appid: int, name: str, source: str, persist: bool = True) -> None:
+        """Cache ``name`` (or ``""`` for "not found") for ``appid``.
+
+        ``persist=False`` only fills the LRU, for names that are cheap to
+        resolve again (the applist index).
+        """
+        name = (name or "").strip()
+        now = int(time.time())
+        with self._lock:
+            self._remember_locked(appid, name, now)
+        if not persist:
+            return
+        try:
+            self._ensure_db()
+            with sqlite3.connect(self.db_path) as conn:
+                if name:
+                    conn.execute("""
+                        INSERT INTO app_names (appid, name, source, updated_at)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(appid) DO UPDATE SET
+                            name = excluded.name,
+                            source = excluded.source,
+                            updated_at = excluded.updated_at
+                    """, (appid, name, source, now))
+                else:
+                    # Never let a failed lookup replace a name we already know.
+                    conn.execute("""
+                        INSERT INTO app_names (appid, name, source, updated_at)
+                        VALUES (?, '', ?, ?)
+                        ON CONFLICT(appid) DO UPDATE SET
+                            source = excluded.source,
+                            updated_at = excluded.updated_at
+                        WHERE app_names.name = ''
+                    """, (appid, source, now))
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: App name update failed for {appid}: {e}")
+
+
+# Global instance
+app_names = AppNameCache()
+
+
+__all__ = [
+    "AppNameCache",
+    "SOURCE_LOCAL",
+    "SOURCE_STORE",
+    "app_names",
+]
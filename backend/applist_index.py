@@ -0,0 +1,273 @@
+"""Compact, memory-mapped applist index for the LuaTools backend.
+
+``all-appids.json`` is converted once into a binary file next to it::
+
+    header | appids: uint32[count] (sorted) | offsets: uint32[count + 1] | names (UTF-8)
+
+The file is memory-mapped and a lookup is a binary search over the appid
+array followed by one slice of the name blob, so names stay in the page cache
+instead of living as Python objects for the life of the Steam process. The
+header records the size/mtime of the JSON it was built from; a mismatch
+triggers a rebuild.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterator, Optional, TextIO
+
+from logger import logger
+
+INDEX_MAGIC = b"LTAL"
+INDEX_FORMAT = 1
+# magic, format, byte order (0 little / 1 big), entry count, source size, source mtime_ns
+_HEADER = struct.Struct("<4sBBxxIQq")
+_NATIVE_ORDER = 0 if sys.byteorder == "little" else 1
+_MAX_PENDING_CHARS = 1024 * 1024  # no single applist entry comes close to this
+
+
+def iter_json_array(handle: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of the top-level JSON array in ``handle`` one at a time.
+
+    Only one chunk plus the element being decoded is held in memory. Raises
+    ``ValueError`` if the document is not a single well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def refill() -> None:
+        nonlocal buf, pos, eof
+        chunk = handle.read(chunk_size)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ""
+            refill()
+
+    if peek() != "[":
+        raise ValueError("applist is not a JSON array")
+    pos += 1
+    if peek() == "]":
+        pos += 1
+    else:
+        while True:
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A bare number ending at the buffer edge may continue in the next chunk.
+                    if end < len(buf) or eof:
+                        break
+                except ValueError:
+                    if eof or len(buf) - pos > _MAX_PENDING_CHARS:
+                        raise ValueError("applist is truncated or malformed") from None
+                refill()
+            pos = end
+            yield value
+            separator = peek()
+            pos += 1
+            if separator == "]":
+                break
+            if not separator:
+                raise ValueError("applist is truncated or malformed")
+            if separator != ",":
+                raise ValueError(f"unexpected {separator!r} in applist")
+    if peek():
+        raise ValueError("trailing data after applist")
+
+
+def build_index(source_path: str, index_path: str) -> int:
+    """Convert the applist JSON at ``source_path`` into an index file; returns the entry count."""
+    st = os.stat(source_path)
+    appids = array("I")
+    offsets = array("I", [0])
+    names = bytearray()
+    with open(source_path, "r", encoding="utf-8") as handle:
+        for entry in iter_json_array(handle):
+            if not isinstance(entry, dict):
+                continue
+            name = entry.get("name")
+            if not isinstance(name, str) or not name.strip():
+                continue
+            try:
+                appid = int(entry.get("appid"))
+            except (TypeError, ValueError):
+                continue
+            if not 0 < appid <= 0xFFFFFFFF:
+                continue
+            appids.append(appid)
+            names += name.strip().encode("utf-8")
+            offsets.append(len(names))
+
+    if any(a >= b for a, b in zip(appids, appids[1:])):
+        # Sort by appid; for duplicates the last entry wins, as with a dict.
+        order = sorted(range(len(appids)), key=appids.__getitem__)
+        sorted_ids = array("I")
+        sorted_offsets = array("I", [0])
+        sorted_names = bytearray()
+        for position, index in enumerate(order):
+            if position + 1 < len(order) and appids[order[position + 1]] == appids[index]:
+                continue
+            sorted_ids.append(appids[index])
+            sorted_names += names[offsets[index] : offsets[index + 1]]
+            sorted_offsets.append(len(sorted_names))
+        appids, offsets, names = sorted_ids, sorted_offsets, sorted_names
+
+    tmp_path = f"{index_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT, _NATIVE_ORDER, len(appids), st.st_size, st.st_mtime_ns))
+            appids.tofile(out)
+            offsets.tofile(out)
+            out.write(names)
+        os.replace(tmp_path, index_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+        raise
+    return len(appids)
+
+
+class AppListIndex:
+    """Thread-safe reader over an index built by :func:`build_index`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._appids: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+        self._names: Optional[memoryview] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _release_locked(self) -> None:
+        for view in (self._appids, self._offsets, self._names):
+            if view is not None:
+                view.release()
+        self._appids = self._offsets = self._names = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def _map_locked(self, index_path: str, source_path: str) -> bool:
+        """Map ``index_path`` if it is intact and was built from the current ``source_path``."""
+        try:
+            st = os.stat(source_path)
+            handle = open(index_path, "rb")
+        except OSError:
+            return False
+        try:
+            header = handle.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError("short header")
+            magic, fmt, order, count, size, mtime_ns = _HEADER.unpack(header)
+            if (magic, fmt, order) != (INDEX_MAGIC, INDEX_FORMAT, _NATIVE_ORDER):
+                raise ValueError("foreign or outdated index")
+            if (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+                raise ValueError("built from a different applist")
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            handle.close()
+            return False
+
+        ids_start = _HEADER.size
+        offsets_start = ids_start + 4 * count
+        names_start = offsets_start + 4 * (count + 1)
+        view = memoryview(mapped)
+        try:
+            if len(mapped) < names_start:
+                raise ValueError("truncated index")
+            offsets = view[offsets_start:names_start].cast("I")
+            if names_start + offsets[count] != len(mapped):
+                offsets.release()
+                raise ValueError("truncated index")
+        except Exception:
+            view.release()
+            mapped.close()
+            handle.close()
+            return False
+
+        self._file = handle
+        self._map = mapped
+        self._appids = view[ids_start:offsets_start].cast("I")
+        self._offsets = offsets
+        self._names = view[names_start:]
+        self._count = count
+        view.release()
+        return True
+
+    def open(self, source_path: str, index_path: str) -> int:
+        """Map the index for ``source_path``, (re)building it first when stale.
+
+        Returns the number of entries available.
+        """
+        with self._lock:
+            self._release_locked()
+            if self._map_locked(index_path, source_path):
+                return self._count
+            logger.log("LuaTools: Building applist index...")
+            count = build_index(source_path, index_path)
+            logger.log(f"LuaTools: Applist index built with {count} entries")
+            if not self._map_locked(index_path, source_path):
+                raise RuntimeError("Applist index could not be opened after building it")
+            return self._count
+
+    def install(self, built_source: str, built_index: str, source_path: str, index_path: str) -> int:
+        """Move a freshly built source/index pair into place and map it.
+
+        The old mapping is released first so the files can be replaced on
+        Windows; lookups wait on the lock only for the two renames.
+        """
+        with self._lock:
+            self._release_locked()
+            os.replace(built_index, index_path)
+            os.replace(built_source, source_path)
+            if not self._map_locked(index_path, source_path):
+                raise RuntimeError("Applist index could not be opened after installing it")
+            return self._count
+
+    def lookup(self, appid: int) -> str:
+        with self._lock:
+            if not self._count:
+                return ""
+            index = bisect_left(self._appids, appid)
+            if index >= self._count or self._appids[index] != appid:
+                return ""
+            start, end = self._offsets[index], self._offsets[index + 1]
+            return bytes(self._names[start:end]).decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        with self._lock:
+            self._release_locked()
+
+
+__all__ = [
+    "AppListIndex",
+    "build_index",
+    "iter_json_array",
+]
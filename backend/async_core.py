@@ -0,0 +1,138 @@
+"""Asyncio I/O core running on a single background thread.
+
+The Millennium RPC surface is synchronous, so this module owns one event loop
+on a dedicated daemon thread and exposes a small bridge: synchronous code
+submits coroutines with :func:`submit` (returns a ``concurrent.futures.Future``)
+or :func:`run_sync` (blocks for the result). Coroutines share per-profile
+``httpx.AsyncClient`` instances from :func:`get_async_client`, so concurrent
+requests multiplex on one loop instead of costing a thread each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+import httpx  # type: ignore
+
+from http_client import DEFAULT_PROFILE, client_options
+from logger import logger
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+
+# Only touched from the loop thread.
+_ASYNC_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+    asyncio.set_event_loop(loop)
+    loop.call_soon(ready.set)
+    try:
+        loop.run_forever()
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        except Exception:
+            pass
+        loop.close()
+
+
+def ensure_event_loop(context: str = "") -> asyncio.AbstractEventLoop:
+    """Start the background event loop if needed and return it."""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is not None and _LOOP_THREAD is not None and _LOOP_THREAD.is_alive():
+            return _LOOP
+
+        prefix = f"{context}: " if context else ""
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        thread = threading.Thread(
+            target=_run_loop, args=(loop, ready), name="LuaToolsAsyncIO", daemon=True
+        )
+        thread.start()
+        ready.wait(5)
+        _LOOP = loop
+        _LOOP_THREAD = thread
+        logger.log(f"{prefix}Async I/O loop started")
+        return loop
+
+
+def submit(coro: Awaitable[Any]) -> concurrent.futures.Future:
+    """Schedule ``coro`` on the background loop and return a thread-safe future."""
+    loop = ensure_event_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run ``coro`` on the background loop and block until it finishes.
+
+    Must not be called from the loop thread itself.
+    """
+    if _LOOP_THREAD is not None and threading.current_thread() is _LOOP_THREAD:
+        raise RuntimeError("run_sync called from the async I/O loop thread")
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def get_async_client(profile: str = DEFAULT_PROFILE) -> httpx.AsyncClient:
+    """Return the shared AsyncClient for ``profile``. Call only from coroutines on the loop."""
+    client = _ASYNC_CLIENTS.get(profile)
+    if client is None:
+        client = httpx.AsyncClient(**client_options(profile))
+        _ASYNC_CLIENTS[profile] = client
+    return client
+
+
+async def _close_async_clients() -> None:
+    clients = list(_ASYNC_CLIENTS.values())
+    _ASYNC_CLIENTS.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+
+def shutdown_event_loop(context: str = "", timeout: float = 5.0) -> None:
+    """Close async clients, cancel outstanding tasks and stop the loop thread."""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        loop, thread = _LOOP, _LOOP_THREAD
+        _LOOP = None
+        _LOOP_THREAD = None
+    if loop is None or thread is None or not thread.is_alive():
+        return
+
+    async def _drain() -> None:
+        await _close_async_clients()
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is not current:
+                task.cancel()
+
+    try:
+        asyncio.run_coroutine_threadsafe(_drain(), loop).result(timeout)
+    except Exception as exc:
+        logger.warn(f"Async I/O loop drain failed: {exc}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    prefix = f"{context}: " if context else ""
+    logger.log(f"{prefix}Async I/O loop stopped")
+
+
+__all__ = [
+    "ensure_event_loop",
+    "get_async_client",
+    "run_sync",
+    "shutdown_event_loop",
+    "submit",
+]
@@ -2,22 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import json
 import os
 import subprocess
-import threading
 import time
 import zipfile
 from typing import Any, Dict, Optional
 
 from api_manifest import store_last_message
+from async_core import submit
 from config import (
     UPDATE_CHECK_INTERVAL_SECONDS,
     UPDATE_CONFIG_FILE,
     UPDATE_PENDING_INFO,
     UPDATE_PENDING_ZIP,
 )
+from executor import PRIORITY_BACKGROUND, executor
+from http_cache import conditional_get, is_cache_hit
 from http_client import ensure_http_client, get_http_client
+from host_health import host_health
 from logger import logger
 from paths import backend_path, get_plugin_dir
 from steam_utils import detect_steam_install_path
@@ -28,7 +33,7 @@ from utils import (
     write_json,
 )
 
-_UPDATE_CHECK_THREAD: Optional[threading.Thread] = None
+_UPDATE_CHECK_FUTURE: Optional[concurrent.futures.Future] = None
 
 
 def apply_pending_update_if_any() -> str:
@@ -93,11 +98,16 @@ def _fetch_github_latest(cfg: Dict[str, Any]) -> Dict[str, Any]:
     is_custom_repo = (owner != "madoiscool")
     
     try:
-        resp = client.get(endpoint, headers=headers, follow_redirects=True)
+        resp = host_health.call(
+            endpoint, lambda: conditional_get(client, endpoint, headers=headers, follow_redirects=True)
+        )
         resp.raise_for_status()
         data = resp.json()
         tag_name = str(data.get("tag_name", "")).strip()
-        logger.log("AutoUpdate: GitHub API request successful")
+        if is_cache_hit(resp):
+            logger.log("AutoUpdate: GitHub release unchanged (304), using cached response")
+        else:
+            logger.log("AutoUpdate: GitHub API request successful")
     except Exception as api_err:
         # If it's a 404 on a custom repo, it's likely just "No Releases Yet"
         is_404 = "404" in str(api_err)
@@ -114,7 +124,9 @@ def _fetch_github_latest(cfg: Dict[str, Any]) -> Dict[str, Any]:
             
         try:
             proxy_url = "https://luatools.vercel.app/api/github-latest"
-            resp = client.get(proxy_url, follow_redirects=True, timeout=15)
+            resp = host_health.call(
+                proxy_url, lambda: conditional_get(client, proxy_url, follow_redirects=True, timeout=15)
+            )
             resp.raise_for_status()
             data = resp.json()
             tag_name = str(data.get("tag_name", "")).strip()
@@ -155,7 +167,7 @@ def _fetch_github_latest(cfg: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _download_and_extract_update(zip_url: str, pending_zip: str) -> bool:
-    client = ensure_http_client("AutoUpdate: download")
+    client = ensure_http_client("AutoUpdate: download", profile="transfer")
     try:
         logger.log(f"AutoUpdate: Downloading {zip_url} -> {pending_zip}")
         with client.stream("GET", zip_url, follow_redirects=True) as response:
@@ -191,7 +203,9 @@ def check_for_update_once() -> str:
             return ""
         try:
             logger.log(f"AutoUpdate: Fetching manifest {manifest_url}")
-            resp = client.get(manifest_url, follow_redirects=True)
+            resp = host_health.call(
+                manifest_url, lambda: conditional_get(client, manifest_url, follow_redirects=True)
+            )
             resp.raise_for_status()
             manifest = resp.json()
             latest_version = str(manifest.get("version", "")).strip()
@@ -240,28 +254,32 @@ def check_for_update_once() -> str:
         return f"Update {latest_version} downloaded. Restart Steam to apply."
 
 
-def _periodic_update_check_worker():
+async def _periodic_update_check_loop() -> None:
     while True:
         try:
-            time.sleep(UPDATE_CHECK_INTERVAL_SECONDS)
+            await asyncio.sleep(UPDATE_CHECK_INTERVAL_SECONDS)
             logger.log("AutoUpdate: Running periodic background check...")
-            message = check_for_update_once()
+            # The check itself is blocking I/O; run it on the background lane
+            # so it never occupies a worker needed by user-initiated downloads.
+            future = executor.submit(
+                "background", "auto-update", check_for_update_once, priority=PRIORITY_BACKGROUND
+            )
+            message = await asyncio.wrap_future(future) if future is not None else None
             if message:
                 store_last_message(message)
                 logger.log(f"AutoUpdate: Periodic check found update: {message}")
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:
             logger.warn(f"AutoUpdate: Periodic check failed: {exc}")
 
 
 def _start_periodic_update_checks():
-    global _UPDATE_CHECK_THREAD
-    if _UPDATE_CHECK_THREAD is None or not _UPDATE_CHECK_THREAD.is_alive():
-        _UPDATE_CHECK_THREAD = threading.Thread(
-            target=_periodic_update_check_worker, daemon=True
-        )
-        _UPDATE_CHECK_THREAD.start()
+    global _UPDATE_CHECK_FUTURE
+    if _UPDATE_CHECK_FUTURE is None or _UPDATE_CHECK_FUTURE.done():
+        _UPDATE_CHECK_FUTURE = submit(_periodic_update_check_loop())
         logger.log(
-            f"AutoUpdate: Started periodic update check thread (every {UPDATE_CHECK_INTERVAL_SECONDS / 3600} hours)"
+            f"AutoUpdate: Scheduled periodic update check (every {UPDATE_CHECK_INTERVAL_SECONDS / 3600} hours)"
         )
 
 
@@ -269,11 +287,9 @@ def _check_and_donate_keys() -> None:
     """Check donateKeys setting and send keys if enabled."""
     try:
         from donate_keys import extract_valid_decryption_keys, send_donation_keys
-        from settings.manager import _get_values_locked
-        
-        values = _get_values_locked()
-        general = values.get("general", {})
-        donate_keys_enabled = general.get("donateKeys", False)
+        from settings.manager import get_setting_value
+
+        donate_keys_enabled = get_setting_value("general", "donateKeys", False)
         
         if not donate_keys_enabled:
             return
@@ -317,8 +333,8 @@ def _start_initial_check_worker():
 
 
 def start_auto_update_background_check() -> None:
-    """Kick off the initial check in a background thread."""
-    threading.Thread(target=_start_initial_check_worker, daemon=True).start()
+    """Queue the initial check on the background lane."""
+    executor.submit("background", "auto-update", _start_initial_check_worker, priority=PRIORITY_BACKGROUND)
 
 
 def restart_steam_internal() -> bool:
@@ -1,14 +1,24 @@
 import sqlite3
 import os
 import time
+from typing import Dict
 from paths import backend_path
-from config import CACHE_DB_FILE
+from config import CACHE_DB_FILE, SOURCE_OK_TTL_SECONDS, SOURCE_UNAVAILABLE_TTL_SECONDS
 from logger import logger
 
+SOURCE_OK = "ok"
+SOURCE_UNAVAILABLE = "unavailable"
+
 class AppCache:
     def __init__(self):
         self.db_path = backend_path(CACHE_DB_FILE)
-        self._init_db()
+        self._db_ready = False
+
+    def _ensure_db(self):
+        # Created on first use so importing this module never writes to disk.
+        if not self._db_ready:
+            self._init_db()
+            self._db_ready = True
 
     def _init_db(self):
         try:
@@ -22,12 +32,22 @@ class AppCache:
                         last_checked INTEGER
                     )
                 """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS app_source_outcomes (
+                        appid INTEGER NOT NULL,
+                        source TEXT NOT NULL,
+                        outcome TEXT NOT NULL,
+                        checked_at INTEGER NOT NULL,
+                        PRIMARY KEY (appid, source)
+                    )
+                """)
                 conn.commit()
         except Exception as e:
             logger.warn(f"SkyTools: Cache DB init failed: {e}")
 
     def get_cached_app(self, appid: int):
         try:
+            self._ensure_db()
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute(
                     "SELECT mirror_url, token, key, last_checked FROM app_cache WHERE appid = ?", 
@@ -48,6 +68,7 @@ class AppCache:
     def update_cached_app(self, appid: int, mirror_url: str = None, token: str = None, key: str = None):
         try:
             now = int(time.time())
+            self._ensure_db()
             with sqlite3.connect(self.db_path) as conn:
                 conn.execute("""
                     INSERT INTO app_cache (appid, mirror_url, token, key, last_checked)
@@ -62,5 +83,41 @@ class AppCache:
         except Exception as e:
             logger.warn(f"SkyTools: Cache update failed for {appid}: {e}")
 
+    def record_source_outcome(self, appid: int, source: str, outcome: str):
+        """Remember whether ``source`` served ``appid`` (SOURCE_OK) or reported it missing."""
+        try:
+            self._ensure_db()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT INTO app_source_outcomes (appid, source, outcome, checked_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(appid, source) DO UPDATE SET
+                        outcome = excluded.outcome,
+                        checked_at = excluded.checked_at
+                """, (appid, source, outcome, int(time.time())))
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Source outcome update failed for {appid}: {e}")
+
+    def get_source_outcomes(self, appid: int) -> Dict[str, str]:
+        """Outcomes for ``appid`` that are still within their TTL, keyed by source."""
+        now = int(time.time())
+        outcomes: Dict[str, str] = {}
+        try:
+            self._ensure_db()
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT source, outcome, checked_at FROM app_source_outcomes WHERE appid = ?",
+                    (appid,)
+                ).fetchall()
+        except Exception as e:
+            logger.warn(f"SkyTools: Source outcome read failed for {appid}: {e}")
+            return outcomes
+        for source, outcome, checked_at in rows:
+            ttl = SOURCE_OK_TTL_SECONDS if outcome == SOURCE_OK else SOURCE_UNAVAILABLE_TTL_SECONDS
+            if now - int(checked_at or 0) < ttl:
+                outcomes[source] = outcome
+        return outcomes
+
 # Global instance
 cache = AppCache()
@@ -24,11 +24,80 @@ UPDATE_PENDING_INFO = "update_pending.json"
 
 HTTP_TIMEOUT_SECONDS = 15
 HTTP_PROXY_TIMEOUT_SECONDS = 15
+HTTP2_ENABLED = True  # Only takes effect when the optional `h2` package is installed
+
+# Per-call-site HTTP client profiles. Each profile gets its own connection pool
+# so short probes never queue behind multi-minute transfers.
+#   timeouts: connect / read / write / pool, in seconds
+#   limits:   max connections, max idle keep-alive connections, keep-alive expiry
+HTTP_CLIENT_PROFILES = {
+    # JSON APIs: manifests, store lookups, GitHub releases
+    "default": {
+        "connect": 10, "read": HTTP_TIMEOUT_SECONDS, "write": 15, "pool": 10,
+        "max_connections": 10, "max_keepalive": 5, "keepalive_expiry": 30,
+    },
+    # Short-lived HEAD/availability probes
+    "probe": {
+        "connect": 5, "read": 10, "write": 10, "pool": 5,
+        "max_connections": 10, "max_keepalive": 10, "keepalive_expiry": 60,
+    },
+    # Streamed archive downloads (read timeout is per chunk)
+    "transfer": {
+        "connect": 15, "read": 60, "write": 30, "pool": 60,
+        "max_connections": 8, "max_keepalive": 4, "keepalive_expiry": 30,
+    },
+    # Very large single-shot bodies such as the applist
+    "bulk": {
+        "connect": 15, "read": 300, "write": 30, "pool": 60,
+        "max_connections": 2, "max_keepalive": 1, "keepalive_expiry": 15,
+    },
+}
+
+# Whole-request deadline for a single fix availability probe, redirects included
+FIX_PROBE_DEADLINE_SECONDS = 20
+# Extra wait on the RPC thread before a stalled async loop counts as a timeout
+ASYNC_BRIDGE_GRACE_SECONDS = 5
 
 UPDATE_CHECK_INTERVAL_SECONDS = 2 * 60 * 60  # 2 hours
 
+# Worker threads per job lane (see executor.py). Each lane runs one class of
+# work: priority only orders a lane's queue and never pre-empts a running job,
+# so background work gets its own lane instead of sharing "transfer". Callers
+# still pass PRIORITY_BACKGROUND for it; that is a no-op today and only
+# matters if interactive work is ever queued on the same lane.
+JOB_LANE_WORKERS = {
+    "transfer": 2,  # user-started archive downloads
+    "background": 1,  # applist refreshes and update checks; never holds a transfer worker
+    "extract": 1,  # unpacking fix archives into game folders
+    "scan": 1,  # filesystem walks such as un-fix
+}
+
+APPLIST_REFRESH_INTERVAL_SECONDS = 3 * 24 * 60 * 60  # re-check the applist for new releases
+
+JOB_LONG_POLL_MAX_MS = 10_000  # upper bound for WaitForJobUpdate timeouts
+
+FIX_DOWNLOAD_RESUME_ATTEMPTS = 3  # in-job attempts when a fix download drops mid-stream
+FIX_RESUME_CHECKPOINT_BYTES = 8 * 1024 * 1024  # how often the resume sidecar is refreshed
+FIX_PARTIAL_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # kept partial fix archives expire after this
+FIX_PARTIAL_MAX_TOTAL_BYTES = 4 * 1024 * 1024 * 1024  # oldest partials are dropped beyond this
+
 USER_AGENT = "luatools-v61-stplugin-hoe"
 
+CACHE_DB_FILE = "skytools_cache.db"
+
+# How long per-appid source outcomes are trusted when picking where to download from
+SOURCE_OK_TTL_SECONDS = 7 * 24 * 60 * 60  # last source that served the appid is tried first
+SOURCE_UNAVAILABLE_TTL_SECONDS = 60 * 60  # sources that reported the appid missing are skipped
+
+# App-name cache (app_names table in CACHE_DB_FILE)
+APP_NAME_LRU_SIZE = 4096  # names kept in memory in front of the table
+APP_NAME_NEGATIVE_TTL_SECONDS = 6 * 60 * 60  # how long "no name found" is trusted
+
+# Steam store API pacing for app-name lookups (token bucket, see rate_limit.py)
+STORE_API_RATE_PER_SECOND = 3.0
+STORE_API_BURST = 3
+STORE_API_MAX_WAIT_SECONDS = 5.0  # callers give up instead of queueing longer than this
+
 LOADED_APPS_FILE = "loadedappids.txt"
 APPID_LOG_FILE = "appidlogs.txt"
 
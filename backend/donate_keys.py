@@ -9,9 +9,7 @@ from typing import List, Tuple
 from config import USER_AGENT
 from http_client import get_http_client
 from logger import logger
-
-# Import private VDF parser - it's used internally for config.vdf parsing
-from steam_utils import _parse_vdf_simple  # type: ignore
+from vdf import parse_vdf
 
 DONATION_URL = "http://167.235.229.108/donatekeys/send"
 DONATION_HEADERS = {
@@ -76,7 +74,7 @@ def parse_config_vdf_decryption_keys(steam_path: str) -> List[Tuple[str, str]]:
         return []
     
     try:
-        vdf_data = _parse_vdf_simple(vdf_content)
+        vdf_data = parse_vdf(vdf_content)
     except Exception as exc:
         logger.warn(f"LuaTools: Failed to parse config.vdf: {exc}")
         return []
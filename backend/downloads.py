@@ -3,108 +3,134 @@
 from __future__ import annotations
 
 import base64
+import io
 import json
 import os
 import re
+import shutil
 import threading
 import time
-from typing import Dict
+import zlib
+from typing import Any, Dict, List, Optional
 
 import Millennium  # type: ignore
 
-from api_manifest import load_api_manifest
+from api_manifest import api_url, load_api_manifest
+from app_names import SOURCE_LOCAL, SOURCE_STORE, app_names
+from applist_index import AppListIndex, build_index
+from cache import SOURCE_OK, SOURCE_UNAVAILABLE, cache
 from config import (
-    APPID_LOG_FILE,
-    LOADED_APPS_FILE,
+    APPLIST_REFRESH_INTERVAL_SECONDS,
+    STORE_API_BURST,
+    STORE_API_MAX_WAIT_SECONDS,
+    STORE_API_RATE_PER_SECOND,
     USER_AGENT,
     WEBKIT_DIR_NAME,
     WEB_UI_ICON_FILE,
     WEB_UI_JS_FILE,
 )
+from executor import PRIORITY_BACKGROUND, executor
+from http_cache import remember_validators, validator_headers
 from http_client import ensure_http_client
+from host_health import host_health, is_failure_status, is_transport_error
+from jobs import JobStore
+from journal import journal
 from logger import logger
-from paths import backend_path, public_path
+from paths import public_path
+from rate_limit import SingleFlight, TokenBucket, parse_retry_after
 from steam_utils import detect_steam_install_path, has_lua_for_app
 from utils import count_apis, ensure_temp_download_dir, normalize_manifest_text, read_text, write_text
 
-DOWNLOAD_STATE: Dict[int, Dict[str, any]] = {}
-DOWNLOAD_LOCK = threading.Lock()
+DOWNLOAD_JOBS = JobStore("add")
 
-# Cache for app names to avoid repeated API calls
-APP_NAME_CACHE: Dict[int, str] = {}
-APP_NAME_CACHE_LOCK = threading.Lock()
+# Lua package installation
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+NUMERIC_LUA_RE = re.compile(r"\d+\.lua")
+SET_MANIFEST_ID_RE = re.compile(r"^([^\S\r\n]*)(?=setManifestid\()")
 
-# Rate limiting for Steam API calls
-LAST_API_CALL_TIME = 0
-API_CALL_MIN_INTERVAL = 0.3  # 300ms between calls to avoid 429 errors
+# First-chunk checks used to reject error pages before anything touches disk
+ZIP_MAGIC_PREFIXES = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+MIN_ZIP_BYTES = 22  # an empty archive is just its end-of-central-directory record
+NON_ZIP_CONTENT_TYPES = ("text/html", "text/json", "application/json", "application/problem+json")
 
-# In-memory applist for fallback app name lookup
-APPLIST_DATA: Dict[int, str] = {}
+# Steam store API pacing; concurrent misses for one appid share a single request
+STORE_APPDETAILS_URL = "https://store.steampowered.com/api/appdetails?appids={appid}"
+STORE_API_LIMITER = TokenBucket(STORE_API_RATE_PER_SECOND, STORE_API_BURST)
+STORE_NAME_FLIGHTS = SingleFlight()
+
+# Memory-mapped applist index for fallback app name lookup
+APPLIST_INDEX = AppListIndex()
 APPLIST_LOADED = False
 APPLIST_LOCK = threading.Lock()
 APPLIST_FILE_NAME = "all-appids.json"
+APPLIST_INDEX_FILE_NAME = "all-appids.idx"
+APPLIST_CHECKED_FILE_NAME = "all-appids.checked"
 APPLIST_URL = "https://applist.morrenus.xyz/"
-APPLIST_DOWNLOAD_TIMEOUT = 300  # 5 minutes for large file
+APPLIST_STALE_CHECK_INTERVAL_SECONDS = 60 * 60
+APPLIST_NEXT_CHECK = 0.0
 
 
 def _set_download_state(appid: int, update: dict) -> None:
-    with DOWNLOAD_LOCK:
-        state = DOWNLOAD_STATE.get(appid) or {}
-        state.update(update)
-        DOWNLOAD_STATE[appid] = state
+    DOWNLOAD_JOBS.update(appid, update)
 
 
 def _get_download_state(appid: int) -> dict:
-    with DOWNLOAD_LOCK:
-        return DOWNLOAD_STATE.get(appid, {}).copy()
-
-
-def _loaded_apps_path() -> str:
-    return backend_path(LOADED_APPS_FILE)
-
-
-def _appid_log_path() -> str:
-    return backend_path(APPID_LOG_FILE)
+    return DOWNLOAD_JOBS.snapshot(appid)
 
 
 def _fetch_app_name(appid: int) -> str:
     """Fetch app name with rate limiting and caching.
     
     Fallback order:
-    1. In-memory cache
-    2. Applist file (in-memory) - checked before web requests
-    3. Steam API (web request as final resort)
+    1. App-name cache (LRU in front of the SQLite table)
+    2. Loaded-apps journal and applist index - checked before web requests
+    3. Steam API (web request as final resort), unless a recent lookup already came up empty
     """
-    global LAST_API_CALL_TIME
-
     # Check cache first
-    with APP_NAME_CACHE_LOCK:
-        if appid in APP_NAME_CACHE:
-            cached = APP_NAME_CACHE[appid]
-            if cached:  # Only return if not empty
-                return cached
-
-    # Check applist file before making web requests
-    applist_name = _get_app_name_from_applist(appid)
-    if applist_name:
-        # Cache the result from applist
-        with APP_NAME_CACHE_LOCK:
-            APP_NAME_CACHE[appid] = applist_name
-        return applist_name
+    cached = app_names.get(appid)
+    if cached:
+        return cached
+
+    # Check the journal and applist before making web requests
+    local_name = _get_loaded_app_name(appid)
+    if local_name:
+        # Both are already on disk; only keep the name in memory
+        app_names.remember(appid, local_name, SOURCE_LOCAL, persist=False)
+        return local_name
+
+    if cached == "":
+        # Negative result that has not expired yet
+        return ""
 
     # Steam API as final resort (web request)
-    # Rate limiting: wait if needed
-    with APP_NAME_CACHE_LOCK:
-        time_since_last_call = time.time() - LAST_API_CALL_TIME
-        if time_since_last_call < API_CALL_MIN_INTERVAL:
-            time.sleep(API_CALL_MIN_INTERVAL - time_since_last_call)
-        LAST_API_CALL_TIME = time.time()
+    return STORE_NAME_FLIGHTS.do(appid, lambda: _fetch_app_name_from_store(appid))
+
+
+def _fetch_app_name_from_store(appid: int) -> str:
+    """Ask the Steam store for ``appid``'s name, paced by STORE_API_LIMITER.
+
+    Only a definite answer is cached as a negative; throttling and transport
+    errors return "" so the next caller can try again.
+    """
+    # A flight that finished just before this one started may have stored it.
+    cached = app_names.get(appid)
+    if cached is not None:
+        return cached
+
+    if not STORE_API_LIMITER.acquire(max_wait=STORE_API_MAX_WAIT_SECONDS):
+        logger.log(f"LuaTools: Store API is throttled, skipping name lookup for {appid}")
+        return ""
 
     client = ensure_http_client("LuaTools: _fetch_app_name")
     try:
-        url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
-        resp = client.get(url, follow_redirects=True, timeout=10)
+        url = STORE_APPDETAILS_URL.format(appid=appid)
+        resp = client.get(url, follow_redirects=True)
+        if resp.status_code == 429:
+            pause = STORE_API_LIMITER.penalize(parse_retry_after(resp.headers.get("Retry-After")))
+            logger.warn(f"LuaTools: Store API rate limited (429), pausing name lookups for {pause:.0f}s")
+            return ""
         resp.raise_for_status()
+        STORE_API_LIMITER.record_success()
         data = resp.json()
         entry = data.get(str(appid)) or data.get(int(appid)) or {}
         if isinstance(entry, dict):
@@ -113,140 +139,44 @@ def _fetch_app_name(appid: int) -> str:
             if isinstance(name, str) and name.strip():
                 name = name.strip()
                 # Cache the result
-                with APP_NAME_CACHE_LOCK:
-                    APP_NAME_CACHE[appid] = name
+                app_names.remember(appid, name, SOURCE_STORE)
                 return name
     except Exception as exc:
         logger.warn(f"LuaTools: _fetch_app_name failed for {appid}: {exc}")
+        return ""
 
-    # Cache empty result to avoid repeated failed attempts
-    with APP_NAME_CACHE_LOCK:
-        APP_NAME_CACHE[appid] = ""
+    # Cache empty result to avoid repeated failed attempts until it expires
+    app_names.remember(appid, "", SOURCE_STORE)
     return ""
 
 
 def _append_loaded_app(appid: int, name: str) -> None:
-    try:
-        path = _loaded_apps_path()
-        lines = []
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as handle:
-                lines = handle.read().splitlines()
-        prefix = f"{appid}:"
-        lines = [line for line in lines if not line.startswith(prefix)]
-        lines.append(f"{appid}:{name}")
-        with open(path, "w", encoding="utf-8") as handle:
-            handle.write("\n".join(lines) + "\n")
-    except Exception as exc:
-        logger.warn(f"LuaTools: _append_loaded_app failed for {appid}: {exc}")
+    journal.add_loaded_app(appid, name)
 
 
 def _remove_loaded_app(appid: int) -> None:
-    try:
-        path = _loaded_apps_path()
-        if not os.path.exists(path):
-            return
-        with open(path, "r", encoding="utf-8") as handle:
-            lines = handle.read().splitlines()
-        prefix = f"{appid}:"
-        new_lines = [line for line in lines if not line.startswith(prefix)]
-        if len(new_lines) != len(lines):
-            with open(path, "w", encoding="utf-8") as handle:
-                handle.write("\n".join(new_lines) + ("\n" if new_lines else ""))
-    except Exception as exc:
-        logger.warn(f"LuaTools: _remove_loaded_app failed for {appid}: {exc}")
+    journal.remove_loaded_app(appid)
 
 
 def _log_appid_event(action: str, appid: int, name: str) -> None:
-    try:
-        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        line = f"[{action}] {appid} - {name} - {stamp}\n"
-        with open(_appid_log_path(), "a", encoding="utf-8") as handle:
-            handle.write(line)
-    except Exception as exc:
-        logger.warn(f"LuaTools: _log_appid_event failed: {exc}")
+    journal.log_event(action, appid, name)
 
 
 def _preload_app_names_cache() -> None:
-    """Pre-load all app names from loaded_apps, appidlogs, and applist files into memory cache."""
-    # First, load from appidlogs.txt (historical records)
-    try:
-        log_path = _appid_log_path()
-        if os.path.exists(log_path):
-            with open(log_path, "r", encoding="utf-8") as handle:
-                for line in handle.read().splitlines():
-                    # Format: [ACTION - API_NAME] appid - name - timestamp
-                    # Example: [ADDED - Sadie] 945360 - Among Us - 2024-01-15 14:05:04
-                    # Or: [REMOVED] appid - name - timestamp
-                    if "]" in line and " - " in line:
-                        try:
-                            # Extract content after the first ']'
-                            parts = line.split("]", 1)
-                            if len(parts) < 2:
-                                continue
-
-                            content = parts[1].strip()
-                            # Split by " - " to get: appid, name, timestamp (max 3 parts)
-                            content_parts = content.split(" - ", 2)
-
-                            if len(content_parts) >= 2:
-                                appid_str = content_parts[0].strip()
-                                name = content_parts[1].strip()
-
-                                # Try to parse appid
-                                appid = int(appid_str)
-
-                                # Skip "Unknown Game" or "UNKNOWN" entries
-                                if name and not name.startswith("Unknown") and not name.startswith("UNKNOWN"):
-                                    with APP_NAME_CACHE_LOCK:
-                                        APP_NAME_CACHE[appid] = name
-                        except (ValueError, IndexError):
-                            continue
-    except Exception as exc:
-        logger.warn(f"LuaTools: _preload_app_names_cache from logs failed: {exc}")
-
-    # Then, load from loaded_apps.txt (current state - overrides log if present)
+    """Map the applist index so listings can resolve names without web requests."""
     try:
-        path = _loaded_apps_path()
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as handle:
-                for line in handle.read().splitlines():
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        try:
-                            appid = int(parts[0].strip())
-                            name = parts[1].strip()
-                            if name:
-                                with APP_NAME_CACHE_LOCK:
-                                    APP_NAME_CACHE[appid] = name
-                        except (ValueError, IndexError):
-                            continue
-    except Exception as exc:
-        logger.warn(f"LuaTools: _preload_app_names_cache from loaded_apps failed: {exc}")
-    
-    # Finally, load from applist file (as fallback source - doesn't override existing cache)
-    # This ensures applist is available for lookups without web requests
-    try:
-        _load_applist_into_memory()
+        _load_applist_index()
     except Exception as exc:
         logger.warn(f"LuaTools: _preload_app_names_cache from applist failed: {exc}")
 
 
 def _get_loaded_app_name(appid: int) -> str:
-    """Get app name from loadedappids.txt, with applist as fallback."""
-    try:
-        path = _loaded_apps_path()
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as handle:
-                for line in handle.read().splitlines():
-                    if line.startswith(f"{appid}:"):
-                        name = line.split(":", 1)[1].strip()
-                        if name:
-                            return name
-    except Exception:
-        pass
-    
-    # Fallback to applist if not found in loadedappids.txt
+    """Get app name from the loaded-apps journal, with applist as fallback."""
+    name = journal.known_name(appid)
+    if name:
+        return name
+
+    # Fallback to applist if the journal does not know it
     return _get_app_name_from_applist(appid)
 
 
@@ -256,95 +186,178 @@ def _applist_file_path() -> str:
     return os.path.join(temp_dir, APPLIST_FILE_NAME)
 
 
-def _load_applist_into_memory() -> None:
-    """Load the applist JSON file into memory for fast lookups."""
-    global APPLIST_DATA, APPLIST_LOADED
-    
+def _applist_index_path() -> str:
+    return os.path.join(ensure_temp_download_dir(), APPLIST_INDEX_FILE_NAME)
+
+
+def _load_applist_index() -> None:
+    """Map the applist index, building it from the JSON file on first use."""
+    global APPLIST_LOADED
+
     with APPLIST_LOCK:
         if APPLIST_LOADED:
             return
-        
+        APPLIST_LOADED = True  # Mark as loaded to avoid repeated attempts
+
         file_path = _applist_file_path()
         if not os.path.exists(file_path):
             logger.log("LuaTools: Applist file not found, skipping load")
-            APPLIST_LOADED = True  # Mark as loaded to avoid repeated checks
             return
-        
+
         try:
-            logger.log("LuaTools: Loading applist into memory...")
-            with open(file_path, "r", encoding="utf-8") as handle:
-                data = json.load(handle)
-            
-            if isinstance(data, list):
-                count = 0
-                for entry in data:
-                    if isinstance(entry, dict):
-                        appid = entry.get("appid")
-                        name = entry.get("name")
-                        if appid and name and isinstance(name, str) and name.strip():
-                            APPLIST_DATA[int(appid)] = name.strip()
-                            count += 1
-                logger.log(f"LuaTools: Loaded {count} app names from applist into memory")
-            else:
-                logger.warn("LuaTools: Applist file has invalid format (expected array)")
-            
-            APPLIST_LOADED = True
+            count = APPLIST_INDEX.open(file_path, _applist_index_path())
+            logger.log(f"LuaTools: Applist index ready with {count} app names")
         except Exception as exc:
-            logger.warn(f"LuaTools: Failed to load applist into memory: {exc}")
-            APPLIST_LOADED = True  # Mark as loaded to avoid repeated failed attempts
+            logger.warn(f"LuaTools: Failed to load applist index: {exc}")
 
 
 def _get_app_name_from_applist(appid: int) -> str:
-    """Get app name from in-memory applist."""
-    global APPLIST_DATA, APPLIST_LOADED
-    
-    # Ensure applist is loaded
+    """Get app name from the applist index."""
     if not APPLIST_LOADED:
-        _load_applist_into_memory()
-    
-    with APPLIST_LOCK:
-        return APPLIST_DATA.get(int(appid), "")
+        _load_applist_index()
+    try:
+        name = APPLIST_INDEX.lookup(int(appid))
+    except Exception:
+        name = ""
+    if not name:
+        # A miss may be a release newer than our copy of the applist.
+        _maybe_schedule_applist_refresh()
+    return name
+
+
+def _applist_checked_path() -> str:
+    return os.path.join(ensure_temp_download_dir(), APPLIST_CHECKED_FILE_NAME)
+
+
+def _applist_last_checked() -> float:
+    """When the applist was last downloaded or revalidated (0 if never)."""
+    latest = 0.0
+    for path in (_applist_file_path(), _applist_checked_path()):
+        try:
+            latest = max(latest, os.path.getmtime(path))
+        except OSError:
+            pass
+    return latest
+
+
+def _mark_applist_checked() -> None:
+    # A separate marker, so a 304 does not touch the JSON and invalidate its index.
+    try:
+        with open(_applist_checked_path(), "w", encoding="utf-8") as handle:
+            handle.write(str(int(time.time())))
+    except Exception as exc:
+        logger.warn(f"LuaTools: Failed to record applist check time: {exc}")
+
+
+def _applist_is_stale() -> bool:
+    return time.time() - _applist_last_checked() >= APPLIST_REFRESH_INTERVAL_SECONDS
+
+
+def _remove_quietly(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to remove {path}: {exc}")
 
 
 def _ensure_applist_file() -> None:
-    """Download the applist file if it doesn't exist."""
+    """Download the applist if it is missing, or revalidate it once it is stale.
+
+    The body is streamed to a temp file, then parsed incrementally while the
+    new index is built next to the current one; only a complete, well-formed
+    array is swapped in, so a failed or truncated download leaves the working
+    copy untouched.
+    """
+    global APPLIST_LOADED
+
     file_path = _applist_file_path()
-    
+    index_path = _applist_index_path()
+    headers: Dict[str, str] = {}
+
     if os.path.exists(file_path):
-        logger.log("LuaTools: Applist file already exists, skipping download")
-        return
-    
-    logger.log("LuaTools: Applist file not found, downloading...")
-    client = ensure_http_client("LuaTools: DownloadApplist")
-    
+        if not _applist_is_stale():
+            logger.log("LuaTools: Applist file is up to date, skipping download")
+            return
+        headers = validator_headers(APPLIST_URL)
+        logger.log("LuaTools: Applist file is stale, revalidating with server...")
+    else:
+        logger.log("LuaTools: Applist file not found, downloading...")
+    client = ensure_http_client("LuaTools: DownloadApplist", profile="bulk")
+
+    tmp_path = f"{file_path}.download"
+    tmp_index_path = f"{index_path}.download"
     try:
-        resp = client.get(APPLIST_URL, follow_redirects=True, timeout=APPLIST_DOWNLOAD_TIMEOUT)
-        resp.raise_for_status()
-        
-        # Validate JSON format before saving
-        try:
-            data = resp.json()
-            if not isinstance(data, list):
-                logger.warn("LuaTools: Downloaded applist has invalid format (expected array)")
+        with client.stream("GET", APPLIST_URL, headers=headers, follow_redirects=True) as resp:
+            if resp.status_code == 304:
+                logger.log("LuaTools: Applist not modified (304), keeping local file")
+                _mark_applist_checked()
                 return
-        except json.JSONDecodeError as exc:
-            logger.warn(f"LuaTools: Downloaded applist is not valid JSON: {exc}")
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as output:
+                for chunk in resp.iter_bytes():
+                    if chunk:
+                        output.write(chunk)
+
+        try:
+            count = build_index(tmp_path, tmp_index_path)
+        except ValueError as exc:
+            logger.warn(f"LuaTools: Downloaded applist is not a valid JSON array: {exc}")
+            return
+        if not count:
+            logger.warn("LuaTools: Downloaded applist contains no app names, keeping local file")
             return
-        
-        # Save to file
-        with open(file_path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle)
-        
-        logger.log(f"LuaTools: Successfully downloaded and saved applist file ({len(data)} entries)")
+
+        with APPLIST_LOCK:
+            APPLIST_INDEX.install(tmp_path, tmp_index_path, file_path, index_path)
+            APPLIST_LOADED = True
+        # The file itself is the cached body; only keep the validators.
+        remember_validators(APPLIST_URL, resp)
+        _mark_applist_checked()
+        logger.log(f"LuaTools: Successfully downloaded applist file ({count} entries)")
     except Exception as exc:
         logger.warn(f"LuaTools: Failed to download applist file: {exc}")
+    finally:
+        _remove_quietly(tmp_path, tmp_index_path)
+
+
+def _refresh_applist() -> None:
+    _load_applist_index()
+    _ensure_applist_file()
+
+
+def _maybe_schedule_applist_refresh() -> None:
+    """Queue a background applist refresh when the local copy is missing or stale.
+
+    The file check runs at most every APPLIST_STALE_CHECK_INTERVAL_SECONDS so a
+    burst of lookup misses stays cheap.
+    """
+    global APPLIST_NEXT_CHECK
+    now = time.monotonic()
+    if now < APPLIST_NEXT_CHECK:
+        return
+    APPLIST_NEXT_CHECK = now + APPLIST_STALE_CHECK_INTERVAL_SECONDS
+    if os.path.exists(_applist_file_path()) and not _applist_is_stale():
+        return
+    try:
+        executor.submit("background", "applist-refresh", _refresh_applist, priority=PRIORITY_BACKGROUND)
+    except Exception as exc:
+        logger.warn(f"LuaTools: Failed to schedule applist refresh: {exc}")
 
 
 def init_applist() -> None:
-    """Initialize the applist system: download if needed, then load into memory."""
+    """Initialize the applist system without blocking plugin load.
+
+    Mapping the index, any first download and any stale refresh all run as one
+    background job.
+    """
+    global APPLIST_NEXT_CHECK
+
+    APPLIST_NEXT_CHECK = time.monotonic() + APPLIST_STALE_CHECK_INTERVAL_SECONDS
     try:
-        _ensure_applist_file()
-        _load_applist_into_memory()
+        executor.submit("background", "applist-refresh", _refresh_applist, priority=PRIORITY_BACKGROUND)
     except Exception as exc:
         logger.warn(f"LuaTools: Applist initialization failed: {exc}")
 
@@ -353,6 +366,35 @@ def fetch_app_name(appid: int) -> str:
     return _fetch_app_name(appid)
 
 
+def _zip_member_is_installed(path: str, info) -> bool:
+    """True when ``path`` already holds exactly the bytes of zip member ``info``."""
+    try:
+        if os.path.getsize(path) != info.file_size:
+            return False
+        crc = 0
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(EXTRACT_BUFFER_SIZE), b""):
+                crc = zlib.crc32(block, crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
+
+def _extract_member_atomic(archive, info, out_path: str) -> None:
+    """Stream one zip member to ``out_path`` through a temp file and rename it into place."""
+    tmp_path = f"{out_path}.tmp"
+    try:
+        with archive.open(info) as source, open(tmp_path, "wb") as target:
+            shutil.copyfileobj(source, target, EXTRACT_BUFFER_SIZE)
+        os.replace(tmp_path, out_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+        raise
+
+
 def _process_and_install_lua(appid: int, zip_path: str) -> None:
     """Process downloaded zip and install lua file into stplug-in directory."""
     import zipfile
@@ -365,66 +407,63 @@ def _process_and_install_lua(appid: int, zip_path: str) -> None:
     os.makedirs(target_dir, exist_ok=True)
 
     with zipfile.ZipFile(zip_path, "r") as archive:
-        names = archive.namelist()
+        members = [info for info in archive.infolist() if not info.is_dir()]
 
         try:
             depotcache_dir = os.path.join(base_path or "", "depotcache")
             os.makedirs(depotcache_dir, exist_ok=True)
-            for name in names:
+            for info in members:
+                name = info.filename
                 try:
                     if _is_download_cancelled(appid):
                         raise RuntimeError("cancelled")
                     if name.lower().endswith(".manifest"):
-                        pure = os.path.basename(name)
-                        data = archive.read(name)
-                        out_path = os.path.join(depotcache_dir, pure)
-                        with open(out_path, "wb") as manifest_file:
-                            manifest_file.write(data)
+                        out_path = os.path.join(depotcache_dir, os.path.basename(name))
+                        if _zip_member_is_installed(out_path, info):
+                            logger.log(f"LuaTools: Manifest already up to date -> {out_path}")
+                            continue
+                        _extract_member_atomic(archive, info, out_path)
                         logger.log(f"LuaTools: Extracted manifest -> {out_path}")
                 except Exception as manifest_exc:
                     logger.warn(f"LuaTools: Failed to extract manifest {name}: {manifest_exc}")
         except Exception as depot_exc:
             logger.warn(f"LuaTools: depotcache extraction failed: {depot_exc}")
 
-        candidates = []
-        for name in names:
-            pure = os.path.basename(name)
-            if re.fullmatch(r"\d+\.lua", pure):
-                candidates.append(name)
+        candidates = [info for info in members if NUMERIC_LUA_RE.fullmatch(os.path.basename(info.filename))]
 
         if _is_download_cancelled(appid):
             raise RuntimeError("cancelled")
 
         chosen = None
         preferred = f"{appid}.lua"
-        for name in candidates:
-            if os.path.basename(name) == preferred:
-                chosen = name
+        for info in candidates:
+            if os.path.basename(info.filename) == preferred:
+                chosen = info
                 break
         if chosen is None and candidates:
             chosen = candidates[0]
         if not chosen:
             raise RuntimeError("No numeric .lua file found in zip")
 
-        data = archive.read(chosen)
-        try:
-            text = data.decode("utf-8")
-        except Exception:
-            text = data.decode("utf-8", errors="replace")
-
-        processed_lines = []
-        for line in text.splitlines(True):
-            if re.match(r"^\s*setManifestid\(", line) and not re.match(r"^\s*--", line):
-                line = re.sub(r"^(\s*)", r"\1--", line)
-            processed_lines.append(line)
-        processed_text = "".join(processed_lines)
-
         _set_download_state(appid, {"status": "installing"})
         dest_file = os.path.join(target_dir, f"{appid}.lua")
-        if _is_download_cancelled(appid):
-            raise RuntimeError("cancelled")
-        with open(dest_file, "w", encoding="utf-8") as output:
-            output.write(processed_text)
+        tmp_file = f"{dest_file}.tmp"
+        try:
+            # Comment out setManifestid(...) calls while streaming line by line;
+            # newline="" keeps the script's own line endings.
+            with archive.open(chosen) as raw, open(tmp_file, "w", encoding="utf-8", newline="") as output:
+                reader = io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+                for line in reader:
+                    output.write(SET_MANIFEST_ID_RE.sub(r"\1--", line, count=1))
+            if _is_download_cancelled(appid):
+                raise RuntimeError("cancelled")
+            os.replace(tmp_file, dest_file)
+        except Exception:
+            try:
+                os.remove(tmp_file)
+            except Exception:
+                pass
+            raise
         logger.log(f"LuaTools: Installed lua -> {dest_file}")
         _set_download_state(appid, {"installedPath": dest_file})
 
@@ -444,14 +483,30 @@ def _process_and_install_lua(appid: int, zip_path: str) -> None:
 
 
 def _is_download_cancelled(appid: int) -> bool:
-    try:
-        return _get_download_state(appid).get("status") == "cancelled"
-    except Exception:
-        return False
+    return DOWNLOAD_JOBS.is_cancelled(appid)
+
+
+def _reject_non_zip_headers(resp) -> Optional[str]:
+    """Return a reason to drop ``resp`` based on its headers alone, or None."""
+    content_type = resp.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    if content_type in NON_ZIP_CONTENT_TYPES:
+        return f"content-type={content_type}"
+    length = resp.headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) < MIN_ZIP_BYTES:
+        return f"content-length={length}"
+    return None
+
+
+def _reject_non_zip_head(head: bytes) -> Optional[str]:
+    """Return a reason to drop a response whose first bytes are not a zip, or None."""
+    if head[:4] in ZIP_MAGIC_PREFIXES:
+        return None
+    preview = head[:50].decode("utf-8", errors="ignore")
+    return f"magic={head[:4].hex()}, preview={preview!r}"
 
 
 def _download_zip_for_app(appid: int):
-    client = ensure_http_client("LuaTools: download")
+    client = ensure_http_client("LuaTools: download", profile="transfer")
     apis = load_api_manifest()
     if not apis:
         logger.warn("LuaTools: No enabled APIs in manifest")
@@ -460,17 +515,31 @@ def _download_zip_for_app(appid: int):
 
     dest_root = ensure_temp_download_dir()
     dest_path = os.path.join(dest_root, f"{appid}.zip")
-    _set_download_state(
-        appid,
-        {"status": "checking", "currentApi": None, "bytesRead": 0, "totalBytes": 0, "dest": dest_path},
-    )
-
-    for api in apis:
+    job = DOWNLOAD_JOBS.get(appid) or DOWNLOAD_JOBS.start(appid, {})
+    job.set({"status": "checking", "currentApi": None, "bytesRead": 0, "totalBytes": 0, "dest": dest_path})
+
+    # The source that served this appid last is tried first; sources that
+    # recently reported it missing are skipped until their outcome expires.
+    outcomes = cache.get_source_outcomes(appid)
+    ordered = host_health.order_by_health(apis, lambda entry: entry.get("url", ""))
+    ordered.sort(key=lambda entry: 0 if outcomes.get(entry.get("url", "")) == SOURCE_OK else 1)
+
+    skipped_hosts = 0
+    skipped_missing = 0
+    for api in ordered:
         name = api.get("name", "Unknown")
         template = api.get("url", "")
-        success_code = int(api.get("success_code", 200))
-        unavailable_code = int(api.get("unavailable_code", 404))
-        url = template.replace("<appid>", str(appid))
+        success_code = api["success_code"]
+        unavailable_code = api["unavailable_code"]
+        url = api_url(api, appid)
+        if outcomes.get(template) == SOURCE_UNAVAILABLE:
+            logger.log(f"LuaTools: Skipping API '{name}', it reported appid {appid} missing recently")
+            skipped_missing += 1
+            continue
+        if host_health.is_open(url):
+            logger.log(f"LuaTools: Skipping API '{name}', host circuit is open")
+            skipped_hosts += 1
+            continue
         _set_download_state(
             appid, {"status": "checking", "currentApi": name, "bytesRead": 0, "totalBytes": 0}
         )
@@ -479,63 +548,56 @@ def _download_zip_for_app(appid: int):
             headers = {"User-Agent": USER_AGENT}
             if _is_download_cancelled(appid):
                 logger.log(f"LuaTools: Download cancelled before contacting API '{name}'")
+                host_health.release_trial(url)
                 return
+            started = time.monotonic()
             with client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
                 code = resp.status_code
                 logger.log(f"LuaTools: API '{name}' status={code}")
+                if is_failure_status(code):
+                    host_health.record_failure(url, f"HTTP {code}")
+                else:
+                    host_health.record_success(url, time.monotonic() - started)
                 if code == unavailable_code:
+                    cache.record_source_outcome(appid, template, SOURCE_UNAVAILABLE)
                     continue
                 if code != success_code:
                     continue
+                # Leaving the stream context early closes the connection, so a
+                # rejected body is never downloaded past its first chunk.
+                rejection = _reject_non_zip_headers(resp)
+                chunks = resp.iter_bytes()
+                head = b""
+                if not rejection:
+                    for chunk in chunks:
+                        head += chunk
+                        if len(head) >= 4:
+                            break
+                    rejection = _reject_non_zip_head(head)
+                if rejection:
+                    logger.warn(f"LuaTools: API '{name}' returned non-zip content ({rejection}), trying next")
+                    continue
+
                 total = int(resp.headers.get("Content-Length", "0") or "0")
-                _set_download_state(appid, {"status": "downloading", "bytesRead": 0, "totalBytes": total})
+                job.set({"status": "downloading", "bytesRead": 0, "totalBytes": total})
                 with open(dest_path, "wb") as output:
-                    for chunk in resp.iter_bytes():
+                    output.write(head)
+                    job.add_bytes(len(head))
+                    for chunk in chunks:
                         if not chunk:
                             continue
-                        if _is_download_cancelled(appid):
+                        if job.cancelled:
                             logger.log(f"LuaTools: Download cancelled mid-stream for appid={appid}")
                             raise RuntimeError("cancelled")
                         output.write(chunk)
-                        state = _get_download_state(appid)
-                        read = int(state.get("bytesRead", 0)) + len(chunk)
-                        _set_download_state(appid, {"bytesRead": read})
-                        if _is_download_cancelled(appid):
-                            logger.log(f"LuaTools: Download cancelled after writing chunk for appid={appid}")
-                            raise RuntimeError("cancelled")
+                        job.add_bytes(len(chunk))
+                job.publish()
                 logger.log(f"LuaTools: Download complete -> {dest_path}")
 
                 if _is_download_cancelled(appid):
                     logger.log(f"LuaTools: Download marked cancelled after completion for appid={appid}")
                     raise RuntimeError("cancelled")
 
-                try:
-                    with open(dest_path, "rb") as fh:
-                        magic = fh.read(4)
-                        if magic not in (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08"):
-                            file_size = os.path.getsize(dest_path)
-                            with open(dest_path, "rb") as check_f:
-                                preview = check_f.read(512)
-                                content_preview = preview[:100].decode("utf-8", errors="ignore")
-                            logger.warn(
-                                f"LuaTools: API '{name}' returned non-zip file (magic={magic.hex()}, size={file_size}, preview={content_preview[:50]})"
-                            )
-                            try:
-                                os.remove(dest_path)
-                            except Exception:
-                                pass
-                            continue
-                except FileNotFoundError:
-                    logger.warn("LuaTools: Downloaded file not found after download")
-                    continue
-                except Exception as validation_exc:
-                    logger.warn(f"LuaTools: File validation failed for API '{name}': {validation_exc}")
-                    try:
-                        os.remove(dest_path)
-                    except Exception:
-                        pass
-                    continue
-
                 try:
                     if _is_download_cancelled(appid):
                         logger.log(f"LuaTools: Processing aborted due to cancellation for appid={appid}")
@@ -551,6 +613,8 @@ def _download_zip_for_app(appid: int):
                         _log_appid_event(f"ADDED - {name}", appid, fetched_name)
                     except Exception:
                         pass
+                    cache.record_source_outcome(appid, template, SOURCE_OK)
+                    cache.update_cached_app(appid, mirror_url=template)
                     _set_download_state(appid, {"status": "done", "success": True, "api": name})
                     return
                 except Exception as install_exc:
@@ -585,9 +649,19 @@ def _download_zip_for_app(appid: int):
             return
         except Exception as err:
             logger.warn(f"LuaTools: API '{name}' failed with error: {err}")
+            # Disk or zip errors say nothing about the mirror's health.
+            if is_transport_error(err):
+                host_health.record_failure(url, err)
+            else:
+                host_health.release_trial(url)
             continue
 
-    _set_download_state(appid, {"status": "failed", "error": "Not available on any API"})
+    error = "Not available on any API"
+    if skipped_hosts:
+        error += f" ({skipped_hosts} skipped: host temporarily unavailable)"
+    if skipped_missing:
+        error += f" ({skipped_missing} skipped: reported missing recently)"
+    _set_download_state(appid, {"status": "failed", "error": error})
 
 
 def start_add_via_luatools(appid: int) -> str:
@@ -597,44 +671,54 @@ def start_add_via_luatools(appid: int) -> str:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
     logger.log(f"LuaTools: StartAddViaLuaTools appid={appid}")
-    _set_download_state(appid, {"status": "queued", "bytesRead": 0, "totalBytes": 0})
-    thread = threading.Thread(target=_download_zip_for_app, args=(appid,), daemon=True)
-    thread.start()
-    return json.dumps({"success": True})
+    future = executor.submit(
+        "transfer",
+        ("add", appid),
+        _download_zip_for_app,
+        (appid,),
+        on_queued=lambda: DOWNLOAD_JOBS.start(appid, {"status": "queued", "bytesRead": 0, "totalBytes": 0}),
+    )
+    if future is None:
+        return json.dumps({"success": True, "message": "Already in progress"})
+    return json.dumps({"success": True, "queuePosition": executor.position(("add", appid))})
 
 
-def get_add_status(appid: int) -> str:
+def get_add_status(appid: int, since_version: Optional[int] = None, timeout_ms: int = 0) -> str:
+    """Status of the add job; with ``since_version`` set, long-polls for a newer one."""
     try:
         appid = int(appid)
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
-    state = _get_download_state(appid)
+    if since_version is None:
+        state = _get_download_state(appid)
+    else:
+        state = DOWNLOAD_JOBS.wait_for_update(appid, since_version, timeout_ms / 1000.0)
+    if state.get("status") == "queued":
+        state["queuePosition"] = executor.position(("add", appid))
     return json.dumps({"success": True, "state": state})
 
 
+def list_add_jobs(since_version: int = 0) -> List[Dict[str, Any]]:
+    """Compact snapshots of add jobs changed after ``since_version``."""
+    jobs = []
+    for appid, state in DOWNLOAD_JOBS.changed_since(since_version):
+        state.pop("dest", None)
+        if state.get("status") == "queued":
+            state["queuePosition"] = executor.position(("add", appid))
+        jobs.append({"kind": "add", "appid": appid, **state})
+    return jobs
+
+
 def read_loaded_apps() -> str:
     try:
-        path = _loaded_apps_path()
-        entries = []
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as handle:
-                for line in handle.read().splitlines():
-                    if ":" in line:
-                        appid_str, name = line.split(":", 1)
-                        appid_str = appid_str.strip()
-                        name = name.strip()
-                        if appid_str.isdigit() and name:
-                            entries.append({"appid": int(appid_str), "name": name})
-        return json.dumps({"success": True, "apps": entries})
+        return json.dumps({"success": True, "apps": journal.loaded_apps()})
     except Exception as exc:
         return json.dumps({"success": False, "error": str(exc)})
 
 
 def dismiss_loaded_apps() -> str:
     try:
-        path = _loaded_apps_path()
-        if os.path.exists(path):
-            os.remove(path)
+        journal.clear_loaded_apps()
         return json.dumps({"success": True})
     except Exception as exc:
         return json.dumps({"success": False, "error": str(exc)})
@@ -700,11 +784,12 @@ def cancel_add_via_luatools(appid: int) -> str:
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
-    state = _get_download_state(appid)
-    if not state or state.get("status") in {"done", "failed"}:
+    job = DOWNLOAD_JOBS.get(appid)
+    if job is None or job.status in {"done", "failed"}:
         return json.dumps({"success": True, "message": "Nothing to cancel"})
 
-    _set_download_state(appid, {"status": "cancelled", "error": "Cancelled by user"})
+    executor.cancel(("add", appid))
+    job.cancel()
     logger.log(f"LuaTools: Cancellation requested for appid={appid}")
     return json.dumps({"success": True})
 
@@ -738,16 +823,9 @@ def get_installed_lua_scripts() -> str:
                         is_disabled = filename.endswith(".lua.disabled")
 
                         # Try to get game name from cache (no API calls during listing)
-                        game_name = ""
-                        with APP_NAME_CACHE_LOCK:
-                            game_name = APP_NAME_CACHE.get(appid, "")
-
-                        # Fallback to loaded_apps file if not in cache
-                        if not game_name:
-                            game_name = _get_loaded_app_name(appid)
+                        game_name = app_names.get(appid) or journal.known_name(appid)
 
-                        # Fallback to applist if still not found (no web request)
-                        # Note: _get_loaded_app_name already checks applist, but check again here for clarity
+                        # Fallback to applist if not found (no web request)
                         if not game_name:
                             game_name = _get_app_name_from_applist(appid)
 
@@ -0,0 +1,170 @@
+"""Bounded, prioritised worker lanes for background jobs in the LuaTools backend.
+
+Work is split into lanes (see ``config.JOB_LANE_WORKERS``) so that, for
+example, two archive downloads never compete with more than one extraction.
+Priority only orders a lane's queue and never pre-empts a running job, so
+long-running maintenance work (applist refreshes, update checks) gets its own
+``background`` lane rather than occupying workers that user actions wait on.
+Each lane owns a small pool of daemon threads started on first use and a
+priority heap; lower priority values run first and equal priorities run in
+submission order. A job key (e.g. ``("add", appid)``) can only be queued or
+running once at a time, so repeated clicks do not stack duplicate work.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from config import JOB_LANE_WORKERS
+from logger import logger
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class _Lane:
+    def __init__(self, name: str, workers: int, lock: threading.Lock) -> None:
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.heap: List[list] = []
+        self.threads: List[threading.Thread] = []
+        self.cond = threading.Condition(lock)
+
+
+class JobExecutor:
+    def __init__(self, lanes: Dict[str, int]) -> None:
+        self._lock = threading.Lock()
+        self._lanes = {name: _Lane(name, workers, self._lock) for name, workers in lanes.items()}
+        self._active: Dict[Hashable, str] = {}  # key -> "queued" | "running"
+        self._entries: Dict[Hashable, list] = {}  # key -> heap entry while queued
+        self._seq = itertools.count()
+        self._shutdown = False
+
+    def _ensure_workers_locked(self, lane: _Lane) -> None:
+        while len(lane.threads) < lane.workers:
+            thread = threading.Thread(
+                target=self._worker,
+                args=(lane,),
+                name=f"LuaTools-{lane.name}-{len(lane.threads) + 1}",
+                daemon=True,
+            )
+            lane.threads.append(thread)
+            thread.start()
+
+    def submit(
+        self,
+        lane: str,
+        key: Hashable,
+        func: Callable[..., Any],
+        args: Sequence[Any] = (),
+        priority: int = PRIORITY_INTERACTIVE,
+        on_queued: Optional[Callable[[], Any]] = None,
+    ) -> Optional[concurrent.futures.Future]:
+        """Queue ``func(*args)`` on ``lane`` under ``key``.
+
+        Returns None, without queueing, when ``key`` is already queued or
+        running. ``on_queued`` runs under the executor lock right before the job
+        becomes visible to workers, which lets callers publish a "queued" state
+        without racing the worker that picks it up.
+        """
+        target = self._lanes[lane]
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Job executor is shut down")
+            if key in self._active:
+                return None
+            if on_queued is not None:
+                on_queued()
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            entry = [priority, next(self._seq), key, func, tuple(args), future]
+            heapq.heappush(target.heap, entry)
+            self._active[key] = "queued"
+            self._entries[key] = entry
+            self._ensure_workers_locked(target)
+            target.cond.notify()
+        return future
+
+    def cancel(self, key: Hashable) -> bool:
+        """Drop ``key`` if it is still waiting in a queue; running jobs are left alone."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            for lane in self._lanes.values():
+                if entry in lane.heap:
+                    lane.heap.remove(entry)
+                    heapq.heapify(lane.heap)
+                    break
+            self._active.pop(key, None)
+        entry[5].cancel()
+        return True
+
+    def position(self, key: Hashable) -> Optional[int]:
+        """1-based position of ``key`` in its lane's queue, or None if not queued."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            for lane in self._lanes.values():
+                if entry in lane.heap:
+                    return 1 + sum(1 for other in lane.heap if other[:2] < entry[:2])
+        return None
+
+    def state(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            return self._active.get(key)
+
+    def _worker(self, lane: _Lane) -> None:
+        while True:
+            with lane.cond:
+                while not lane.heap and not self._shutdown:
+                    lane.cond.wait()
+                if self._shutdown:
+                    return
+                _, _, key, func, args, future = heapq.heappop(lane.heap)
+                self._entries.pop(key, None)
+                self._active[key] = "running"
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(*args))
+                    except BaseException as exc:
+                        logger.warn(f"LuaTools: Job {key!r} in lane '{lane.name}' failed: {exc}")
+                        future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._active.pop(key, None)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop everything still queued.
+
+        Running jobs are not interrupted; their threads are daemons and exit
+        with the plugin.
+        """
+        with self._lock:
+            self._shutdown = True
+            pending = [entry for lane in self._lanes.values() for entry in lane.heap]
+            for lane in self._lanes.values():
+                lane.heap.clear()
+                lane.cond.notify_all()
+            self._entries.clear()
+            for entry in pending:
+                self._active.pop(entry[2], None)
+        for entry in pending:
+            entry[5].cancel()
+
+
+# Global instance
+executor = JobExecutor(JOB_LANE_WORKERS)
+
+
+__all__ = [
+    "JobExecutor",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_INTERACTIVE",
+    "executor",
+]
@@ -2,47 +2,131 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import json
 import os
-import threading
+import time
 import zipfile
 from datetime import datetime
-from typing import Dict, Optional
-
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx  # type: ignore
+
+from async_core import get_async_client, run_sync
+from config import (
+    ASYNC_BRIDGE_GRACE_SECONDS,
+    FIX_DOWNLOAD_RESUME_ATTEMPTS,
+    FIX_PROBE_DEADLINE_SECONDS,
+    FIX_PARTIAL_MAX_AGE_SECONDS,
+    FIX_PARTIAL_MAX_TOTAL_BYTES,
+    FIX_RESUME_CHECKPOINT_BYTES,
+)
 from downloads import fetch_app_name
+from executor import executor
+from host_health import HostUnavailableError, host_health, host_of, is_failure_status, is_transport_error
 from http_client import ensure_http_client
+from jobs import JobStore
 from logger import logger
-from utils import ensure_temp_download_dir
+from utils import ensure_temp_download_dir, read_json, write_json
 from steam_utils import get_game_install_path_response
 
-FIX_DOWNLOAD_STATE: Dict[int, Dict[str, any]] = {}
-FIX_DOWNLOAD_LOCK = threading.Lock()
-UNFIX_STATE: Dict[int, Dict[str, any]] = {}
-UNFIX_LOCK = threading.Lock()
+FIX_JOBS = JobStore("fix")
+UNFIX_JOBS = JobStore("unfix")
 
 
 def _set_fix_download_state(appid: int, update: dict) -> None:
-    with FIX_DOWNLOAD_LOCK:
-        state = FIX_DOWNLOAD_STATE.get(appid) or {}
-        state.update(update)
-        FIX_DOWNLOAD_STATE[appid] = state
+    FIX_JOBS.update(appid, update)
 
 
 def _get_fix_download_state(appid: int) -> dict:
-    with FIX_DOWNLOAD_LOCK:
-        return FIX_DOWNLOAD_STATE.get(appid, {}).copy()
+    return FIX_JOBS.snapshot(appid)
 
 
 def _set_unfix_state(appid: int, update: dict) -> None:
-    with UNFIX_LOCK:
-        state = UNFIX_STATE.get(appid) or {}
-        state.update(update)
-        UNFIX_STATE[appid] = state
+    UNFIX_JOBS.update(appid, update)
 
 
 def _get_unfix_state(appid: int) -> dict:
-    with UNFIX_LOCK:
-        return UNFIX_STATE.get(appid, {}).copy()
+    return UNFIX_JOBS.snapshot(appid)
+
+
+def _record_probe(url: str, status: int, error: Optional[BaseException], elapsed: Optional[float]) -> None:
+    """Feed one probe outcome to the host's circuit breaker."""
+    if isinstance(error, HostUnavailableError):
+        return
+    if error is not None and not is_transport_error(error):
+        host_health.release_trial(url)
+    elif error is not None or is_failure_status(status):
+        host_health.record_failure(url, error or f"HTTP {status}")
+    else:
+        host_health.record_success(url, elapsed)
+
+
+async def _probe_url(url: str):
+    """HEAD ``url`` on the async loop; returns (status_code, error, elapsed_seconds).
+
+    The outcome is recorded with the circuit breaker before returning.
+    """
+    if host_health.is_open(url):
+        return 0, HostUnavailableError(f"Host {host_of(url)} is temporarily unavailable (circuit open)"), None
+    started = time.monotonic()
+    try:
+        resp = await asyncio.wait_for(
+            get_async_client("probe").head(url, follow_redirects=True), FIX_PROBE_DEADLINE_SECONDS
+        )
+        result = resp.status_code, None, time.monotonic() - started
+    except asyncio.TimeoutError:
+        error = httpx.TimeoutException(f"HEAD {url} took longer than {FIX_PROBE_DEADLINE_SECONDS}s")
+        result = 0, error, time.monotonic() - started
+    except Exception as exc:
+        result = 0, exc, time.monotonic() - started
+    _record_probe(url, *result)
+    return result
+
+
+async def _probe_urls(urls: List[str]):
+    results = list(await asyncio.gather(*(_probe_url(url) for url in urls)))
+    # A half-open host lets a single probe through and refuses the others
+    # (generic and online fixes share files.luatools.work). That trial has
+    # reported back by now, so ask the breaker again for the refused ones:
+    # a recovered host is probed, a re-opened one refuses instantly.
+    refused = [index for index, (_, error, _) in enumerate(results) if isinstance(error, HostUnavailableError)]
+    if refused:
+        retried = await asyncio.gather(*(_probe_url(urls[index]) for index in refused))
+        for index, result in zip(refused, retried):
+            results[index] = result
+    return results
+
+
+def _run_probes(urls: List[str]):
+    """Probe ``urls`` on the async loop without ever blocking the RPC thread indefinitely.
+
+    If the loop itself does not answer in time every probe is reported as a
+    timeout, which callers treat like any other transport failure.
+    """
+    try:
+        return run_sync(_probe_urls(urls), timeout=FIX_PROBE_DEADLINE_SECONDS + ASYNC_BRIDGE_GRACE_SECONDS)
+    except concurrent.futures.TimeoutError:
+        logger.warn(f"LuaTools: Fix probes did not finish within {FIX_PROBE_DEADLINE_SECONDS}s")
+        error = httpx.TimeoutException("fix probe timed out waiting for the async I/O loop")
+        results = [(0, error, None) for _ in urls]
+        for url, result in zip(urls, results):
+            _record_probe(url, *result)
+        return results
+
+
+def _custom_freetp_urls(appid: int) -> List[str]:
+    """Build {appid}_freetp.zip candidates from custom repos in the API manifest."""
+    from api_manifest import api_url, load_api_manifest
+
+    urls = []
+    for api in load_api_manifest():
+        name = api.get("name", "Unknown")
+        if "Alucard" in name or "Custom" in name:
+            # Pattern: {appid}_freetp.zip instead of just {appid}.zip
+            urls.append(api_url(api, f"{appid}_freetp"))
+    return urls
 
 
 def check_for_fixes(appid: int) -> str:
@@ -51,7 +135,6 @@ def check_for_fixes(appid: int) -> str:
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
-    client = ensure_http_client("LuaTools: CheckForFixes")
     result = {
         "success": True,
         "appid": appid,
@@ -67,94 +150,316 @@ def check_for_fixes(appid: int) -> str:
         logger.warn(f"LuaTools: Failed to fetch game name for {appid}: {exc}")
         result["gameName"] = f"Unknown Game ({appid})"
 
-    try:
-        generic_url = f"https://files.luatools.work/GameBypasses/{appid}.zip"
-        resp = client.head(generic_url, follow_redirects=True, timeout=10)
-        result["genericFix"]["status"] = resp.status_code
-        result["genericFix"]["available"] = resp.status_code == 200
-        if resp.status_code == 200:
-            result["genericFix"]["url"] = generic_url
-        logger.log(f"LuaTools: Generic fix check for {appid} -> {resp.status_code}")
-    except Exception as exc:
-        logger.warn(f"LuaTools: Generic fix check failed for {appid}: {exc}")
+    generic_url = f"https://files.luatools.work/GameBypasses/{appid}.zip"
+    online_url = f"https://files.luatools.work/OnlineFix1/{appid}.zip"
 
+    # Custom FreeTP Repos check (SkyTools Specific)
     try:
-        online_url = f"https://files.luatools.work/OnlineFix1/{appid}.zip"
-        resp = client.head(online_url, follow_redirects=True, timeout=10)
-        logger.log(f"LuaTools: Online-fix check ({online_url}) for {appid} -> {resp.status_code}")
-        result["onlineFix"]["status"] = resp.status_code
-        result["onlineFix"]["available"] = resp.status_code == 200
-        if resp.status_code == 200:
+        freetp_urls = _custom_freetp_urls(appid)
+    except Exception as e:
+        logger.warn(f"SkyTools: Custom FreeTP check failed: {e}")
+        freetp_urls = []
+    for freetp_url in freetp_urls:
+        logger.log(f"SkyTools: Checking Custom FreeTP at {freetp_url}")
+
+    # All probes run concurrently on the shared async loop.
+    probe_urls = [generic_url, online_url] + freetp_urls
+    probes = _run_probes(probe_urls)
+
+    status, error, _ = probes[0]
+    if error is None:
+        result["genericFix"]["status"] = status
+        result["genericFix"]["available"] = status == 200
+        if status == 200:
+            result["genericFix"]["url"] = generic_url
+        logger.log(f"LuaTools: Generic fix check for {appid} -> {status}")
+    else:
+        logger.warn(f"LuaTools: Generic fix check failed for {appid}: {error}")
+
+    status, error, _ = probes[1]
+    if error is None:
+        logger.log(f"LuaTools: Online-fix check ({online_url}) for {appid} -> {status}")
+        result["onlineFix"]["status"] = status
+        result["onlineFix"]["available"] = status == 200
+        if status == 200:
             result["onlineFix"]["url"] = online_url
             # Fallback for FreeTP if official online fix exists
             result["freeTp"]["status"] = 200
             result["freeTp"]["available"] = True
             result["freeTp"]["url"] = online_url
-    except Exception as exc:
-        logger.warn(f"LuaTools: Online-fix check failed for {appid}: {exc}")
-        if result["onlineFix"]["status"] == 0:
-            result["onlineFix"]["status"] = 0
-
-    # Custom FreeTP Repos check (SkyTools Specific)
-    try:
-        from api_manifest import load_api_manifest
-        apis = load_api_manifest()
-        
-        # Check Custom Repo for {appid}_freetp.zip first
-        for api in apis:
-            name = api.get("name", "Unknown")
-            if "Alucard" in name or "Custom" in name:
-                template = api.get("url", "")
-                # Pattern: {appid}_freetp.zip instead of just {appid}.zip
-                freetp_url = template.replace("<appid>.zip", f"{appid}_freetp.zip")
-                if freetp_url == template: # Replacement failed, try appending
-                     freetp_url = template.replace("<appid>", f"{appid}_freetp")
-                
-                logger.log(f"SkyTools: Checking Custom FreeTP at {freetp_url}")
-                resp = client.head(freetp_url, follow_redirects=True, timeout=10)
-                if resp.status_code == 200:
-                    result["freeTp"]["status"] = 200
-                    result["freeTp"]["available"] = True
-                    result["freeTp"]["url"] = freetp_url
-                    logger.log(f"SkyTools: Found Custom FreeTP Fix for {appid}!")
-                    break
-    except Exception as e:
-        logger.warn(f"SkyTools: Custom FreeTP check failed: {e}")
+    else:
+        logger.warn(f"LuaTools: Online-fix check failed for {appid}: {error}")
+
+    for freetp_url, (status, error, _) in zip(freetp_urls, probes[2:]):
+        if error is not None:
+            logger.warn(f"SkyTools: Custom FreeTP check failed: {error}")
+            continue
+        if status == 200:
+            result["freeTp"]["status"] = 200
+            result["freeTp"]["available"] = True
+            result["freeTp"]["url"] = freetp_url
+            logger.log(f"SkyTools: Found Custom FreeTP Fix for {appid}!")
+            break
 
     return json.dumps(result)
 
 
-def _download_and_extract_fix(appid: int, download_url: str, install_path: str, fix_type: str, game_name: str = ""):
-    client = ensure_http_client("LuaTools: fix download")
+def _resume_info_path(dest_zip: str) -> str:
+    return f"{dest_zip}.resume.json"
+
+
+def _load_resume_info(dest_zip: str) -> Dict[str, Any]:
+    info = read_json(_resume_info_path(dest_zip))
+    return info if isinstance(info, dict) else {}
+
+
+def _discard_partial_download(dest_zip: str) -> None:
+    for path in (dest_zip, _resume_info_path(dest_zip)):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+
+
+def _partial_is_resumable(exc: Exception) -> bool:
+    """Whether a failed download's partial archive is worth keeping for a resume.
+
+    Only a dropped connection or a user cancel leave bytes a later Range
+    request can build on; HTTP errors, a changed archive and bad zips do not.
+    """
+    return isinstance(exc, httpx.TransportError) or str(exc) == "cancelled"
+
+
+def cleanup_stale_fix_partials(keep: Optional[str] = None) -> int:
+    """Delete kept ``fix_*.zip`` partials (and sidecars) that are too old or too many.
+
+    Partials of fix jobs that are still queued or running, and ``keep``, are
+    never touched. Returns the number of archives removed.
+    """
+    root = ensure_temp_download_dir()
     try:
-        dest_root = ensure_temp_download_dir()
-        dest_zip = os.path.join(dest_root, f"fix_{appid}.zip")
-        _set_fix_download_state(appid, {"status": "downloading", "bytesRead": 0, "totalBytes": 0, "error": None})
+        names = os.listdir(root)
+    except Exception:
+        return 0
+
+    partials = []
+    for name in names:
+        if not (name.startswith("fix_") and name.endswith(".zip")):
+            continue
+        path = os.path.join(root, name)
+        if path == keep:
+            continue
+        try:
+            appid = int(name[4:-4])
+        except ValueError:
+            appid = None
+        if appid is not None and (executor.state(("fix", appid)) or executor.state(("fix-extract", appid))):
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        partials.append((st.st_mtime, st.st_size, path))
+
+    now = time.time()
+    partials.sort(reverse=True)  # newest first
+    removed = 0
+    kept_bytes = 0
+    for mtime, size, path in partials:
+        if now - mtime <= FIX_PARTIAL_MAX_AGE_SECONDS and kept_bytes + size <= FIX_PARTIAL_MAX_TOTAL_BYTES:
+            kept_bytes += size
+            continue
+        _discard_partial_download(path)
+        removed += 1
+
+    # Sidecars whose archive is already gone
+    for name in names:
+        if name.startswith("fix_") and name.endswith(".zip.resume.json"):
+            path = os.path.join(root, name)
+            if not os.path.exists(path[: -len(".resume.json")]):
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
 
-        logger.log(f"LuaTools: Downloading {fix_type} from {download_url}")
+    if removed:
+        logger.log(f"LuaTools: Removed {removed} stale partial fix download(s)")
+    return removed
+
+
+def _resume_validator(resp: httpx.Response) -> str:
+    """Pick the validator to send as ``If-Range``; weak ETags are not allowed there."""
+    etag = resp.headers.get("ETag", "")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified", "")
 
-        with client.stream("GET", download_url, follow_redirects=True, timeout=30) as resp:
+
+def _parse_content_range(value: str) -> Tuple[int, int]:
+    """Return (start, total) from ``bytes start-end/total``; -1 for anything unknown."""
+    try:
+        unit, _, spec = value.strip().partition(" ")
+        if unit.lower() != "bytes":
+            return -1, -1
+        span, _, total = spec.partition("/")
+        start = int(span.split("-", 1)[0])
+        return start, int(total) if total.strip() != "*" else -1
+    except Exception:
+        return -1, -1
+
+
+def _stream_fix_archive(client: httpx.Client, appid: int, job, download_url: str, dest_zip: str) -> bool:
+    """Download (or resume) ``download_url`` into ``dest_zip``.
+
+    Returns False when a stale partial file had to be thrown away and the caller
+    should request the archive again from the start.
+    """
+    info = _load_resume_info(dest_zip)
+    offset = 0
+    request_headers: Dict[str, str] = {}
+    if info.get("url") == download_url and info.get("validator") and os.path.exists(dest_zip):
+        received = int(info.get("received", 0) or 0)
+        size = os.path.getsize(dest_zip)
+        if 0 < received <= size:
+            if size > received:
+                # Bytes written after the last checkpoint are not trusted.
+                with open(dest_zip, "r+b") as handle:
+                    handle.truncate(received)
+            offset = received
+            request_headers = {"Range": f"bytes={offset}-", "If-Range": str(info["validator"])}
+    if not offset:
+        _discard_partial_download(dest_zip)
+        info = {}
+
+    with client.stream("GET", download_url, headers=request_headers, follow_redirects=True) as resp:
+        total = int(info.get("total", 0) or 0)
+        if offset and resp.status_code == 416 and offset == total:
+            logger.log(f"LuaTools: Fix archive for {appid} was already fully downloaded")
+            job.set({"bytesRead": offset, "totalBytes": total})
+            return True
+
+        if offset and resp.status_code == 206:
+            start, range_total = _parse_content_range(resp.headers.get("Content-Range", ""))
+            etag = resp.headers.get("ETag", "")
+            if start != offset or range_total != total or (info.get("etag") and etag and etag != info["etag"]):
+                logger.warn(f"LuaTools: Resumed fix download for {appid} does not match the partial file, restarting")
+                _discard_partial_download(dest_zip)
+                return False
+            logger.log(f"LuaTools: Resuming fix download for {appid} at {offset}/{total} bytes")
+        else:
             resp.raise_for_status()
+            if offset:
+                logger.log(f"LuaTools: Server sent the full fix archive for {appid}, restarting from zero")
+            offset = 0
             total = int(resp.headers.get("Content-Length", "0") or "0")
-            _set_fix_download_state(appid, {"totalBytes": total})
-
-            with open(dest_zip, "wb") as output:
+            resumable = resp.headers.get("Accept-Ranges", "").lower() == "bytes" and total > 0
+            info = {
+                "url": download_url,
+                "etag": resp.headers.get("ETag", ""),
+                "validator": _resume_validator(resp) if resumable else "",
+                "total": total,
+                "received": 0,
+            }
+
+        job.set({"bytesRead": offset, "totalBytes": total})
+        received = offset
+        checkpoint = received
+        try:
+            with open(dest_zip, "ab" if offset else "wb") as output:
                 for chunk in resp.iter_bytes():
                     if not chunk:
                         continue
-                    state = _get_fix_download_state(appid)
-                    if state.get("status") == "cancelled":
-                        logger.log(f"LuaTools: Fix download cancelled before writing chunk for {appid}")
-                        raise RuntimeError("cancelled")
-                    output.write(chunk)
-                    read = int(state.get("bytesRead", 0)) + len(chunk)
-                    _set_fix_download_state(appid, {"bytesRead": read})
-                    if _get_fix_download_state(appid).get("status") == "cancelled":
+                    if job.cancelled:
                         logger.log(f"LuaTools: Fix download cancelled for {appid}")
                         raise RuntimeError("cancelled")
+                    output.write(chunk)
+                    received += len(chunk)
+                    job.add_bytes(len(chunk))
+                    if info["validator"] and received - checkpoint >= FIX_RESUME_CHECKPOINT_BYTES:
+                        output.flush()
+                        info["received"] = checkpoint = received
+                        write_json(_resume_info_path(dest_zip), info)
+        finally:
+            job.publish()
+            if info["validator"]:
+                info["received"] = received
+                write_json(_resume_info_path(dest_zip), info)
+
+    if total and os.path.getsize(dest_zip) != total:
+        _discard_partial_download(dest_zip)
+        raise RuntimeError(f"Fix download incomplete: got {received} of {total} bytes")
+    return True
+
+
+def _fetch_fix_archive(client: httpx.Client, appid: int, job, download_url: str, dest_zip: str) -> None:
+    for attempt in range(1, FIX_DOWNLOAD_RESUME_ATTEMPTS + 1):
+        try:
+            if _stream_fix_archive(client, appid, job, download_url, dest_zip):
+                return
+        except httpx.TransportError as exc:
+            resumable = bool(_load_resume_info(dest_zip).get("validator"))
+            if job.cancelled or not resumable or attempt == FIX_DOWNLOAD_RESUME_ATTEMPTS:
+                raise
+            logger.warn(f"LuaTools: Fix download for {appid} interrupted ({exc}), resuming")
+    raise RuntimeError("Fix download kept restarting, giving up")
+
+
+def _fix_job_failed(appid: int, dest_zip: str, exc: Exception, downloaded: bool) -> None:
+    # A partial archive is kept only when the transfer was interrupted (or
+    # cancelled) and the server gave a resume validator; anything else is
+    # cleaned up so multi-GB leftovers do not pile up in temp_dl.
+    try:
+        keep = (
+            not downloaded
+            and _partial_is_resumable(exc)
+            and bool(_load_resume_info(dest_zip).get("validator"))
+        )
+        if not keep:
+            _discard_partial_download(dest_zip)
+    except Exception:
+        pass
+    if str(exc) == "cancelled":
+        _set_fix_download_state(appid, {"status": "cancelled", "success": False, "error": "Cancelled by user"})
+        return
+    logger.warn(f"LuaTools: Failed to apply fix: {exc}")
+    _set_fix_download_state(appid, {"status": "failed", "error": str(exc)})
+
+
+def _download_fix(appid: int, download_url: str, install_path: str, fix_type: str, game_name: str = ""):
+    """Transfer-lane half of a fix: fetch the archive, then queue its extraction."""
+    client = ensure_http_client("LuaTools: fix download", profile="transfer")
+    dest_zip = os.path.join(ensure_temp_download_dir(), f"fix_{appid}.zip")
+    try:
+        job = FIX_JOBS.get(appid) or FIX_JOBS.start(appid, {})
+        job.set({"status": "downloading", "bytesRead": 0, "totalBytes": 0, "error": None})
+
+        cleanup_stale_fix_partials(keep=dest_zip)
+        logger.log(f"LuaTools: Downloading {fix_type} from {download_url}")
+        _fetch_fix_archive(client, appid, job, download_url, dest_zip)
+        if job.cancelled:
+            raise RuntimeError("cancelled")
+        future = executor.submit(
+            "extract",
+            ("fix-extract", appid),
+            _extract_fix,
+            (appid, dest_zip, download_url, install_path, fix_type, game_name),
+            on_queued=lambda: job.set({"status": "queued"}),
+        )
+        if future is None:
+            raise RuntimeError("Another extraction of this fix is still running")
+    except Exception as exc:
+        _fix_job_failed(appid, dest_zip, exc, downloaded=False)
+
 
+def _extract_fix(appid: int, dest_zip: str, download_url: str, install_path: str, fix_type: str, game_name: str = ""):
+    """Extract-lane half of a fix: unpack the downloaded archive into the game folder."""
+    try:
+        job = FIX_JOBS.get(appid) or FIX_JOBS.start(appid, {})
+        if job.cancelled:
+            raise RuntimeError("cancelled")
         logger.log(f"LuaTools: Download complete, extracting to {install_path}")
-        _set_fix_download_state(appid, {"status": "extracting"})
+        job.set({"status": "extracting"})
 
         extracted_files = []
         with zipfile.ZipFile(dest_zip, "r") as archive:
@@ -173,7 +478,7 @@ def _download_and_extract_fix(appid: int, download_url: str, install_path: str,
                         continue
                     top_level_entries.add(parts[0])
             
-            if _get_fix_download_state(appid).get("status") == "cancelled":
+            if job.cancelled:
                 logger.log(f"LuaTools: Fix extraction cancelled before start for {appid}")
                 raise RuntimeError("cancelled")
 
@@ -226,7 +531,7 @@ def _download_and_extract_fix(appid: int, download_url: str, install_path: str,
                     archive.extract(member, install_path)
                     extracted_files.append(member.replace("\\", "/"))
 
-        if _get_fix_download_state(appid).get("status") == "cancelled":
+        if job.cancelled:
             logger.log(f"LuaTools: Fix cancelled after extraction for {appid}")
             raise RuntimeError("cancelled")
 
@@ -294,23 +599,14 @@ def _download_and_extract_fix(appid: int, download_url: str, install_path: str,
 
         logger.log(f"LuaTools: {fix_type} applied successfully to {install_path}")
         _set_fix_download_state(appid, {"status": "done", "success": True})
-
-        try:
-            os.remove(dest_zip)
-        except Exception:
-            pass
+        _discard_partial_download(dest_zip)
 
     except Exception as exc:
-        if str(exc) == "cancelled":
-            try:
-                if os.path.exists(dest_zip):
-                    os.remove(dest_zip)
-            except Exception:
-                pass
-            _set_fix_download_state(appid, {"status": "cancelled", "success": False, "error": "Cancelled by user"})
-            return
-        logger.warn(f"LuaTools: Failed to apply fix: {exc}")
-        _set_fix_download_state(appid, {"status": "failed", "error": str(exc)})
+        _fix_job_failed(appid, dest_zip, exc, downloaded=True)
+
+
+def _fix_queue_position(appid: int) -> Optional[int]:
+    return executor.position(("fix", appid)) or executor.position(("fix-extract", appid))
 
 
 def apply_game_fix(appid: int, download_url: str, install_path: str, fix_type: str = "", game_name: str = "") -> str:
@@ -327,22 +623,34 @@ def apply_game_fix(appid: int, download_url: str, install_path: str, fix_type: s
 
     logger.log(f"LuaTools: ApplyGameFix appid={appid}, fixType={fix_type}")
 
-    _set_fix_download_state(appid, {"status": "queued", "bytesRead": 0, "totalBytes": 0, "error": None})
-    thread = threading.Thread(
-        target=_download_and_extract_fix, args=(appid, download_url, install_path, fix_type, game_name), daemon=True
+    if executor.state(("fix-extract", appid)):
+        return json.dumps({"success": True, "message": "Already in progress"})
+    future = executor.submit(
+        "transfer",
+        ("fix", appid),
+        _download_fix,
+        (appid, download_url, install_path, fix_type, game_name),
+        on_queued=lambda: FIX_JOBS.start(appid, {"status": "queued", "bytesRead": 0, "totalBytes": 0, "error": None}),
     )
-    thread.start()
+    if future is None:
+        return json.dumps({"success": True, "message": "Already in progress"})
 
-    return json.dumps({"success": True})
+    return json.dumps({"success": True, "queuePosition": _fix_queue_position(appid)})
 
 
-def get_apply_fix_status(appid: int) -> str:
+def get_apply_fix_status(appid: int, since_version: Optional[int] = None, timeout_ms: int = 0) -> str:
+    """Status of the fix job; with ``since_version`` set, long-polls for a newer one."""
     try:
         appid = int(appid)
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
-    state = _get_fix_download_state(appid)
+    if since_version is None:
+        state = _get_fix_download_state(appid)
+    else:
+        state = FIX_JOBS.wait_for_update(appid, since_version, timeout_ms / 1000.0)
+    if state.get("status") == "queued":
+        state["queuePosition"] = _fix_queue_position(appid)
     return json.dumps({"success": True, "state": state})
  
  
@@ -352,11 +660,13 @@ def cancel_apply_fix(appid: int) -> str:
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
-    state = _get_fix_download_state(appid)
-    if not state or state.get("status") in {"done", "failed"}:
+    job = FIX_JOBS.get(appid)
+    if job is None or job.status in {"done", "failed"}:
         return json.dumps({"success": True, "message": "Nothing to cancel"})
 
-    _set_fix_download_state(appid, {"status": "cancelled", "success": False, "error": "Cancelled by user"})
+    executor.cancel(("fix", appid)) or executor.cancel(("fix-extract", appid))
+    job.cancel()
+    job.set({"success": False})
     logger.log(f"LuaTools: CancelApplyFix requested for appid={appid}")
     return json.dumps({"success": True})
 
@@ -488,195 +798,171 @@ def unfix_game(appid: int, install_path: str = "", fix_date: str = "") -> str:
 
     logger.log(f"LuaTools: UnFixGame appid={appid}, path={resolved_path}, fix_date={fix_date}")
 
-    _set_unfix_state(appid, {"status": "queued", "progress": "", "error": None})
-    thread = threading.Thread(target=_unfix_game_worker, args=(appid, resolved_path, fix_date or None), daemon=True)
-    thread.start()
+    future = executor.submit(
+        "scan",
+        ("unfix", appid),
+        _unfix_game_worker,
+        (appid, resolved_path, fix_date or None),
+        on_queued=lambda: UNFIX_JOBS.start(appid, {"status": "queued", "progress": "", "error": None}),
+    )
+    if future is None:
+        return json.dumps({"success": True, "message": "Already in progress"})
 
-    return json.dumps({"success": True})
+    return json.dumps({"success": True, "queuePosition": executor.position(("unfix", appid))})
 
 
-def get_unfix_status(appid: int) -> str:
+def get_unfix_status(appid: int, since_version: Optional[int] = None, timeout_ms: int = 0) -> str:
+    """Status of the un-fix job; with ``since_version`` set, long-polls for a newer one."""
     try:
         appid = int(appid)
     except Exception:
         return json.dumps({"success": False, "error": "Invalid appid"})
 
-    state = _get_unfix_state(appid)
+    if since_version is None:
+        state = _get_unfix_state(appid)
+    else:
+        state = UNFIX_JOBS.wait_for_update(appid, since_version, timeout_ms / 1000.0)
+    if state.get("status") == "queued":
+        state["queuePosition"] = executor.position(("unfix", appid))
     return json.dumps({"success": True, "state": state})
 
 
+def list_fix_jobs(since_version: int = 0) -> List[Dict[str, Any]]:
+    """Compact snapshots of fix and un-fix jobs changed after ``since_version``."""
+    jobs = []
+    for appid, state in FIX_JOBS.changed_since(since_version):
+        if state.get("status") == "queued":
+            state["queuePosition"] = _fix_queue_position(appid)
+        jobs.append({"kind": "fix", "appid": appid, **state})
+    for appid, state in UNFIX_JOBS.changed_since(since_version):
+        if state.get("status") == "queued":
+            state["queuePosition"] = executor.position(("unfix", appid))
+        jobs.append({"kind": "unfix", "appid": appid, **state})
+    return jobs
+
+
 def get_installed_fixes() -> str:
     """Scan all Steam library folders for games with luatools fix logs."""
     try:
-        from steam_utils import _find_steam_path, _parse_vdf_simple
+        from steam_utils import _find_steam_path, library_index
 
         steam_path = _find_steam_path()
         if not steam_path:
             return json.dumps({"success": False, "error": "Could not find Steam installation path"})
 
-        library_vdf_path = os.path.join(steam_path, "config", "libraryfolders.vdf")
-        if not os.path.exists(library_vdf_path):
-            return json.dumps({"success": False, "error": "Could not find libraryfolders.vdf"})
-
         try:
-            with open(library_vdf_path, "r", encoding="utf-8") as handle:
-                vdf_content = handle.read()
-            library_data = _parse_vdf_simple(vdf_content)
+            installed_apps = library_index.all(steam_path)
+        except FileNotFoundError:
+            return json.dumps({"success": False, "error": "Could not find libraryfolders.vdf"})
         except Exception as exc:
             logger.warn(f"LuaTools: Failed to parse libraryfolders.vdf: {exc}")
             return json.dumps({"success": False, "error": "Failed to parse libraryfolders.vdf"})
 
-        library_folders = library_data.get("libraryfolders", {})
-        all_library_paths = []
-
-        for folder_data in library_folders.values():
-            if isinstance(folder_data, dict):
-                folder_path = folder_data.get("path", "")
-                if folder_path:
-                    folder_path = folder_path.replace("\\\\", "\\")
-                    all_library_paths.append(folder_path)
-
         installed_fixes = []
 
-        for lib_path in all_library_paths:
-            steamapps_path = os.path.join(lib_path, "steamapps")
-            if not os.path.exists(steamapps_path):
+        for app in installed_apps:
+            appid = app["appid"]
+            game_name = app["name"] or f"Unknown Game ({appid})"
+            full_install_path = app["installPath"]
+            if not full_install_path or not os.path.exists(full_install_path):
                 continue
 
-            # Get all appmanifest files
-            try:
-                for filename in os.listdir(steamapps_path):
-                    if not filename.startswith("appmanifest_") or not filename.endswith(".acf"):
-                        continue
-
-                    # Extract appid from filename
-                    try:
-                        appid_str = filename.replace("appmanifest_", "").replace(".acf", "")
-                        appid = int(appid_str)
-                    except Exception:
-                        continue
-
-                    # Parse manifest to get install directory
-                    manifest_path = os.path.join(steamapps_path, filename)
-                    try:
-                        with open(manifest_path, "r", encoding="utf-8") as handle:
-                            manifest_content = handle.read()
-                        manifest_data = _parse_vdf_simple(manifest_content)
-                        app_state = manifest_data.get("AppState", {})
-                        install_dir = app_state.get("installdir", "")
-                        game_name = app_state.get("name", f"Unknown Game ({appid})")
-
-                        if not install_dir:
-                            continue
-
-                        full_install_path = os.path.join(lib_path, "steamapps", "common", install_dir)
-                        if not os.path.exists(full_install_path):
-                            continue
-
-                        # Check for luatools fix log
-                        log_file_path = os.path.join(full_install_path, f"luatools-fix-log-{appid}.log")
-                        if os.path.exists(log_file_path):
-                            # Parse the log file to get fix info (supports multiple fixes)
-                            try:
-                                with open(log_file_path, "r", encoding="utf-8") as log_handle:
-                                    log_content = log_handle.read()
-
-                                # Parse multiple fixes (new format with [FIX] markers)
-                                fixes_in_log = []
-                                if "[FIX]" in log_content:
-                                    # New format with multiple fixes
-                                    fix_blocks = log_content.split("[FIX]")
-                                    for block in fix_blocks:
-                                        if not block.strip():
-                                            continue
-
-                                        # Extract data from this fix block
-                                        fix_data = {
-                                            "appid": appid,
-                                            "gameName": game_name,
-                                            "installPath": full_install_path,
-                                            "date": "",
-                                            "fixType": "",
-                                            "downloadUrl": "",
-                                            "filesCount": 0,
-                                            "files": []
-                                        }
-
-                                        lines = block.split("\n")
-                                        in_files_section = False
-
-                                        for line in lines:
-                                            line = line.strip()
-                                            if line == "[/FIX]" or line == "---":
-                                                break
-                                            if line.startswith("Date:"):
-                                                fix_data["date"] = line.replace("Date:", "").strip()
-                                            elif line.startswith("Game:"):
-                                                log_game_name = line.replace("Game:", "").strip()
-                                                if log_game_name and log_game_name != f"Unknown Game ({appid})":
-                                                    fix_data["gameName"] = log_game_name
-                                            elif line.startswith("Fix Type:"):
-                                                fix_data["fixType"] = line.replace("Fix Type:", "").strip()
-                                            elif line.startswith("Download URL:"):
-                                                fix_data["downloadUrl"] = line.replace("Download URL:", "").strip()
-                                            elif line == "Files:":
-                                                in_files_section = True
-                                            elif in_files_section and line:
-                                                fix_data["files"].append(line)
-
-                                        fix_data["filesCount"] = len(fix_data["files"])
-                                        if fix_data["date"]:  # Only add if it has a date (valid fix)
-                                            fixes_in_log.append(fix_data)
-                                else:
-                                    # Old format (single fix without markers) - legacy support
-                                    log_lines = log_content.split("\n")
-                                    fix_data = {
-                                        "appid": appid,
-                                        "gameName": game_name,
-                                        "installPath": full_install_path,
-                                        "date": "",
-                                        "fixType": "",
-                                        "downloadUrl": "",
-                                        "filesCount": 0,
-                                        "files": []
-                                    }
-
-                                    in_files_section = False
-                                    for line in log_lines:
-                                        line = line.strip()
-                                        if line.startswith("Date:"):
-                                            fix_data["date"] = line.replace("Date:", "").strip()
-                                        elif line.startswith("Game:"):
-                                            log_game_name = line.replace("Game:", "").strip()
-                                            if log_game_name and log_game_name != f"Unknown Game ({appid})":
-                                                fix_data["gameName"] = log_game_name
-                                        elif line.startswith("Fix Type:"):
-                                            fix_data["fixType"] = line.replace("Fix Type:", "").strip()
-                                        elif line.startswith("Download URL:"):
-                                            fix_data["downloadUrl"] = line.replace("Download URL:", "").strip()
-                                        elif line == "Files:":
-                                            in_files_section = True
-                                        elif in_files_section and line:
-                                            fix_data["files"].append(line)
-
-                                    fix_data["filesCount"] = len(fix_data["files"])
-                                    if fix_data["date"]:
-                                        fixes_in_log.append(fix_data)
-
-                                # Add all fixes found for this game
-                                for fix in fixes_in_log:
-                                    installed_fixes.append(fix)
-
-                            except Exception as exc:
-                                logger.warn(f"LuaTools: Failed to parse fix log for {appid}: {exc}")
-
-                    except Exception as exc:
-                        logger.warn(f"LuaTools: Failed to process manifest {filename}: {exc}")
-                        continue
-
-            except Exception as exc:
-                logger.warn(f"LuaTools: Failed to scan library {lib_path}: {exc}")
-                continue
+            # Check for luatools fix log
+            log_file_path = os.path.join(full_install_path, f"luatools-fix-log-{appid}.log")
+            if os.path.exists(log_file_path):
+                # Parse the log file to get fix info (supports multiple fixes)
+                try:
+                    with open(log_file_path, "r", encoding="utf-8") as log_handle:
+                        log_content = log_handle.read()
+
+                    # Parse multiple fixes (new format with [FIX] markers)
+                    fixes_in_log = []
+                    if "[FIX]" in log_content:
+                        # New format with multiple fixes
+                        fix_blocks = log_content.split("[FIX]")
+                        for block in fix_blocks:
+                            if not block.strip():
+                                continue
+
+                            # Extract data from this fix block
+                            fix_data = {
+                                "appid": appid,
+                                "gameName": game_name,
+                                "installPath": full_install_path,
+                                "date": "",
+                                "fixType": "",
+                                "downloadUrl": "",
+                                "filesCount": 0,
+                                "files": []
+                            }
+
+                            lines = block.split("\n")
+                            in_files_section = False
+
+                            for line in lines:
+                                line = line.strip()
+                                if line == "[/FIX]" or line == "---":
+                                    break
+                                if line.startswith("Date:"):
+                                    fix_data["date"] = line.replace("Date:", "").strip()
+                                elif line.startswith("Game:"):
+                                    log_game_name = line.replace("Game:", "").strip()
+                                    if log_game_name and log_game_name != f"Unknown Game ({appid})":
+                                        fix_data["gameName"] = log_game_name
+                                elif line.startswith("Fix Type:"):
+                                    fix_data["fixType"] = line.replace("Fix Type:", "").strip()
+                                elif line.startswith("Download URL:"):
+                                    fix_data["downloadUrl"] = line.replace("Download URL:", "").strip()
+                                elif line == "Files:":
+                                    in_files_section = True
+                                elif in_files_section and line:
+                                    fix_data["files"].append(line)
+
+                            fix_data["filesCount"] = len(fix_data["files"])
+                            if fix_data["date"]:  # Only add if it has a date (valid fix)
+                                fixes_in_log.append(fix_data)
+                    else:
+                        # Old format (single fix without markers) - legacy support
+                        log_lines = log_content.split("\n")
+                        fix_data = {
+                            "appid": appid,
+                            "gameName": game_name,
+                            "installPath": full_install_path,
+                            "date": "",
+                            "fixType": "",
+                            "downloadUrl": "",
+                            "filesCount": 0,
+                            "files": []
+                        }
+
+                        in_files_section = False
+                        for line in log_lines:
+                            line = line.strip()
+                            if line.startswith("Date:"):
+                                fix_data["date"] = line.replace("Date:", "").strip()
+                            elif line.startswith("Game:"):
+                                log_game_name = line.replace("Game:", "").strip()
+                                if log_game_name and log_game_name != f"Unknown Game ({appid})":
+                                    fix_data["gameName"] = log_game_name
+                            elif line.startswith("Fix Type:"):
+                                fix_data["fixType"] = line.replace("Fix Type:", "").strip()
+                            elif line.startswith("Download URL:"):
+                                fix_data["downloadUrl"] = line.replace("Download URL:", "").strip()
+                            elif line == "Files:":
+                                in_files_section = True
+                            elif in_files_section and line:
+                                fix_data["files"].append(line)
+
+                        fix_data["filesCount"] = len(fix_data["files"])
+                        if fix_data["date"]:
+                            fixes_in_log.append(fix_data)
+
+                    # Add all fixes found for this game
+                    for fix in fixes_in_log:
+                        installed_fixes.append(fix)
+
+                except Exception as exc:
+                    logger.warn(f"LuaTools: Failed to parse fix log for {appid}: {exc}")
 
         return json.dumps({"success": True, "fixes": installed_fixes})
 
@@ -689,6 +975,7 @@ __all__ = [
     "apply_game_fix",
     "cancel_apply_fix",
     "check_for_fixes",
+    "cleanup_stale_fix_partials",
     "get_apply_fix_status",
     "get_installed_fixes",
     "get_unfix_status",
@@ -0,0 +1,341 @@
+"""Per-host health tracking and circuit breaking for outbound requests.
+
+Each host accumulates consecutive failures and a smoothed latency. After
+``FAILURE_THRESHOLD`` consecutive failures its breaker opens for a cooldown
+that doubles on every further failure (capped at ``MAX_COOLDOWN_SECONDS``);
+once the cooldown has elapsed the breaker is half-open: :meth:`HostHealth.is_open`
+lets exactly one caller through as a trial and keeps refusing everyone else
+until that trial reports back (or its lease of ``TRIAL_LEASE_SECONDS``
+expires). State is persisted in the same SQLite file as ``cache.AppCache`` so
+it survives a restart.
+
+Only transport errors and ``5xx``/``429`` responses count as failures; see
+:func:`is_failure_status` and :func:`is_transport_error`.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import CACHE_DB_FILE
+from logger import logger
+from paths import backend_path
+
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN_SECONDS = 60
+MAX_COOLDOWN_SECONDS = 15 * 60
+LATENCY_SMOOTHING = 0.3  # weight of the newest sample in the moving average
+# A trial that never reports back (caller crashed or gave up on a local
+# error) stops blocking other callers after this long.
+TRIAL_LEASE_SECONDS = 60
+
+T = TypeVar("T")
+
+
+class HostUnavailableError(RuntimeError):
+    """Raised instead of contacting a host whose breaker is open."""
+
+
+def is_failure_status(status: Any) -> bool:
+    """True for HTTP statuses that say the host itself is unhealthy."""
+    return isinstance(status, int) and (status >= 500 or status == 429)
+
+
+def is_transport_error(exc: BaseException) -> bool:
+    """True for errors raised while talking to the host (not local I/O)."""
+    return isinstance(exc, httpx.TransportError)
+
+
+def host_of(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+class HostHealth:
+    def __init__(self):
+        self.db_path = backend_path(CACHE_DB_FILE)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        # host -> monotonic deadline of the half-open trial currently in flight
+        self._trials: Dict[str, float] = {}
+        # Every record_* call persists a row; one connection is kept for them.
+        self._conn: Optional[sqlite3.Connection] = None
+        # Loaded on first use so importing this module never writes to disk.
+        self._loaded = False
+
+    def _ensure_loaded_locked(self) -> None:
+        if not self._loaded:
+            self._loaded = True
+            self._init_db()
+
+    def _init_db(self):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS host_health (
+                        host TEXT PRIMARY KEY,
+                        consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                        total_failures INTEGER NOT NULL DEFAULT 0,
+                        total_successes INTEGER NOT NULL DEFAULT 0,
+                        avg_latency_ms REAL,
+                        last_error TEXT,
+                        last_failure INTEGER,
+                        last_success INTEGER,
+                        open_until REAL NOT NULL DEFAULT 0
+                    )
+                """)
+                rows = conn.execute("""
+                    SELECT host, consecutive_failures, total_failures, total_successes,
+                           avg_latency_ms, last_error, last_failure, last_success, open_until
+                    FROM host_health
+                """).fetchall()
+                conn.commit()
+            for row in rows:
+                self._hosts[row[0]] = {
+                    "consecutive_failures": row[1],
+                    "total_failures": row[2],
+                    "total_successes": row[3],
+                    "avg_latency_ms": row[4],
+                    "last_error": row[5],
+                    "last_failure": row[6],
+                    "last_success": row[7],
+                    "open_until": row[8] or 0,
+                }
+        except Exception as e:
+            logger.warn(f"SkyTools: Host health DB init failed: {e}")
+
+    def _entry_locked(self, host: str) -> Dict[str, Any]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = {
+                "consecutive_failures": 0,
+                "total_failures": 0,
+                "total_successes": 0,
+                "avg_latency_ms": None,
+                "last_error": None,
+                "last_failure": None,
+                "last_success": None,
+                "open_until": 0,
+            }
+            self._hosts[host] = entry
+        return entry
+
+    def _connection_locked(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    def _persist_locked(self, host: str, entry: Dict[str, Any]) -> None:
+        try:
+            conn = self._connection_locked()
+            # The connection context manager commits (or rolls back) without closing.
+            with conn:
+                conn.execute("""
+                    INSERT INTO host_health (host, consecutive_failures, total_failures, total_successes,
+                                             avg_latency_ms, last_error, last_failure, last_success, open_until)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        consecutive_failures = excluded.consecutive_failures,
+                        total_failures = excluded.total_failures,
+                        total_successes = excluded.total_successes,
+                        avg_latency_ms = excluded.avg_latency_ms,
+                        last_error = excluded.last_error,
+                        last_failure = excluded.last_failure,
+                        last_success = excluded.last_success,
+                        open_until = excluded.open_until
+                """, (
+                    host,
+                    entry["consecutive_failures"],
+                    entry["total_failures"],
+                    entry["total_successes"],
+                    entry["avg_latency_ms"],
+                    entry["last_error"],
+                    entry["last_failure"],
+                    entry["last_success"],
+                    entry["open_until"],
+                ))
+        except Exception as e:
+            logger.warn(f"SkyTools: Host health update failed for {host}: {e}")
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _blocked_locked(self, host: str, entry: Optional[Dict[str, Any]]) -> bool:
+        if not entry or entry["consecutive_failures"] < FAILURE_THRESHOLD:
+            return False
+        if entry["open_until"] > time.time():
+            return True
+        return self._trials.get(host, 0.0) > time.monotonic()
+
+    def is_open(self, url: str) -> bool:
+        """True while requests to the host should be skipped.
+
+        Once the cooldown has elapsed the first caller gets False and becomes
+        the half-open trial; everyone else keeps getting True until it calls
+        :meth:`record_success` or :meth:`record_failure`.
+        """
+        host = host_of(url)
+        if not host:
+            return False
+        with self._lock:
+            self._ensure_loaded_locked()
+            entry = self._hosts.get(host)
+            if self._blocked_locked(host, entry):
+                return True
+            if entry and entry["consecutive_failures"] >= FAILURE_THRESHOLD:
+                self._trials[host] = time.monotonic() + TRIAL_LEASE_SECONDS
+            return False
+
+    def record_success(self, url: str, latency_seconds: Optional[float] = None) -> None:
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            self._ensure_loaded_locked()
+            entry = self._entry_locked(host)
+            self._trials.pop(host, None)
+            was_open = entry["consecutive_failures"] >= FAILURE_THRESHOLD
+            entry["consecutive_failures"] = 0
+            entry["total_successes"] += 1
+            entry["last_success"] = int(time.time())
+            entry["open_until"] = 0
+            if latency_seconds is not None:
+                sample = latency_seconds * 1000.0
+                previous = entry["avg_latency_ms"]
+                entry["avg_latency_ms"] = (
+                    sample if previous is None else previous + LATENCY_SMOOTHING * (sample - previous)
+                )
+            self._persist_locked(host, entry)
+        if was_open:
+            logger.log(f"SkyTools: Host {host} recovered, breaker closed")
+
+    def record_failure(self, url: str, error: Any = None) -> None:
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            self._ensure_loaded_locked()
+            entry = self._entry_locked(host)
+            self._trials.pop(host, None)
+            entry["consecutive_failures"] += 1
+            entry["total_failures"] += 1
+            entry["last_failure"] = int(time.time())
+            entry["last_error"] = str(error)[:200] if error is not None else None
+            failures = entry["consecutive_failures"]
+            if failures >= FAILURE_THRESHOLD:
+                cooldown = min(
+                    BASE_COOLDOWN_SECONDS * (2 ** (failures - FAILURE_THRESHOLD)), MAX_COOLDOWN_SECONDS
+                )
+                entry["open_until"] = time.time() + cooldown
+            self._persist_locked(host, entry)
+        if failures >= FAILURE_THRESHOLD:
+            logger.warn(
+                f"SkyTools: Host {host} failed {failures} times in a row, breaker open for {int(cooldown)}s"
+            )
+
+    def call(self, url: str, func: Callable[[], T]) -> T:
+        """Run ``func`` (a request to ``url``) through the breaker.
+
+        Raises :class:`HostUnavailableError` without calling ``func`` while the
+        breaker is open. Transport errors and 5xx/429 responses count as
+        failures; any other exception is not the host's fault and only ends a
+        half-open trial.
+        """
+        if self.is_open(url):
+            raise HostUnavailableError(f"Host {host_of(url)} is temporarily unavailable (circuit open)")
+        started = time.monotonic()
+        try:
+            result = func()
+        except Exception as exc:
+            if is_transport_error(exc):
+                self.record_failure(url, exc)
+            else:
+                self.release_trial(url)
+            raise
+        status = getattr(result, "status_code", None)
+        if is_failure_status(status):
+            self.record_failure(url, f"HTTP {status}")
+        else:
+            self.record_success(url, time.monotonic() - started)
+        return result
+
+    def release_trial(self, url: str) -> None:
+        """Give up a half-open trial without a verdict, letting the next caller probe."""
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            self._trials.pop(host, None)
+
+    def order_by_health(self, items: Iterable[T], url_of: Callable[[T], str]) -> List[T]:
+        """Return ``items`` with open-breaker hosts moved last, otherwise stable.
+
+        Unlike :meth:`is_open` this never claims a half-open trial.
+        """
+        items = list(items)
+        with self._lock:
+            self._ensure_loaded_locked()
+            blocked = {
+                host: self._blocked_locked(host, self._hosts.get(host))
+                for host in {host_of(url_of(item)) for item in items}
+            }
+        return sorted(items, key=lambda item: 1 if blocked.get(host_of(url_of(item))) else 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Diagnostic view of every tracked host."""
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded_locked()
+            hosts = [
+                {
+                    "host": host,
+                    "state": (
+                        "open"
+                        if entry["open_until"] > now
+                        else "half-open"
+                        if entry["consecutive_failures"] >= FAILURE_THRESHOLD
+                        else "closed"
+                    ),
+                    "openForSeconds": max(0, int(entry["open_until"] - now)),
+                    "consecutiveFailures": entry["consecutive_failures"],
+                    "totalFailures": entry["total_failures"],
+                    "totalSuccesses": entry["total_successes"],
+                    "avgLatencyMs": round(entry["avg_latency_ms"], 1) if entry["avg_latency_ms"] is not None else None,
+                    "lastError": entry["last_error"],
+                    "lastFailure": entry["last_failure"],
+                    "lastSuccess": entry["last_success"],
+                }
+                for host, entry in self._hosts.items()
+            ]
+        hosts.sort(key=lambda item: item["host"])
+        return hosts
+
+# Global instance
+host_health = HostHealth()
+
+
+__all__ = [
+    "HostHealth",
+    "HostUnavailableError",
+    "host_health",
+    "host_of",
+    "is_failure_status",
+    "is_transport_error",
+]
@@ -0,0 +1,170 @@
+"""Conditional-request (ETag / Last-Modified) cache for repeatable fetches.
+
+Validators are kept per URL in ``data/http_cache.json``; small response bodies
+are stored next to it under ``data/http_cache/`` so a ``304 Not Modified`` can
+be answered from disk. Callers that keep the body somewhere else themselves
+(the applist) only store validators and handle the 304 on their own.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx  # type: ignore
+
+from logger import logger
+from paths import backend_path
+
+HTTP_CACHE_INDEX_FILE = backend_path(os.path.join("data", "http_cache.json"))
+HTTP_CACHE_BODY_DIR = backend_path(os.path.join("data", "http_cache"))
+
+_CACHE_LOCK = threading.Lock()
+_INDEX: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _body_path(url: str) -> str:
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_BODY_DIR, f"{digest}.body")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+
+
+def _load_index_locked() -> Dict[str, Dict[str, Any]]:
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = {}
+        try:
+            with open(HTTP_CACHE_INDEX_FILE, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if isinstance(data, dict):
+                _INDEX = {str(k): v for k, v in data.items() if isinstance(v, dict)}
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warn(f"HTTPCache: Ignoring unreadable index: {exc}")
+    return _INDEX
+
+
+def _save_index_locked() -> None:
+    try:
+        _atomic_write(HTTP_CACHE_INDEX_FILE, json.dumps(_INDEX or {}, indent=2).encode("utf-8"))
+    except Exception as exc:
+        logger.warn(f"HTTPCache: Failed to persist index: {exc}")
+
+
+def validator_headers(url: str) -> Dict[str, str]:
+    """Return ``If-None-Match`` / ``If-Modified-Since`` headers known for ``url``."""
+    with _CACHE_LOCK:
+        entry = _load_index_locked().get(url) or {}
+    headers: Dict[str, str] = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = str(entry["etag"])
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = str(entry["last_modified"])
+    return headers
+
+
+def has_validators(url: str) -> bool:
+    return bool(validator_headers(url))
+
+
+def remember_validators(url: str, response: httpx.Response, body: Optional[bytes] = None) -> None:
+    """Record the validators of a successful ``response``; optionally keep ``body``."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    with _CACHE_LOCK:
+        index = _load_index_locked()
+        if not etag and not last_modified:
+            if index.pop(url, None) is not None:
+                _save_index_locked()
+            return
+        entry: Dict[str, Any] = {
+            "etag": etag or "",
+            "last_modified": last_modified or "",
+            "content_type": response.headers.get("Content-Type", ""),
+            "stored_at": int(time.time()),
+            "has_body": False,
+        }
+        if body is not None:
+            try:
+                _atomic_write(_body_path(url), body)
+                entry["has_body"] = True
+            except Exception as exc:
+                logger.warn(f"HTTPCache: Failed to store body for {url}: {exc}")
+        index[url] = entry
+        _save_index_locked()
+
+
+def forget(url: str) -> None:
+    with _CACHE_LOCK:
+        if _load_index_locked().pop(url, None) is not None:
+            _save_index_locked()
+    try:
+        os.remove(_body_path(url))
+    except Exception:
+        pass
+
+
+def _cached_response(url: str, response: httpx.Response) -> Optional[httpx.Response]:
+    with _CACHE_LOCK:
+        entry = _load_index_locked().get(url) or {}
+    if not entry.get("has_body"):
+        return None
+    try:
+        with open(_body_path(url), "rb") as handle:
+            body = handle.read()
+    except Exception:
+        return None
+    headers = {"X-LuaTools-Cache": "hit"}
+    if entry.get("content_type"):
+        headers["Content-Type"] = entry["content_type"]
+    return httpx.Response(200, content=body, headers=headers, request=response.request)
+
+
+def conditional_get(client: httpx.Client, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> httpx.Response:
+    """GET ``url`` with stored validators; a 304 is returned as a cached 200 response.
+
+    Any other status is passed through unchanged. Successful responses refresh
+    the stored validators and body.
+    """
+    request_headers = dict(headers or {})
+    request_headers.update(validator_headers(url))
+    response = client.get(url, headers=request_headers, **kwargs)
+
+    if response.status_code == 304:
+        cached = _cached_response(url, response)
+        if cached is not None:
+            logger.log(f"HTTPCache: 304 Not Modified, served from cache -> {url}")
+            return cached
+        # Validators without a body are useless here; refetch unconditionally.
+        forget(url)
+        return client.get(url, headers=headers, **kwargs)
+
+    if response.status_code == 200:
+        remember_validators(url, response, response.content)
+    return response
+
+
+def is_cache_hit(response: httpx.Response) -> bool:
+    return response.headers.get("X-LuaTools-Cache") == "hit"
+
+
+__all__ = [
+    "conditional_get",
+    "forget",
+    "has_validators",
+    "is_cache_hit",
+    "remember_validators",
+    "validator_headers",
+]
@@ -1,47 +1,100 @@
-"""Shared HTTP client management for the LuaTools backend."""
+"""Shared HTTP client management for the LuaTools backend.
 
-from typing import Optional
+Clients are created lazily per profile (see ``config.HTTP_CLIENT_PROFILES``):
+each profile has its own connection pool, keep-alive policy and split
+connect/read/write/pool timeouts.
+"""
+
+import threading
+from typing import Any, Dict
 
 import httpx  # type: ignore
 
-from config import HTTP_TIMEOUT_SECONDS
+from config import HTTP2_ENABLED, HTTP_CLIENT_PROFILES
 from logger import logger
 
-_HTTP_CLIENT: Optional[httpx.Client] = None
+try:
+    import h2  # type: ignore  # noqa: F401
 
+    _HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
 
-def ensure_http_client(context: str = "") -> httpx.Client:
-    """Create the shared HTTP client if needed and return it."""
-    global _HTTP_CLIENT
-    if _HTTP_CLIENT is None:
-        prefix = f"{context}: " if context else ""
-        logger.log(f"{prefix}Initializing shared HTTPX client...")
-        try:
-            _HTTP_CLIENT = httpx.Client(timeout=HTTP_TIMEOUT_SECONDS)
-            logger.log(f"{prefix}HTTPX client initialized")
-        except Exception as exc:
-            logger.error(f"{prefix}Failed to initialize HTTPX client: {exc}")
-            raise
-    return _HTTP_CLIENT
+DEFAULT_PROFILE = "default"
+
+_HTTP_CLIENTS: Dict[str, httpx.Client] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def _profile_settings(profile: str) -> Dict[str, float]:
+    settings = HTTP_CLIENT_PROFILES.get(profile)
+    if settings is None:
+        logger.warn(f"HTTPX: unknown client profile '{profile}', using '{DEFAULT_PROFILE}'")
+        settings = HTTP_CLIENT_PROFILES[DEFAULT_PROFILE]
+    return settings
+
+
+def client_options(profile: str = DEFAULT_PROFILE) -> Dict[str, Any]:
+    """Return the httpx client keyword arguments for ``profile``.
 
+    Shared by the synchronous clients here and the async clients in ``async_core``.
+    """
+    settings = _profile_settings(profile)
+    timeout = httpx.Timeout(
+        connect=settings["connect"],
+        read=settings["read"],
+        write=settings["write"],
+        pool=settings["pool"],
+    )
+    limits = httpx.Limits(
+        max_connections=int(settings["max_connections"]),
+        max_keepalive_connections=int(settings["max_keepalive"]),
+        keepalive_expiry=settings["keepalive_expiry"],
+    )
+    return {"timeout": timeout, "limits": limits, "http2": HTTP2_ENABLED and _HTTP2_AVAILABLE}
 
-def get_http_client() -> httpx.Client:
-    """Return the shared HTTP client, creating it if necessary."""
-    return ensure_http_client()
+
+def ensure_http_client(context: str = "", profile: str = DEFAULT_PROFILE) -> httpx.Client:
+    """Create the shared HTTP client for ``profile`` if needed and return it."""
+    client = _HTTP_CLIENTS.get(profile)
+    if client is not None:
+        return client
+
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(profile)
+        if client is None:
+            prefix = f"{context}: " if context else ""
+            logger.log(f"{prefix}Initializing shared HTTPX client (profile={profile})...")
+            try:
+                client = httpx.Client(**client_options(profile))
+                _HTTP_CLIENTS[profile] = client
+                logger.log(
+                    f"{prefix}HTTPX client initialized (profile={profile}, "
+                    f"http2={HTTP2_ENABLED and _HTTP2_AVAILABLE})"
+                )
+            except Exception as exc:
+                logger.error(f"{prefix}Failed to initialize HTTPX client: {exc}")
+                raise
+    return client
+
+
+def get_http_client(profile: str = DEFAULT_PROFILE) -> httpx.Client:
+    """Return the shared HTTP client for ``profile``, creating it if necessary."""
+    return ensure_http_client(profile=profile)
 
 
 def close_http_client(context: str = "") -> None:
-    """Close and dispose of the shared HTTP client."""
-    global _HTTP_CLIENT
-    if _HTTP_CLIENT is None:
+    """Close and dispose of every shared HTTP client."""
+    with _HTTP_CLIENTS_LOCK:
+        clients = list(_HTTP_CLIENTS.items())
+        _HTTP_CLIENTS.clear()
+    if not clients:
         return
 
-    try:
-        _HTTP_CLIENT.close()
-    except Exception:
-        pass
-    finally:
-        _HTTP_CLIENT = None
-        prefix = f"{context}: " if context else ""
-        logger.log(f"{prefix}HTTPX client closed")
-
+    for _, client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+    prefix = f"{context}: " if context else ""
+    logger.log(f"{prefix}HTTPX clients closed ({', '.join(name for name, _ in clients)})")
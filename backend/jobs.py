@@ -0,0 +1,226 @@
+"""Progress tracking for add/fix/unfix jobs.
+
+Each job is a :class:`JobState` owned by a single worker thread. The worker
+bumps plain integer byte counters without locking and publishes a snapshot
+dict at most every ``PUBLISH_INTERVAL_SECONDS``; field changes (status,
+error, ...) publish immediately. Status readers only ever see a published
+snapshot, so per-chunk progress never takes a lock or copies state.
+Cancellation is a ``threading.Event``. Finished jobs are evicted from their
+:class:`JobStore` after ``FINISHED_JOB_TTL_SECONDS`` or once more than
+``MAX_FINISHED_JOBS`` have accumulated.
+
+Every publish takes a version from one process-wide counter and notifies a
+shared condition, so :meth:`JobStore.wait_for_update` can block until a job
+moves past a version the caller has already seen.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PUBLISH_INTERVAL_SECONDS = 0.25
+FINISHED_JOB_TTL_SECONDS = 10 * 60
+MAX_FINISHED_JOBS = 64
+
+TERMINAL_STATUSES = frozenset({"done", "failed", "cancelled"})
+
+# Guards _LAST_VERSION and is notified on every publish of any job.
+_UPDATES = threading.Condition()
+_LAST_VERSION = 0
+
+
+def current_version() -> int:
+    """Latest version handed out to any job; usable as a ``since`` cursor."""
+    with _UPDATES:
+        return _LAST_VERSION
+
+
+class JobState:
+    __slots__ = (
+        "appid",
+        "kind",
+        "bytes_read",
+        "total_bytes",
+        "cancel_event",
+        "finished_at",
+        "version",
+        "_fields",
+        "_snapshot",
+        "_published_at",
+        "_lock",
+    )
+
+    def __init__(self, appid: int, kind: str, fields: Optional[Dict[str, Any]] = None) -> None:
+        self.appid = appid
+        self.kind = kind
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.cancel_event = threading.Event()
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self._fields: Dict[str, Any] = {}
+        self._snapshot: Dict[str, Any] = {}
+        self._published_at = 0.0
+        self._lock = threading.Lock()
+        self.set(fields or {})
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def status(self) -> str:
+        return str(self._fields.get("status") or "")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def set(self, fields: Dict[str, Any]) -> None:
+        """Merge ``fields`` into the job and publish a fresh snapshot.
+
+        ``bytesRead``/``totalBytes`` are routed to the integer counters. Once a
+        job is cancelled its status stays ``cancelled``.
+        """
+        with self._lock:
+            for key, value in fields.items():
+                if key == "bytesRead":
+                    self.bytes_read = int(value or 0)
+                elif key == "totalBytes":
+                    self.total_bytes = int(value or 0)
+                elif key == "status" and self.cancelled and value != "cancelled":
+                    continue
+                else:
+                    self._fields[key] = value
+            if self.finished and self.finished_at is None:
+                self.finished_at = time.time()
+            self._publish_locked()
+
+    def add_bytes(self, count: int) -> None:
+        """Advance the byte counter; publishes at most every PUBLISH_INTERVAL_SECONDS."""
+        self.bytes_read += count
+        if time.monotonic() - self._published_at >= PUBLISH_INTERVAL_SECONDS:
+            self.publish()
+
+    def publish(self) -> None:
+        with self._lock:
+            self._publish_locked()
+
+    def _publish_locked(self) -> None:
+        global _LAST_VERSION
+        snapshot = dict(self._fields)
+        snapshot["bytesRead"] = self.bytes_read
+        snapshot["totalBytes"] = self.total_bytes
+        with _UPDATES:
+            _LAST_VERSION += 1
+            snapshot["version"] = _LAST_VERSION
+            self.version = _LAST_VERSION
+            self._snapshot = snapshot
+            self._published_at = time.monotonic()
+            _UPDATES.notify_all()
+
+    def cancel(self, error: str = "Cancelled by user") -> None:
+        self.cancel_event.set()
+        self.set({"status": "cancelled", "error": error})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the last published snapshot."""
+        return dict(self._snapshot)
+
+
+class JobStore:
+    """Jobs of one kind, keyed by appid, with bounded retention of finished jobs."""
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self._jobs: Dict[int, JobState] = {}
+        self._lock = threading.Lock()
+
+    def _evict_locked(self) -> None:
+        now = time.time()
+        finished = [
+            (job.finished_at or now, appid)
+            for appid, job in self._jobs.items()
+            if job.finished and job.finished_at is not None
+        ]
+        if not finished:
+            return
+        finished.sort()
+        overflow = len(finished) - MAX_FINISHED_JOBS
+        for index, (finished_at, appid) in enumerate(finished):
+            if index < overflow or now - finished_at > FINISHED_JOB_TTL_SECONDS:
+                self._jobs.pop(appid, None)
+
+    def start(self, appid: int, fields: Dict[str, Any]) -> JobState:
+        """Register a fresh job for ``appid``, replacing any previous one."""
+        job = JobState(appid, self.kind, fields)
+        with self._lock:
+            self._evict_locked()
+            self._jobs[appid] = job
+        return job
+
+    def get(self, appid: int) -> Optional[JobState]:
+        with self._lock:
+            self._evict_locked()
+            return self._jobs.get(appid)
+
+    def update(self, appid: int, fields: Dict[str, Any]) -> None:
+        job = self.get(appid)
+        if job is None:
+            job = self.start(appid, fields)
+        else:
+            job.set(fields)
+
+    def snapshot(self, appid: int) -> Dict[str, Any]:
+        job = self.get(appid)
+        return job.snapshot() if job is not None else {}
+
+    def is_cancelled(self, appid: int) -> bool:
+        job = self.get(appid)
+        return job is not None and job.cancelled
+
+    def changed_since(self, since_version: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """``(appid, snapshot)`` for jobs published after ``since_version``.
+
+        With no cursor (0) only unfinished jobs are listed; with a cursor,
+        jobs that finished since then are included so callers see the
+        terminal state.
+        """
+        with self._lock:
+            self._evict_locked()
+            jobs = list(self._jobs.items())
+        return [
+            (appid, job.snapshot())
+            for appid, job in jobs
+            if job.version > since_version and (since_version or not job.finished)
+        ]
+
+    def wait_for_update(self, appid: int, since_version: int, timeout: float) -> Dict[str, Any]:
+        """Block until the job for ``appid`` publishes past ``since_version``.
+
+        Returns the latest snapshot as soon as one is newer, or whatever is
+        current (possibly ``{}``) once ``timeout`` seconds have passed.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with _UPDATES:
+            while True:
+                # Plain dict read: taking self._lock here would invert the
+                # store -> job -> _UPDATES lock order used by publishers.
+                job = self._jobs.get(appid)
+                if job is not None and job.version > since_version:
+                    return job.snapshot()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job.snapshot() if job is not None else {}
+                _UPDATES.wait(remaining)
+
+
+__all__ = [
+    "FINISHED_JOB_TTL_SECONDS",
+    "JobState",
+    "JobStore",
+    "TERMINAL_STATUSES",
+    "current_version",
+]
@@ -0,0 +1,244 @@
+"""Transactional journal of loaded apps and add/remove events for the LuaTools backend.
+
+Replaces ``loadedappids.txt`` (apps added since the user last dismissed the
+notice) and ``appidlogs.txt`` (history of every add/remove) with two tables in
+the shared SQLite cache, run in WAL mode so writers never block readers. Each
+mutation touches one indexed row instead of rewriting a text file. The old
+files are imported once and then renamed to ``*.imported``.
+
+Nothing touches the database or the text files at import time; the schema and
+the one-time import run on first use (``Plugin._load`` triggers them through
+:meth:`AppJournal.prepare`).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import APPID_LOG_FILE, CACHE_DB_FILE, LOADED_APPS_FILE
+from logger import logger
+from paths import backend_path
+
+EVENT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+IMPORTED_SUFFIX = ".imported"
+_IMPORT_MARKER = "text_files_imported"
+
+
+def _parse_loaded_line(line: str) -> Optional[Tuple[int, str]]:
+    if ":" not in line:
+        return None
+    appid_str, name = line.split(":", 1)
+    appid_str = appid_str.strip()
+    name = name.strip()
+    if not appid_str.isdigit() or not name:
+        return None
+    return int(appid_str), name
+
+
+def _parse_event_line(line: str) -> Optional[Tuple[int, str, str, Optional[int]]]:
+    # Format: [ACTION - API_NAME] appid - name - timestamp
+    # Example: [ADDED - Sadie] 945360 - Among Us - 2024-01-15 14:05:04
+    if not line.startswith("[") or "]" not in line:
+        return None
+    action, content = line[1:].split("]", 1)
+    content_parts = content.strip().split(" - ")
+    if len(content_parts) < 2:
+        return None
+    try:
+        appid = int(content_parts[0].strip())
+    except ValueError:
+        return None
+    created_at: Optional[int] = None
+    if len(content_parts) >= 3:
+        try:
+            created_at = int(time.mktime(time.strptime(content_parts[-1].strip(), EVENT_TIME_FORMAT)))
+            content_parts = content_parts[:-1]
+        except (ValueError, OverflowError):
+            pass
+    # Names may themselves contain " - "
+    name = " - ".join(content_parts[1:]).strip()
+    return appid, action.strip(), name, created_at
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class AppJournal:
+    def __init__(self):
+        self.db_path = backend_path(CACHE_DB_FILE)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def prepare(self) -> None:
+        """Create the tables and import the legacy text files, once."""
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            self._init_db()
+            self._import_text_files()
+            self._ready = True
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        # WAL is already durable across crashes; full fsync per commit is not needed.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        self.prepare()
+        return self._open()
+
+    def _init_db(self):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                # Persistent per database file; later connections inherit it.
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS loaded_apps (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        appid INTEGER NOT NULL UNIQUE,
+                        name TEXT NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS appid_events (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        appid INTEGER NOT NULL,
+                        action TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        created_at INTEGER
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_appid_events_appid ON appid_events (appid, id)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS journal_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal DB init failed: {e}")
+
+    def _import_text_files(self):
+        """One-time import of loadedappids.txt and appidlogs.txt."""
+        loaded_path = backend_path(LOADED_APPS_FILE)
+        log_path = backend_path(APPID_LOG_FILE)
+        try:
+            with self._open() as conn:
+                if conn.execute("SELECT 1 FROM journal_meta WHERE key = ?", (_IMPORT_MARKER,)).fetchone():
+                    return
+                loaded = 0
+                events = 0
+                if os.path.exists(log_path):
+                    rows = [row for row in map(_parse_event_line, _read_lines(log_path)) if row is not None]
+                    conn.executemany(
+                        "INSERT INTO appid_events (appid, action, name, created_at) VALUES (?, ?, ?, ?)", rows
+                    )
+                    events = len(rows)
+                if os.path.exists(loaded_path):
+                    for appid, name in filter(None, map(_parse_loaded_line, _read_lines(loaded_path))):
+                        conn.execute("DELETE FROM loaded_apps WHERE appid = ?", (appid,))
+                        conn.execute("INSERT INTO loaded_apps (appid, name) VALUES (?, ?)", (appid, name))
+                        loaded += 1
+                conn.execute(
+                    "INSERT INTO journal_meta (key, value) VALUES (?, ?)", (_IMPORT_MARKER, str(int(time.time())))
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal import failed, keeping text files: {e}")
+            return
+        for path in (loaded_path, log_path):
+            if os.path.exists(path):
+                try:
+                    os.replace(path, path + IMPORTED_SUFFIX)
+                except Exception as e:
+                    logger.warn(f"SkyTools: Could not rename imported {path}: {e}")
+        if loaded or events:
+            logger.log(f"SkyTools: Imported {loaded} loaded apps and {events} appid events into the journal")
+
+    def add_loaded_app(self, appid: int, name: str) -> None:
+        """Record ``appid`` as loaded; re-adding moves it to the end of the list.
+
+        Blank names are ignored, as the old text file reader skipped them.
+        """
+        name = (name or "").strip()
+        if not name:
+            logger.warn(f"SkyTools: Not recording loaded app {appid} without a name")
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM loaded_apps WHERE appid = ?", (appid,))
+                conn.execute("INSERT INTO loaded_apps (appid, name) VALUES (?, ?)", (appid, name))
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal add_loaded_app failed for {appid}: {e}")
+
+    def remove_loaded_app(self, appid: int) -> None:
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM loaded_apps WHERE appid = ?", (appid,))
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal remove_loaded_app failed for {appid}: {e}")
+
+    def loaded_apps(self) -> List[Dict[str, object]]:
+        """Loaded apps in the order they were (last) added."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT appid, name FROM loaded_apps ORDER BY id").fetchall()
+        return [{"appid": int(appid), "name": name} for appid, name in rows]
+
+    def clear_loaded_apps(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM loaded_apps")
+            conn.commit()
+
+    def log_event(self, action: str, appid: int, name: str) -> None:
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO appid_events (appid, action, name, created_at) VALUES (?, ?, ?, ?)",
+                    (appid, action, name, int(time.time())),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal log_event failed for {appid}: {e}")
+
+    def known_name(self, appid: int) -> str:
+        """Name recorded for ``appid``: the loaded-apps entry, else the newest named event."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT name FROM loaded_apps WHERE appid = ?", (appid,)).fetchone()
+                if row is None:
+                    # LIKE is case-insensitive: skips "Unknown Game" and "UNKNOWN (appid)" placeholders
+                    row = conn.execute("""
+                        SELECT name FROM appid_events
+                        WHERE appid = ? AND name != '' AND name NOT LIKE 'unknown%'
+                        ORDER BY id DESC LIMIT 1
+                    """, (appid,)).fetchone()
+        except Exception as e:
+            logger.warn(f"SkyTools: Journal name lookup failed for {appid}: {e}")
+            return ""
+        return row[0] if row else ""
+
+
+# Global instance
+journal = AppJournal()
+
+
+__all__ = [
+    "AppJournal",
+    "journal",
+]
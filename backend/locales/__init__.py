@@ -5,6 +5,7 @@ from .loader import (
     LOCALES_DIR,
     PLACEHOLDER_VALUE,
     LocaleManager,
+    content_etag,
     get_locale_manager,
 )
 
@@ -13,6 +14,7 @@ __all__ = [
     "LOCALES_DIR",
     "PLACEHOLDER_VALUE",
     "LocaleManager",
+    "content_etag",
     "get_locale_manager",
 ]
 
@@ -0,0 +1,209 @@
+"""Precompiled locale bundle stored under ``backend/data``.
+
+The bundle is a single file: one JSON header line followed by the merged
+string table of each compiled locale, serialised back to back. The header
+records, per source file, its mtime/size/SHA-1 fingerprint, its ``_meta``
+block and the byte range of its merged table, so a warm start can list
+locales and decode a single table without touching ``locales/*.json``.
+
+Freshly compiled tables are staged in memory by :meth:`LocaleBundle.store`
+and written together by :meth:`LocaleBundle.flush`, so a cold start that
+compiles several locales rewrites the file once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+from typing import Any, Dict, Optional
+
+from logger import logger
+from paths import backend_path
+
+BUNDLE_FORMAT = 1
+LOCALE_BUNDLE_FILE = backend_path(os.path.join("data", "locales.bundle"))
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(65536), b""):
+                digest.update(block)
+    except Exception:
+        return ""
+    return digest.hexdigest()
+
+
+def stat_fingerprint(path: str) -> Optional[Dict[str, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+class LocaleBundle:
+    """Reader/writer for the compiled locale bundle. Not thread-safe on its own;
+    callers serialise access (``LocaleManager`` holds its lock)."""
+
+    def __init__(self, path: str = LOCALE_BUNDLE_FILE) -> None:
+        self.path = path
+        self._header: Optional[Dict[str, Any]] = None
+        self._body_offset = 0
+        # Compiled tables not yet written, all against ``_pending_base``.
+        self._pending: Dict[str, bytes] = {}
+        self._pending_base: Optional[str] = None
+
+    def _empty_header(self) -> Dict[str, Any]:
+        return {"format": BUNDLE_FORMAT, "sources": {}, "entries": {}}
+
+    def _load_header(self) -> Dict[str, Any]:
+        if self._header is not None:
+            return self._header
+
+        header = self._empty_header()
+        self._body_offset = 0
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as handle:
+                    line = handle.readline()
+                    loaded = json.loads(line.decode("utf-8"))
+                if isinstance(loaded, dict) and loaded.get("format") == BUNDLE_FORMAT:
+                    header = loaded
+                    self._body_offset = len(line)
+            except Exception as exc:
+                logger.warn(f"LuaTools: Ignoring unreadable locale bundle: {exc}")
+        self._header = header
+        return header
+
+    def source_is_fresh(self, code: str, path: str) -> bool:
+        """Return True when ``path`` still matches the fingerprint recorded for ``code``.
+
+        A cheap stat comparison is tried first; on mismatch the file is hashed so
+        a touched-but-unchanged source is not treated as modified.
+        """
+        recorded = self._load_header()["sources"].get(code)
+        if not isinstance(recorded, dict):
+            return False
+        current = stat_fingerprint(path)
+        if current is None:
+            return False
+        if current["mtime_ns"] == recorded.get("mtime_ns") and current["size"] == recorded.get("size"):
+            return True
+        if current["size"] != recorded.get("size"):
+            return False
+        if hash_file(path) != recorded.get("sha1"):
+            return False
+        recorded.update(current)
+        return True
+
+    def cached_meta(self, code: str) -> Optional[Dict[str, Any]]:
+        recorded = self._load_header()["sources"].get(code)
+        if isinstance(recorded, dict) and isinstance(recorded.get("meta"), dict):
+            return dict(recorded["meta"])
+        return None
+
+    def read_strings(self, code: str, base_sha1: str) -> Optional[Dict[str, str]]:
+        """Decode the merged table for ``code`` if it was compiled against ``base_sha1``."""
+        if code in self._pending and self._pending_base == base_sha1:
+            return json.loads(self._pending[code].decode("utf-8"))
+        header = self._load_header()
+        entry = header["entries"].get(code)
+        if not isinstance(entry, dict) or entry.get("base") != base_sha1:
+            return None
+        start = self._body_offset + int(entry.get("offset", 0))
+        length = int(entry.get("length", 0))
+        try:
+            with open(self.path, "rb") as handle:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    blob = mapped[start : start + length]
+            strings = json.loads(blob.decode("utf-8"))
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to read bundled locale {code}: {exc}")
+            return None
+        return strings if isinstance(strings, dict) else None
+
+    def source_sha1(self, code: str) -> str:
+        recorded = self._load_header()["sources"].get(code)
+        if isinstance(recorded, dict):
+            return str(recorded.get("sha1") or "")
+        return ""
+
+    def note_source(self, code: str, path: str, sha1: str, meta: Dict[str, Any]) -> None:
+        """Record a source fingerprint; persisted with the next :meth:`flush`."""
+        fingerprint = stat_fingerprint(path) or {}
+        self._load_header()["sources"][code] = {**fingerprint, "sha1": sha1, "meta": meta}
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def store(self, code: str, path: str, meta: Dict[str, Any], strings: Dict[str, str], base_sha1: str) -> None:
+        """Stage a freshly compiled locale; written by the next :meth:`flush`."""
+        if self._pending_base != base_sha1:
+            # Tables compiled against an older English base are stale.
+            self._pending = {}
+            self._pending_base = base_sha1
+        self._pending[code] = json.dumps(strings, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.note_source(code, path, hash_file(path), meta)
+
+    def flush(self) -> bool:
+        """Rewrite the bundle atomically with every staged locale; False on failure."""
+        if not self._pending:
+            return True
+        header = self._load_header()
+        base_sha1 = self._pending_base
+        blobs: Dict[str, bytes] = {}
+        entries = header["entries"]
+        if entries and os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as handle:
+                    handle.seek(self._body_offset)
+                    body = handle.read()
+                for other, entry in entries.items():
+                    if other in self._pending or not isinstance(entry, dict):
+                        continue
+                    if entry.get("base") != base_sha1:
+                        continue
+                    offset = int(entry.get("offset", 0))
+                    blobs[other] = body[offset : offset + int(entry.get("length", 0))]
+            except Exception as exc:
+                logger.warn(f"LuaTools: Failed to carry over locale bundle entries: {exc}")
+                blobs = {}
+        blobs.update(self._pending)
+
+        new_entries: Dict[str, Dict[str, Any]] = {}
+        body_parts = []
+        offset = 0
+        for other in sorted(blobs):
+            blob = blobs[other]
+            new_entries[other] = {"offset": offset, "length": len(blob), "base": base_sha1}
+            body_parts.append(blob)
+            offset += len(blob)
+
+        new_header = {"format": BUNDLE_FORMAT, "sources": header["sources"], "entries": new_entries}
+        header_line = json.dumps(new_header, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as handle:
+                handle.write(header_line)
+                for blob in body_parts:
+                    handle.write(blob)
+            os.replace(tmp_path, self.path)
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to write locale bundle: {exc}")
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+            return False
+
+        self._header = new_header
+        self._body_offset = len(header_line)
+        self._pending = {}
+        return True
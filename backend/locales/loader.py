@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import threading
@@ -9,16 +10,15 @@ from paths import backend_path
 
 from logger import logger
 
+from .bundle import LocaleBundle, hash_file
+
 DEFAULT_LOCALE = "en"
 PLACEHOLDER_VALUE = "translation missing"
 LOCALES_DIR = backend_path("locales")
 
-
-def _ensure_locales_dir() -> None:
-    try:
-        os.makedirs(LOCALES_DIR, exist_ok=True)
-    except Exception as exc:
-        logger.warn(f"LuaTools: Failed to ensure locales dir: {exc}")
+_META_SCAN_BYTES = 4096
+# Compiles landing within this window share one bundle write.
+BUNDLE_FLUSH_DEBOUNCE_SECONDS = 1.0
 
 
 def _locale_path(locale: str) -> str:
@@ -55,18 +55,40 @@ def _read_locale_file(locale: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
     return meta, strings
 
 
-def _write_locale_file(locale: str, meta: Dict[str, Any], strings: Dict[str, str]) -> None:
-    _ensure_locales_dir()
-    data = {
-        "_meta": dict(meta or {}),
-        "strings": {k: strings[k] for k in sorted(strings.keys())},
-    }
-    data["_meta"]["code"] = locale
+def _read_locale_meta(locale: str) -> Dict[str, Any]:
+    """Read only the ``_meta`` block of a locale file.
+
+    Locale files keep ``_meta`` ahead of the (large) ``strings`` table, so the
+    header is decoded from the first few KB instead of parsing the whole file.
+    """
+    path = _locale_path(locale)
     try:
-        with open(_locale_path(locale), "w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=2, ensure_ascii=False)
+        with open(path, "r", encoding="utf-8") as handle:
+            head = handle.read(_META_SCAN_BYTES)
     except Exception as exc:
-        logger.warn(f"LuaTools: Failed to write locale file {locale}: {exc}")
+        logger.warn(f"LuaTools: Failed to read locale metadata {path}: {exc}")
+        return {}
+
+    marker = head.find('"_meta"')
+    if marker != -1:
+        start = head.find("{", marker)
+        if start != -1:
+            try:
+                meta, _ = json.JSONDecoder().raw_decode(head, start)
+                if isinstance(meta, dict):
+                    return meta
+            except ValueError:
+                pass
+
+    # Unusual layout (meta after strings, flat file, oversized header).
+    meta, _ = _read_locale_file(locale)
+    return meta
+
+
+def content_etag(payload: Any) -> str:
+    """Return a short, stable content hash for a JSON-serialisable payload."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
 
 
 def _normalise_value(value: Optional[str]) -> Optional[str]:
@@ -83,82 +105,167 @@ def _normalise_value(value: Optional[str]) -> Optional[str]:
 
 
 class LocaleManager:
-    """Utility class to load and serve locale strings with fallback logic."""
+    """Utility class to load and serve locale strings with fallback logic.
+
+    Only locale metadata is scanned up front; the English base and any other
+    locale are parsed and merged the first time their strings are requested.
+    Merged tables are kept in a compiled bundle under ``data/`` so later
+    starts only recompile locales whose source file changed.
+    """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
+        self._bundle = LocaleBundle()
+        self._flush_timer: Optional[threading.Timer] = None
         self._locales: Dict[str, Dict[str, Any]] = {}
-        self._english_strings: Dict[str, str] = {}
+        self._locale_meta: Optional[Dict[str, Dict[str, Any]]] = None
+        self._english_strings: Optional[Dict[str, str]] = None
         self._english_meta: Dict[str, Any] = {}
-        self.refresh()
+        self._english_sha1: Optional[str] = None
 
     def refresh(self) -> None:
+        """Drop every cached table so the next lookup re-reads from disk."""
         with self._lock:
-            _ensure_locales_dir()
-
-            # Load default locale first
-            meta, strings = _read_locale_file(DEFAULT_LOCALE)
-            if not strings:
-                logger.warn("LuaTools: Default locale en.json is empty or missing.")
-                strings = {}
-            self._english_meta = {**meta, "code": DEFAULT_LOCALE}
-            self._english_strings = strings.copy()
+            self._flush_bundle_locked()
+            self._bundle = LocaleBundle()
             self._locales = {}
-
-            available_files = [
-                f for f in os.listdir(LOCALES_DIR) if f.endswith(".json")
-            ]
-
-            for filename in available_files:
-                locale_code = filename[:-5]
-                locale_meta, locale_strings = _read_locale_file(locale_code)
-                if locale_code != DEFAULT_LOCALE:
-                    updated = False
-                    for key in self._english_strings.keys():
-                        if key not in locale_strings:
-                            locale_strings[key] = PLACEHOLDER_VALUE
-                            updated = True
-                    if updated:
-                        _write_locale_file(locale_code, locale_meta, locale_strings)
-
-                merged_strings = {}
-                for key, english_value in self._english_strings.items():
-                    candidate = locale_strings.get(key)
-                    normalised = _normalise_value(candidate)
-                    if normalised is not None and locale_code != DEFAULT_LOCALE:
-                        merged_strings[key] = normalised
-                    else:
-                        fallback_value = _normalise_value(english_value)
-                        merged_strings[key] = fallback_value or PLACEHOLDER_VALUE
-
-                meta_payload = {**locale_meta, "code": locale_code}
+            self._locale_meta = None
+            self._english_strings = None
+            self._english_meta = {}
+            self._english_sha1 = None
+
+    def _schedule_bundle_flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(BUNDLE_FLUSH_DEBOUNCE_SECONDS, self.flush_bundle)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_bundle_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._bundle.dirty:
+            self._bundle.flush()
+
+    def flush_bundle(self) -> None:
+        """Write locales compiled since the last flush to the bundle, if any."""
+        with self._lock:
+            self._flush_bundle_locked()
+
+    def _scan_locales_locked(self) -> Dict[str, Dict[str, Any]]:
+        if self._locale_meta is not None:
+            return self._locale_meta
+
+        try:
+            available_files = [f for f in os.listdir(LOCALES_DIR) if f.endswith(".json")]
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to list locales dir: {exc}")
+            available_files = []
+
+        index: Dict[str, Dict[str, Any]] = {}
+        for filename in available_files:
+            locale_code = filename[:-5]
+            meta_payload = None
+            if self._bundle.source_is_fresh(locale_code, _locale_path(locale_code)):
+                meta_payload = self._bundle.cached_meta(locale_code)
+            if meta_payload is None:
+                meta_payload = {**_read_locale_meta(locale_code), "code": locale_code}
                 name = meta_payload.get("name") or meta_payload.get("nativeName")
                 if not name:
                     meta_payload["name"] = locale_code
                     meta_payload["nativeName"] = locale_code
-
-                self._locales[locale_code] = {
-                    "meta": meta_payload,
-                    "strings": merged_strings,
-                    "raw": locale_strings,
-                }
-
-            # Ensure default locale is present in cache
-            if DEFAULT_LOCALE not in self._locales:
-                self._locales[DEFAULT_LOCALE] = {
-                    "meta": self._english_meta,
-                    "strings": {
-                        key: _normalise_value(value) or PLACEHOLDER_VALUE
-                        for key, value in self._english_strings.items()
-                    },
-                    "raw": self._english_strings.copy(),
-                }
+            index[locale_code] = meta_payload
+
+        # Ensure default locale is always advertised
+        if DEFAULT_LOCALE not in index:
+            index[DEFAULT_LOCALE] = {
+                "code": DEFAULT_LOCALE,
+                "name": DEFAULT_LOCALE,
+                "nativeName": DEFAULT_LOCALE,
+            }
+
+        self._locale_meta = index
+        return index
+
+    def _ensure_english_locked(self) -> Dict[str, str]:
+        if self._english_strings is not None:
+            return self._english_strings
+
+        meta, strings = _read_locale_file(DEFAULT_LOCALE)
+        if not strings:
+            logger.warn("LuaTools: Default locale en.json is empty or missing.")
+            strings = {}
+        self._english_meta = {**meta, "code": DEFAULT_LOCALE}
+        self._english_strings = strings
+        return strings
+
+    def _english_sha1_locked(self) -> str:
+        if self._english_sha1 is None:
+            path = _locale_path(DEFAULT_LOCALE)
+            if self._bundle.source_is_fresh(DEFAULT_LOCALE, path):
+                self._english_sha1 = self._bundle.source_sha1(DEFAULT_LOCALE)
+            else:
+                self._english_sha1 = hash_file(path)
+        return self._english_sha1
+
+    def _compile_locale_locked(self, locale: str) -> Dict[str, str]:
+        english_strings = self._ensure_english_locked()
+        if locale == DEFAULT_LOCALE:
+            locale_strings = english_strings
+        else:
+            _, locale_strings = _read_locale_file(locale)
+
+        merged_strings = {}
+        for key, english_value in english_strings.items():
+            candidate = locale_strings.get(key)
+            normalised = _normalise_value(candidate)
+            if normalised is not None and locale != DEFAULT_LOCALE:
+                merged_strings[key] = normalised
+            else:
+                fallback_value = _normalise_value(english_value)
+                merged_strings[key] = fallback_value or PLACEHOLDER_VALUE
+        return merged_strings
+
+    def _load_locale_locked(self, locale: str) -> Optional[Dict[str, Any]]:
+        payload = self._locales.get(locale)
+        if payload is not None:
+            return payload
+
+        index = self._scan_locales_locked()
+        if locale not in index:
+            return None
+
+        path = _locale_path(locale)
+        base_sha1 = self._english_sha1_locked()
+        merged_strings = None
+        if self._bundle.source_is_fresh(locale, path):
+            merged_strings = self._bundle.read_strings(locale, base_sha1)
+
+        if merged_strings is None:
+            merged_strings = self._compile_locale_locked(locale)
+            if os.path.exists(path):
+                if locale != DEFAULT_LOCALE:
+                    self._bundle.note_source(
+                        DEFAULT_LOCALE,
+                        _locale_path(DEFAULT_LOCALE),
+                        base_sha1,
+                        index.get(DEFAULT_LOCALE, self._english_meta),
+                    )
+                self._bundle.store(locale, path, index[locale], merged_strings, base_sha1)
+                self._schedule_bundle_flush_locked()
+
+        payload = {
+            "meta": index[locale],
+            "strings": merged_strings,
+        }
+        self._locales[locale] = payload
+        return payload
 
     def available_locales(self) -> List[Dict[str, Any]]:
         with self._lock:
             locales = []
-            for code, payload in sorted(self._locales.items(), key=lambda item: item[0]):
-                meta = payload.get("meta", {})
+            for code, meta in sorted(self._scan_locales_locked().items(), key=lambda item: item[0]):
                 locales.append(
                     {
                         "code": code,
@@ -170,23 +277,38 @@ class LocaleManager:
 
     def get_locale_strings(self, locale: str) -> Dict[str, str]:
         with self._lock:
-            payload = self._locales.get(locale)
+            payload = self._load_locale_locked(locale)
             if not payload:
-                payload = self._locales.get(DEFAULT_LOCALE)
+                payload = self._load_locale_locked(DEFAULT_LOCALE)
             strings = payload.get("strings", {}) if payload else {}
             # Provide deep copy to avoid accidental mutation
             return dict(strings)
 
+    def get_locale_etag(self, locale: str) -> str:
+        """Return the content version of the merged strings served for ``locale``."""
+        with self._lock:
+            payload = self._load_locale_locked(locale)
+            if not payload:
+                payload = self._load_locale_locked(DEFAULT_LOCALE)
+            if not payload:
+                return ""
+            etag = payload.get("etag")
+            if etag is None:
+                etag = content_etag(payload.get("strings", {}))
+                payload["etag"] = etag
+            return etag
+
     def translate(self, key: str, locale: str) -> str:
         if not key:
             return PLACEHOLDER_VALUE
         with self._lock:
-            payload = self._locales.get(locale)
+            payload = self._load_locale_locked(locale)
             if payload:
                 value = payload.get("strings", {}).get(key)
                 if value is not None:
                     return value
-            value = self._locales.get(DEFAULT_LOCALE, {}).get("strings", {}).get(key)
+            payload = self._load_locale_locked(DEFAULT_LOCALE)
+            value = payload.get("strings", {}).get(key) if payload else None
             if value is not None:
                 return value
         return PLACEHOLDER_VALUE
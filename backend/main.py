@@ -21,7 +21,8 @@ from auto_update import (
     restart_steam as auto_restart_steam,
     start_auto_update_background_check,
 )
-from config import WEBKIT_DIR_NAME, WEB_UI_ICON_FILE, WEB_UI_JS_FILE
+from async_core import ensure_event_loop, shutdown_event_loop
+from config import JOB_LONG_POLL_MAX_MS, WEBKIT_DIR_NAME, WEB_UI_ICON_FILE, WEB_UI_JS_FILE
 from downloads import (
     cancel_add_via_luatools,
     delete_luatools_for_app,
@@ -31,24 +32,33 @@ from downloads import (
     get_installed_lua_scripts,
     has_luatools_for_app,
     init_applist,
+    list_add_jobs,
     read_loaded_apps,
     start_add_via_luatools,
 )
+from executor import executor
 from fixes import (
     apply_game_fix,
     cancel_apply_fix,
     check_for_fixes,
+    cleanup_stale_fix_partials,
     get_apply_fix_status,
     get_installed_fixes,
     get_unfix_status,
+    list_fix_jobs,
     unfix_game,
 )
 from utils import ensure_temp_download_dir
 from http_client import close_http_client, ensure_http_client
+from host_health import host_health
+from jobs import current_version as current_job_version
+from journal import journal
+from locales import get_locale_manager
 from logger import logger as shared_logger
 from paths import get_plugin_dir, public_path
 from settings.manager import (
     apply_settings_changes,
+    flush_settings,
     get_available_locales,
     get_settings_payload,
     get_translation_map,
@@ -194,6 +204,58 @@ def GetUnfixStatus(appid: int, contentScriptQuery: str = "") -> str:
     return get_unfix_status(appid)
 
 
+_JOB_STATUS_HANDLERS = {
+    "add": get_add_status,
+    "fix": get_apply_fix_status,
+    "unfix": get_unfix_status,
+}
+
+
+def GetActiveJobs(since: int = 0, contentScriptQuery: str = "") -> str:
+    """Every add/fix/un-fix job in one call.
+
+    Without ``since`` only unfinished jobs are returned. Passing the previous
+    ``cursor`` returns just the jobs that changed since then, including ones
+    that have finished.
+    """
+    try:
+        since_version = int(since or 0)
+    except Exception:
+        return json.dumps({"success": False, "error": "Invalid since cursor"})
+    try:
+        # Read the cursor first so an update racing this call is re-sent next time.
+        cursor = current_job_version()
+        jobs = list_add_jobs(since_version) + list_fix_jobs(since_version)
+        return json.dumps({"success": True, "cursor": cursor, "jobs": jobs})
+    except Exception as exc:
+        logger.warn(f"LuaTools: GetActiveJobs failed: {exc}")
+        return json.dumps({"success": False, "error": str(exc)})
+
+
+def WaitForJobUpdate(
+    appid: int,
+    kind: str = "add",
+    sinceVersion: int = 0,
+    timeoutMs: int = 5000,
+    contentScriptQuery: str = "",
+) -> str:
+    """Long-poll variant of the Get*Status methods.
+
+    Returns as soon as the job's state version passes ``sinceVersion`` or after
+    ``timeoutMs`` (capped at JOB_LONG_POLL_MAX_MS), in the same shape as the
+    matching status method.
+    """
+    handler = _JOB_STATUS_HANDLERS.get(kind)
+    if handler is None:
+        return json.dumps({"success": False, "error": f"Unknown job kind: {kind}"})
+    try:
+        since_version = int(sinceVersion or 0)
+        timeout_ms = min(max(int(timeoutMs or 0), 0), JOB_LONG_POLL_MAX_MS)
+    except Exception:
+        return json.dumps({"success": False, "error": "Invalid sinceVersion or timeoutMs"})
+    return handler(appid, since_version=since_version, timeout_ms=timeout_ms)
+
+
 def GetInstalledFixes(contentScriptQuery: str = "") -> str:
     return get_installed_fixes()
 
@@ -207,6 +269,14 @@ def GetGameInstallPath(appid: int, contentScriptQuery: str = "") -> str:
     return json.dumps(result)
 
 
+def GetHostHealth(contentScriptQuery: str = "") -> str:
+    try:
+        return json.dumps({"success": True, "hosts": host_health.snapshot()})
+    except Exception as exc:
+        logger.warn(f"LuaTools: GetHostHealth failed: {exc}")
+        return json.dumps({"success": False, "error": str(exc)})
+
+
 def OpenGameFolder(path: str, contentScriptQuery: str = "") -> str:
     success = open_game_folder(path)
     if success:
@@ -240,18 +310,32 @@ def OpenExternalUrl(url: str, contentScriptQuery: str = "") -> str:
         return json.dumps({"success": False, "error": str(exc)})
 
 
-def GetSettingsConfig(contentScriptQuery: str = "") -> str:
+def GetSettingsConfig(
+    contentScriptQuery: str = "",
+    schemaEtag: str = "",
+    valuesEtag: str = "",
+    translationsEtag: str = "",
+    **kwargs: Any,
+) -> str:
     try:
-        payload = get_settings_payload()
+        payload = get_settings_payload(
+            {
+                "schema": str(schemaEtag or ""),
+                "values": str(valuesEtag or ""),
+                "translations": str(translationsEtag or ""),
+            }
+        )
         response = {
             "success": True,
             "schemaVersion": payload.get("version"),
-            "schema": payload.get("schema", []),
-            "values": payload.get("values", {}),
             "language": payload.get("language"),
-            "locales": payload.get("locales", []),
-            "translations": payload.get("translations", {}),
+            "etags": payload.get("etags", {}),
+            "unchanged": payload.get("unchanged", []),
+            "notModified": payload.get("notModified", False),
         }
+        for key in ("schema", "values", "locales", "translations"):
+            if key in payload:
+                response[key] = payload[key]
         return json.dumps(response)
     except Exception as exc:
         logger.warn(f"LuaTools: GetSettingsConfig failed: {exc}")
@@ -361,11 +445,11 @@ def GetAvailableLocales(contentScriptQuery: str = "") -> str:
         return json.dumps({"success": False, "error": str(exc)})
 
 
-def GetTranslations(contentScriptQuery: str = "", language: str = "", **kwargs: Any) -> str:
+def GetTranslations(contentScriptQuery: str = "", language: str = "", etag: str = "", **kwargs: Any) -> str:
     try:
         if not language and "language" in kwargs:
             language = kwargs["language"]
-        bundle = get_translation_map(language)
+        bundle = get_translation_map(language, str(etag or ""))
         bundle["success"] = True
         return json.dumps(bundle)
     except Exception as exc:
@@ -386,8 +470,19 @@ class Plugin:
             logger.warn(f"LuaTools: steam path detection failed: {exc}")
 
         ensure_http_client("InitApis")
+        ensure_event_loop("InitApis")
         ensure_temp_download_dir()
 
+        try:
+            journal.prepare()
+        except Exception as exc:
+            logger.warn(f"SkyTools: Journal preparation failed: {exc}")
+
+        try:
+            cleanup_stale_fix_partials()
+        except Exception as exc:
+            logger.warn(f"LuaTools: Stale fix download cleanup failed: {exc}")
+
         try:
             message = apply_pending_update_if_any()
             if message:
@@ -418,7 +513,18 @@ class Plugin:
 
     def _unload(self):
         logger.log("unloading")
+        try:
+            flush_settings()
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to flush settings on unload: {exc}")
+        try:
+            get_locale_manager().flush_bundle()
+        except Exception as exc:
+            logger.warn(f"LuaTools: Failed to flush locale bundle on unload: {exc}")
+        executor.shutdown()
+        shutdown_event_loop("InitApis")
         close_http_client("InitApis")
+        host_health.close()
 
 
 plugin = Plugin()
@@ -11,7 +11,7 @@ class MorrenusAPI:
 
     def sync_games_list(self):
         """Fetches the full game list from Morrenus API (Zero Credit)."""
-        client = ensure_http_client("MorrenusSync")
+        client = ensure_http_client("MorrenusSync", profile="bulk")
         try:
             logger.log(f"SkyTools: Syncing Morrenus games list from {MORRENUS_GAMES_ENDPOINT}")
             headers = {
@@ -19,7 +19,7 @@ class MorrenusAPI:
                 "Cookie": self.cookie
             }
             
-            resp = client.get(MORRENUS_GAMES_ENDPOINT, headers=headers, timeout=30)
+            resp = client.get(MORRENUS_GAMES_ENDPOINT, headers=headers)
             resp.raise_for_status()
             
             data = resp.json()
@@ -101,7 +101,7 @@ class MorrenusAPI:
             }
             
             # Empty body POST
-            resp = client.post(prepare_url, headers=headers, json={}, timeout=15)
+            resp = client.post(prepare_url, headers=headers, json={})
             
             if resp.status_code != 200:
                 logger.warn(f"SkyTools: Morrenus prepare failed status={resp.status_code} body={resp.text[:100]}")
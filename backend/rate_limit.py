@@ -0,0 +1,160 @@
+"""Request pacing helpers for the LuaTools backend.
+
+:class:`TokenBucket` paces calls to a rate-limited API. Callers reserve a
+slot under a short lock and do any waiting *outside* it, so a caller waiting
+for its turn never blocks threads that only read caches. A ``429`` feeds back
+through :meth:`TokenBucket.penalize`: the bucket pauses for ``Retry-After``
+(or an exponential backoff when absent) and halves its rate, then recovers
+additively with every success.
+
+:class:`SingleFlight` collapses concurrent calls for the same key into one:
+the first caller runs the function, later callers wait for and share its
+result.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+MIN_RATE_FRACTION = 0.125  # the rate never drops below 1/8 of the configured rate
+RECOVERY_FRACTION = 0.1  # share of the configured rate restored per success
+DEFAULT_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 5 * 60
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: int = 1) -> None:
+        self.base_rate = float(rate_per_second)
+        self.rate = self.base_rate
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = DEFAULT_BACKOFF_SECONDS
+        self._lock = threading.Lock()
+
+    def _refill_locked(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token; returns how long the caller must sleep before using it.
+
+        Returns None, without taking anything, if that would exceed ``max_wait``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill_locked(now)
+            wait = max(0.0, self._paused_until - now)
+            # Tokens refilled during a pause are usable once it ends, but the
+            # bucket still holds at most ``burst`` of them at that moment.
+            available = min(float(self.burst), self._tokens + wait * self.rate)
+            if available < 1.0:
+                wait += (1.0 - available) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            # Balance left at the wake time, expressed as of now (negative
+            # means tokens already promised to earlier reservations).
+            self._tokens = max(available, 1.0) - 1.0 - wait * self.rate
+            return wait
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Block (without holding any lock) until a request may be sent."""
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """Back off after a ``429``; returns the pause applied in seconds."""
+        with self._lock:
+            if retry_after is None:
+                pause = self._backoff
+                self._backoff = min(self._backoff * 2, MAX_BACKOFF_SECONDS)
+            else:
+                pause = min(retry_after, MAX_BACKOFF_SECONDS)
+            now = time.monotonic()
+            self._refill_locked(now)
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = min(self._tokens, 0.0)
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate / 2)
+            return pause
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.rate < self.base_rate:
+                now = time.monotonic()
+                self._refill_locked(now)
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_FRACTION)
+            self._backoff = DEFAULT_BACKOFF_SECONDS
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """Run ``func`` once for all concurrent callers with the same ``key``."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+__all__ = [
+    "SingleFlight",
+    "TokenBucket",
+    "parse_retry_after",
+]
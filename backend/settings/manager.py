@@ -9,7 +9,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 from logger import logger
 from paths import backend_path
 
-from locales import DEFAULT_LOCALE, PLACEHOLDER_VALUE, get_locale_manager
+from locales import DEFAULT_LOCALE, PLACEHOLDER_VALUE, content_etag, get_locale_manager
 
 from .options import (
     SETTINGS_GROUPS,
@@ -21,9 +21,18 @@ from .options import (
 SCHEMA_VERSION = 1
 SETTINGS_FILE = backend_path(os.path.join("data", "settings.json"))
 
+PERSIST_DEBOUNCE_SECONDS = 0.5
+
 _SETTINGS_LOCK = threading.Lock()
 _SETTINGS_CACHE: Dict[str, Any] | None = None
+_SETTINGS_DIRTY = False
+_PERSIST_TIMER: threading.Timer | None = None
+# Serialises file writes so an older snapshot never lands after a newer one.
+_PERSIST_LOCK = threading.Lock()
 _CHANGE_HOOKS: Dict[Tuple[str, str], List[Callable[[Any, Any], None]]] = {}
+# Built schema and its etag, keyed by the locale choices injected into it.
+_SCHEMA_CACHE: Dict[Tuple[Tuple[str, str], ...], Tuple[List[Dict[str, Any]], str]] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
 
 
 def _available_locale_codes() -> List[Dict[str, Any]]:
@@ -79,6 +88,25 @@ def _inject_locale_choices(schema: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return schema
 
 
+def _get_schema_with_etag() -> Tuple[List[Dict[str, Any]], str]:
+    """Return the locale-aware schema and its etag, built once per locale set.
+
+    The returned schema is shared; callers must treat it as read-only.
+    """
+    locale_key = tuple(
+        (str(locale["code"]), str(locale.get("nativeName") or locale.get("name") or locale["code"]))
+        for locale in _available_locale_codes()
+    )
+    with _SCHEMA_CACHE_LOCK:
+        cached = _SCHEMA_CACHE.get(locale_key)
+        if cached is None:
+            schema = _inject_locale_choices(get_settings_schema())
+            cached = (schema, content_etag(schema))
+            _SCHEMA_CACHE.clear()
+            _SCHEMA_CACHE[locale_key] = cached
+        return cached
+
+
 def _ensure_settings_dir() -> None:
     directory = os.path.dirname(SETTINGS_FILE)
     try:
@@ -99,19 +127,56 @@ def _load_settings_file() -> Dict[str, Any]:
 
 
 def _write_settings_file(data: Dict[str, Any]) -> None:
+    """Write settings via temp file + rename so a crash never leaves a torn file."""
     _ensure_settings_dir()
+    tmp_path = f"{SETTINGS_FILE}.tmp"
     try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as handle:
+        with open(tmp_path, "w", encoding="utf-8") as handle:
             json.dump(data, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, SETTINGS_FILE)
     except Exception as exc:
         logger.warn(f"LuaTools: Failed to persist settings file: {exc}")
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+
+
+def _schedule_persist_locked() -> None:
+    """Mark the cache dirty and (re)arm the debounced write-behind timer.
+
+    Must be called with ``_SETTINGS_LOCK`` held.
+    """
+    global _SETTINGS_DIRTY, _PERSIST_TIMER
+    _SETTINGS_DIRTY = True
+    if _PERSIST_TIMER is not None:
+        _PERSIST_TIMER.cancel()
+    _PERSIST_TIMER = threading.Timer(PERSIST_DEBOUNCE_SECONDS, flush_settings)
+    _PERSIST_TIMER.daemon = True
+    _PERSIST_TIMER.start()
+
+
+def flush_settings() -> None:
+    """Write pending settings changes to disk, if any."""
+    global _SETTINGS_DIRTY, _PERSIST_TIMER
+    with _PERSIST_LOCK:
+        with _SETTINGS_LOCK:
+            if _PERSIST_TIMER is not None:
+                _PERSIST_TIMER.cancel()
+                _PERSIST_TIMER = None
+            if not _SETTINGS_DIRTY or _SETTINGS_CACHE is None:
+                return
+            payload = {"version": SCHEMA_VERSION, "values": copy.deepcopy(_SETTINGS_CACHE)}
+            _SETTINGS_DIRTY = False
+        _write_settings_file(payload)
 
 
 def _persist_values(values: Dict[str, Any]) -> None:
-    payload = {"version": SCHEMA_VERSION, "values": values}
-    _write_settings_file(payload)
     global _SETTINGS_CACHE
     _SETTINGS_CACHE = copy.deepcopy(values)
+    _schedule_persist_locked()
 
 
 def _build_option_lookup() -> Dict[Tuple[str, str], SettingOption]:
@@ -191,6 +256,10 @@ def _validate_option_value(option: SettingOption, value: Any) -> Tuple[bool, Any
 
 
 def _load_settings_cache() -> Dict[str, Any]:
+    """Load and normalise settings once; persists only if normalising changed them.
+
+    Must be called with ``_SETTINGS_LOCK`` held.
+    """
     global _SETTINGS_CACHE
     if _SETTINGS_CACHE is not None:
         return _SETTINGS_CACHE
@@ -200,18 +269,18 @@ def _load_settings_cache() -> Dict[str, Any]:
     values = raw_data.get("values")
 
     merged_values = merge_defaults_with_values(values)
-    if version != SCHEMA_VERSION or merged_values != values:
-        _write_settings_file({"version": SCHEMA_VERSION, "values": merged_values})
+    language_fixed = _ensure_language_valid(merged_values)
     _SETTINGS_CACHE = merged_values
+    if version != SCHEMA_VERSION or language_fixed or merged_values != values:
+        _schedule_persist_locked()
     return merged_values
 
 
 def _get_values_locked() -> Dict[str, Any]:
+    """Current settings values; never writes. Must be called with ``_SETTINGS_LOCK`` held."""
     values = _load_settings_cache()
     if not isinstance(values, dict):
         values = {}
-    if _ensure_language_valid(values):
-        _persist_values(values)
     return values
 
 
@@ -232,6 +301,15 @@ def get_settings_state() -> Dict[str, Any]:
         }
 
 
+def get_setting_value(group_key: str, option_key: str, default: Any = None) -> Any:
+    """Return a copy of a single option's current value."""
+    with _SETTINGS_LOCK:
+        group = _get_values_locked().get(group_key)
+        if not isinstance(group, dict):
+            return default
+        return copy.deepcopy(group.get(option_key, default))
+
+
 def get_current_language() -> str:
     with _SETTINGS_LOCK:
         values = _get_values_locked()
@@ -244,27 +322,54 @@ def get_available_locales() -> List[Dict[str, Any]]:
     return _available_locale_codes()
 
 
-def get_settings_payload() -> Dict[str, Any]:
+def get_settings_payload(known_etags: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Return the settings payload, omitting sections whose etag the caller already holds.
+
+    ``known_etags`` may carry ``schema``, ``values`` and ``translations`` keys.
+    Omitted sections are listed in ``unchanged``; ``notModified`` is set when
+    every section was omitted.
+    """
+    known = known_etags if isinstance(known_etags, dict) else {}
+
     with _SETTINGS_LOCK:
         values = _get_values_locked()
         values_snapshot = copy.deepcopy(values)
 
-    schema = _inject_locale_choices(get_settings_schema())
-    locales = get_available_locales()
+    manager = get_locale_manager()
+    schema, schema_etag = _get_schema_with_etag()
     language = str(values_snapshot.get("general", {}).get("language") or DEFAULT_LOCALE)
-    translations = get_locale_manager().get_locale_strings(language)
+    etags = {
+        "schema": schema_etag,
+        "values": content_etag(values_snapshot),
+        "translations": manager.get_locale_etag(language),
+    }
 
-    return {
+    payload: Dict[str, Any] = {
         "version": SCHEMA_VERSION,
-        "values": values_snapshot,
-        "schema": schema,
         "language": language,
-        "locales": locales,
-        "translations": translations,
+        "etags": etags,
     }
-
-
-def get_translation_map(locale: Optional[str] = None) -> Dict[str, Any]:
+    unchanged: List[str] = []
+    if known.get("schema") == schema_etag:
+        unchanged.append("schema")
+    else:
+        payload["schema"] = schema
+        payload["locales"] = get_available_locales()
+    if known.get("values") == etags["values"]:
+        unchanged.append("values")
+    else:
+        payload["values"] = values_snapshot
+    if known.get("translations") == etags["translations"]:
+        unchanged.append("translations")
+    else:
+        payload["translations"] = manager.get_locale_strings(language)
+
+    payload["unchanged"] = unchanged
+    payload["notModified"] = len(unchanged) == len(etags)
+    return payload
+
+
+def get_translation_map(locale: Optional[str] = None, known_etag: str = "") -> Dict[str, Any]:
     manager = get_locale_manager()
     locales = manager.available_locales()
     codes = {item["code"] for item in locales}
@@ -275,10 +380,16 @@ def get_translation_map(locale: Optional[str] = None) -> Dict[str, Any]:
     if locale not in codes:
         locale = DEFAULT_LOCALE
 
+    etag = manager.get_locale_etag(locale)
+    if known_etag and known_etag == etag:
+        return {"language": locale, "etag": etag, "notModified": True}
+
     return {
         "language": locale,
         "locales": locales,
         "strings": manager.get_locale_strings(locale),
+        "etag": etag,
+        "notModified": False,
     }
 
 
@@ -348,15 +459,15 @@ def apply_settings_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
         if not applied_changes and not language_changed:
             values_snapshot = copy.deepcopy(updated)
             language = str(values_snapshot.get("general", {}).get("language") or DEFAULT_LOCALE)
-            translations = get_locale_manager().get_locale_strings(language)
             logger.log(
                 f"LuaTools: no changes applied; returning cached values with language={language}"
             )
             return {
                 "success": True,
                 "values": values_snapshot,
+                "valuesEtag": content_etag(values_snapshot),
                 "language": language,
-                "translations": translations,
+                "translationsEtag": get_locale_manager().get_locale_etag(language),
                 "message": "No-op",
             }
 
@@ -375,15 +486,22 @@ def apply_settings_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
                 except Exception as exc:
                     logger.warn(f"LuaTools: settings hook failed for {option_key}: {exc}")
 
-        translations = get_locale_manager().get_locale_strings(language)
+        if any(key == ("general", "language") for key, _, _ in applied_changes):
+            language_changed = True
 
         logger.log(
             f"LuaTools: apply_settings_changes final language={language}, values={values_snapshot}"
         )
-        return {
+        manager = get_locale_manager()
+        result = {
             "success": True,
             "values": values_snapshot,
+            "valuesEtag": content_etag(values_snapshot),
             "language": language,
-            "translations": translations,
+            "translationsEtag": manager.get_locale_etag(language),
         }
+        # Only ship the string table when the active language actually moved.
+        if language_changed:
+            result["translations"] = manager.get_locale_strings(language)
+        return result
 
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import os
-import re
 import subprocess
 import sys
-from typing import Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import Millennium  # type: ignore
 
 from logger import logger
+from vdf import find_vdf_values, parse_vdf
 
 _STEAM_INSTALL_PATH: Optional[str] = None
 
@@ -49,44 +50,6 @@ def detect_steam_install_path() -> str:
     return _STEAM_INSTALL_PATH or ""
 
 
-def _parse_vdf_simple(content: str) -> Dict[str, any]:
-    """Simple VDF parser for libraryfolders.vdf and appmanifest files."""
-    result: Dict[str, any] = {}
-    stack = [result]
-    current_key = None
-
-    lines = content.split("\n")
-    tokens = []
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("//"):
-            continue
-        parts = re.findall(r'"[^"]*"|\{|\}', line)
-        tokens.extend(parts)
-
-    i = 0
-    while i < len(tokens):
-        token = tokens[i].strip('"')
-
-        if tokens[i] == "{":
-            if current_key:
-                new_dict = {}
-                stack[-1][current_key] = new_dict
-                stack.append(new_dict)
-                current_key = None
-        elif tokens[i] == "}":
-            if len(stack) > 1:
-                stack.pop()
-        elif current_key is None:
-            current_key = token
-        else:
-            stack[-1][current_key] = token
-            current_key = None
-        i += 1
-
-    return result
-
-
 def _find_steam_path() -> str:
     global _STEAM_INSTALL_PATH
     if _STEAM_INSTALL_PATH:
@@ -134,6 +97,161 @@ def has_lua_for_app(appid: int) -> bool:
         return False
 
 
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class LibraryIndex:
+    """appid -> library, installdir, name and install path for installed Steam apps.
+
+    ``libraryfolders.vdf`` is re-parsed only when its mtime/size changes, and
+    an appmanifest only when its own does, so repeated lookups cost a couple
+    of ``stat`` calls. Entries are dicts with ``appid``, ``name``,
+    ``installDir``, ``libraryPath``, ``installPath`` and ``manifestPath``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._steam_path = ""
+        self._folders_signature: Optional[Tuple[int, int]] = None
+        self._libraries: List[str] = []
+        self._library_of: Dict[int, str] = {}  # appid -> library, as listed in libraryfolders.vdf
+        self._apps: Dict[int, Dict[str, Any]] = {}
+        self._manifest_signatures: Dict[str, Tuple[int, int]] = {}  # manifest path -> signature when parsed
+
+    def _reset_locked(self, steam_path: str) -> None:
+        self._steam_path = steam_path
+        self._folders_signature = None
+        self._libraries = []
+        self._library_of = {}
+        self._apps = {}
+        self._manifest_signatures = {}
+
+    def _refresh_folders_locked(self, steam_path: str) -> None:
+        if steam_path != self._steam_path:
+            self._reset_locked(steam_path)
+        library_vdf_path = os.path.join(steam_path, "config", "libraryfolders.vdf")
+        signature = _stat_signature(library_vdf_path)
+        if signature is None:
+            raise FileNotFoundError(library_vdf_path)
+        if signature == self._folders_signature:
+            return
+
+        with open(library_vdf_path, "r", encoding="utf-8") as handle:
+            library_data = parse_vdf(handle.read())
+        libraries: List[str] = []
+        library_of: Dict[int, str] = {}
+        library_folders = library_data.get("libraryfolders")
+        if not isinstance(library_folders, dict):
+            library_folders = {}
+        for folder_data in library_folders.values():
+            if not isinstance(folder_data, dict):
+                continue
+            folder_path = folder_data.get("path", "")
+            if not isinstance(folder_path, str) or not folder_path:
+                continue
+            libraries.append(folder_path)
+            apps = folder_data.get("apps", {})
+            if isinstance(apps, dict):
+                for appid_str in apps:
+                    if appid_str.isdigit():
+                        library_of.setdefault(int(appid_str), folder_path)
+
+        if libraries != self._libraries:
+            # Entries from libraries that are gone are dropped; the rest stay valid.
+            self._apps = {appid: app for appid, app in self._apps.items() if app["libraryPath"] in libraries}
+        self._libraries = libraries
+        self._library_of = library_of
+        self._folders_signature = signature
+        logger.log(f"LuaTools: Library index loaded {len(libraries)} Steam libraries")
+
+    def _load_manifest_locked(self, library_path: str, appid: int) -> Optional[Dict[str, Any]]:
+        """(Re)parse ``appid``'s manifest in ``library_path`` if it changed; None if it is missing."""
+        manifest_path = os.path.join(library_path, "steamapps", f"appmanifest_{appid}.acf")
+        signature = _stat_signature(manifest_path)
+        if signature is None:
+            self._manifest_signatures.pop(manifest_path, None)
+            if self._apps.get(appid, {}).get("manifestPath") == manifest_path:
+                del self._apps[appid]
+            return None
+        cached = self._apps.get(appid)
+        if cached is not None and cached["manifestPath"] == manifest_path and self._manifest_signatures.get(manifest_path) == signature:
+            return cached
+
+        with open(manifest_path, "r", encoding="utf-8", errors="replace") as handle:
+            install_dir, name = find_vdf_values(handle.read(), ("AppState", "installdir"), ("AppState", "name"))
+        install_dir = install_dir if isinstance(install_dir, str) else ""
+        app = {
+            "appid": appid,
+            "name": name if isinstance(name, str) else "",
+            "installDir": install_dir,
+            "libraryPath": library_path,
+            "installPath": os.path.join(library_path, "steamapps", "common", install_dir) if install_dir else "",
+            "manifestPath": manifest_path,
+        }
+        self._apps[appid] = app
+        self._manifest_signatures[manifest_path] = signature
+        return app
+
+    def get(self, steam_path: str, appid: int) -> Optional[Dict[str, Any]]:
+        """Entry for an installed ``appid``, or None.
+
+        Raises ``FileNotFoundError`` when libraryfolders.vdf is missing.
+        """
+        with self._lock:
+            self._refresh_folders_locked(steam_path)
+            cached = self._apps.get(appid)
+            candidates: List[str] = []
+            for library_path in (cached["libraryPath"] if cached else None, self._library_of.get(appid), *self._libraries):
+                if library_path and library_path not in candidates:
+                    candidates.append(library_path)
+            for library_path in candidates:
+                try:
+                    app = self._load_manifest_locked(library_path, appid)
+                except Exception as exc:
+                    logger.warn(f"LuaTools: Failed to parse appmanifest for {appid} in {library_path}: {exc}")
+                    continue
+                if app is not None:
+                    return dict(app)
+            return None
+
+    def all(self, steam_path: str) -> List[Dict[str, Any]]:
+        """Every installed app across all libraries; only changed manifests are re-read."""
+        with self._lock:
+            self._refresh_folders_locked(steam_path)
+            seen = set()
+            for library_path in self._libraries:
+                steamapps_path = os.path.join(library_path, "steamapps")
+                try:
+                    filenames = os.listdir(steamapps_path)
+                except OSError:
+                    continue
+                for filename in filenames:
+                    if not filename.startswith("appmanifest_") or not filename.endswith(".acf"):
+                        continue
+                    appid_str = filename[len("appmanifest_"):-len(".acf")]
+                    if not appid_str.isdigit() or int(appid_str) in seen:
+                        continue
+                    appid = int(appid_str)
+                    try:
+                        if self._load_manifest_locked(library_path, appid) is not None:
+                            seen.add(appid)
+                    except Exception as exc:
+                        logger.warn(f"LuaTools: Failed to process manifest {filename}: {exc}")
+            for appid in [appid for appid in self._apps if appid not in seen]:
+                self._manifest_signatures.pop(self._apps[appid]["manifestPath"], None)
+                del self._apps[appid]
+            return [dict(self._apps[appid]) for appid in sorted(seen)]
+
+
+# Global instance
+library_index = LibraryIndex()
+
+
 def get_game_install_path_response(appid: int) -> Dict[str, any]:
     """Find the game installation path. Returns dict mirroring previous JSON output."""
     try:
@@ -145,70 +263,26 @@ def get_game_install_path_response(appid: int) -> Dict[str, any]:
     if not steam_path:
         return {"success": False, "error": "Could not find Steam installation path"}
 
-    library_vdf_path = os.path.join(steam_path, "config", "libraryfolders.vdf")
-    if not os.path.exists(library_vdf_path):
-        logger.warn(f"LuaTools: libraryfolders.vdf not found at {library_vdf_path}")
-        return {"success": False, "error": "Could not find libraryfolders.vdf"}
-
     try:
-        with open(library_vdf_path, "r", encoding="utf-8") as handle:
-            vdf_content = handle.read()
-        library_data = _parse_vdf_simple(vdf_content)
+        app = library_index.get(steam_path, appid)
+    except FileNotFoundError:
+        logger.warn(f"LuaTools: libraryfolders.vdf not found under {steam_path}")
+        return {"success": False, "error": "Could not find libraryfolders.vdf"}
     except Exception as exc:
-        logger.warn(f"LuaTools: Failed to parse libraryfolders.vdf: {exc}")
+        logger.warn(f"LuaTools: Failed to read Steam libraries for {appid}: {exc}")
         return {"success": False, "error": "Failed to parse libraryfolders.vdf"}
 
-    library_folders = library_data.get("libraryfolders", {})
-    library_path = None
-    appid_str = str(appid)
-    all_library_paths = []
-
-    for folder_data in library_folders.values():
-        if isinstance(folder_data, dict):
-            folder_path = folder_data.get("path", "")
-            if folder_path:
-                folder_path = folder_path.replace("\\\\", "\\")
-                all_library_paths.append(folder_path)
-
-            apps = folder_data.get("apps", {})
-            if isinstance(apps, dict) and appid_str in apps:
-                library_path = folder_path
-                break
-
-    appmanifest_path = None
-    if not library_path:
-        logger.log(
-            f"LuaTools: appid {appid} not in libraryfolders.vdf, searching all libraries for appmanifest"
-        )
-        for lib_path in all_library_paths:
-            candidate_path = os.path.join(lib_path, "steamapps", f"appmanifest_{appid}.acf")
-            if os.path.exists(candidate_path):
-                library_path = lib_path
-                appmanifest_path = candidate_path
-                logger.log(f"LuaTools: Found appmanifest at {appmanifest_path}")
-                break
-    else:
-        appmanifest_path = os.path.join(library_path, "steamapps", f"appmanifest_{appid}.acf")
-
-    if not library_path or not appmanifest_path or not os.path.exists(appmanifest_path):
+    if app is None:
         logger.log(f"LuaTools: appmanifest not found for {appid} in any library")
         return {"success": False, "error": "menu.error.notInstalled"}
 
-    try:
-        with open(appmanifest_path, "r", encoding="utf-8") as handle:
-            manifest_content = handle.read()
-        manifest_data = _parse_vdf_simple(manifest_content)
-    except Exception as exc:
-        logger.warn(f"LuaTools: Failed to parse appmanifest: {exc}")
-        return {"success": False, "error": "Failed to parse appmanifest"}
-
-    app_state = manifest_data.get("AppState", {})
-    install_dir = app_state.get("installdir", "")
+    install_dir = app["installDir"]
     if not install_dir:
         logger.warn(f"LuaTools: installdir not found in appmanifest for {appid}")
         return {"success": False, "error": "Install directory not found"}
 
-    full_install_path = os.path.join(library_path, "steamapps", "common", install_dir)
+    full_install_path = app["installPath"]
+    library_path = app["libraryPath"]
     if not os.path.exists(full_install_path):
         logger.warn(f"LuaTools: Game install path does not exist: {full_install_path}")
         return {"success": False, "error": "Game directory not found"}
@@ -242,9 +316,11 @@ def open_game_folder(path: str) -> bool:
 
 
 __all__ = [
+    "LibraryIndex",
     "detect_steam_install_path",
     "get_game_install_path_response",
     "has_lua_for_app",
+    "library_index",
     "open_game_folder",
 ]
 
@@ -0,0 +1,172 @@
+"""Single-pass VDF (Valve KeyValues text) parser for the LuaTools backend.
+
+Used for ``libraryfolders.vdf``, ``appmanifest_*.acf`` and ``config.vdf``.
+One compiled scanner walks the text once and the tree is built as tokens
+arrive; there is no intermediate token list. Quoted strings honour backslash
+escapes (``\\"``, ``\\\\``, ``\\n``, ``\\t``), ``//`` comments and
+``[$PLATFORM]`` conditionals are skipped, and bare (unquoted) words are
+accepted.
+
+:func:`find_vdf_values` only builds the subtrees on the requested key paths
+and stops reading as soon as every one of them has been seen, so a lookup
+such as ``("AppState", "installdir")`` never touches the large depot sections
+further down an app manifest.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# One match per token; leading whitespace is consumed by the same match.
+_TOKEN_RE = re.compile(
+    r'\s*("[^"\\]*(?:\\.[^"\\]*)*"'  # quoted string, escapes kept for _unescape
+    r"|[{}]"
+    r"|//[^\n]*"  # comment
+    r"|\[[^\]\n]*\]"  # conditional such as [$WIN32]; ignored
+    r'|[^\s{}"]+)'  # bare word
+)
+_ESCAPE_RE = re.compile(r"\\(.)", re.S)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+# What a token's first character says about it
+_STRING, _OPEN, _CLOSE = 0, 1, 2
+
+
+def _unescape(text: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def _tokens(content: str) -> Iterator[Tuple[int, str]]:
+    for match in _TOKEN_RE.finditer(content):
+        token = match[1]
+        first = token[0]
+        if first == '"':
+            token = token[1:-1]
+            yield _STRING, _unescape(token) if "\\" in token else token
+        elif first == "{":
+            yield _OPEN, token
+        elif first == "}":
+            yield _CLOSE, token
+        elif first == "[" or token.startswith("//"):
+            continue
+        else:
+            yield _STRING, token
+
+
+def parse_vdf(content: str) -> Dict[str, Any]:
+    """Parse VDF text into nested dicts of strings; later duplicate keys win."""
+    root: Dict[str, Any] = {}
+    stack = [root]
+    current = root
+    key: Optional[str] = None
+    # The scanner is inlined rather than using _tokens(): this loop runs once
+    # per token of config.vdf and the generator hop is a third of its cost.
+    for match in _TOKEN_RE.finditer(content):
+        token = match[1]
+        first = token[0]
+        if first == '"':
+            token = token[1:-1]
+            if "\\" in token:
+                token = _unescape(token)
+        elif first == "{":
+            if key is None:
+                # Keyless block: merge its contents into the parent.
+                stack.append(current)
+                continue
+            child: Dict[str, Any] = {}
+            current[key] = child
+            stack.append(child)
+            current = child
+            key = None
+            continue
+        elif first == "}":
+            key = None
+            if len(stack) > 1:
+                stack.pop()
+                current = stack[-1]
+            continue
+        elif first == "[" or token.startswith("//"):
+            continue
+        if key is None:
+            key = token
+        else:
+            current[key] = token
+            key = None
+    return root
+
+
+def find_vdf_values(content: str, *paths: Sequence[str]) -> List[Any]:
+    """Values (str or dict) at each key path, None where absent.
+
+    Only subtrees on a requested path are built and parsing stops once every
+    path has been read; the first occurrence of a duplicated key is returned.
+    """
+    targets = [tuple(path) for path in paths]
+    remaining = set(targets)
+    prefixes = {target[:depth] for target in remaining for depth in range(len(target))}
+    found: Dict[Tuple[str, ...], Any] = {}
+
+    # Parallel stacks: container being filled (None while skipping a subtree),
+    # its key path, and whether everything below it is kept.
+    stack: List[Optional[Dict[str, Any]]] = [{}]
+    keys: List[Tuple[str, ...]] = [()]
+    keep: List[bool] = [False]
+    key: Optional[str] = None
+
+    for kind, token in _tokens(content):
+        if not remaining:
+            break
+        if kind == _STRING:
+            if key is None:
+                key = token
+                continue
+            container = stack[-1]
+            if container is not None:
+                if keep[-1]:
+                    container[key] = token
+                path = keys[-1] + (key,)
+                if path in remaining:
+                    found[path] = token
+                    remaining.discard(path)
+            key = None
+        elif kind == _OPEN:
+            parent = stack[-1]
+            if key is None:
+                stack.append(parent)
+                keys.append(keys[-1])
+                keep.append(keep[-1])
+                continue
+            path = keys[-1] + (key,)
+            keep_all = keep[-1] or path in remaining
+            child: Optional[Dict[str, Any]] = None
+            if parent is not None and (keep_all or path in prefixes):
+                child = {}
+                parent[key] = child
+            stack.append(child)
+            keys.append(path)
+            keep.append(keep_all)
+            key = None
+        else:
+            key = None
+            if len(stack) > 1:
+                closed = stack.pop()
+                path = keys.pop()
+                keep.pop()
+                if closed is not None and path in remaining:
+                    found[path] = closed
+                    remaining.discard(path)
+
+    return [found.get(target) for target in targets]
+
+
+def find_vdf_value(content: str, *keys: str) -> Any:
+    """Value at a single key path, e.g. ``find_vdf_value(text, "AppState", "installdir")``."""
+    return find_vdf_values(content, keys)[0]
+
+
+__all__ = [
+    "find_vdf_value",
+    "find_vdf_values",
+    "parse_vdf",
+]
@@ -41,6 +41,9 @@
         } else if (!Array.isArray(stored.locales)) {
             stored.locales = [];
         }
+        if (typeof bundle.etag === 'string') {
+            stored.etag = bundle.etag;
+        }
         stored.ready = true;
         stored.lastFetched = Date.now();
         window.__SkyToolsI18n = stored;
@@ -370,8 +373,13 @@
             }
             const targetLanguage = (typeof preferredLanguage === 'string' && preferredLanguage) ? preferredLanguage :
                 ((window.__SkyToolsI18n && window.__SkyToolsI18n.language) || '');
-            return Millennium.callServerMethod('skytools', 'GetTranslations', { language: targetLanguage, contentScriptQuery: '' }).then(function (res) {
+            const heldStore = window.__SkyToolsI18n;
+            const heldEtag = (heldStore && heldStore.ready && heldStore.etag && (!targetLanguage || heldStore.language === targetLanguage)) ? heldStore.etag : '';
+            return Millennium.callServerMethod('skytools', 'GetTranslations', { language: targetLanguage, etag: heldEtag, contentScriptQuery: '' }).then(function (res) {
                 const payload = typeof res === 'string' ? JSON.parse(res) : res;
+                if (payload && payload.success === true && payload.notModified && heldEtag) {
+                    return window.__SkyToolsI18n;
+                }
                 if (!payload || payload.success !== true || !payload.strings) {
                     throw new Error('Invalid translation payload');
                 }
@@ -418,6 +426,26 @@
         return t(text, text);
     }
 
+    // Long-poll a job's status ('add', 'fix' or 'unfix'). The backend answers as
+    // soon as the job's version passes sinceVersion, or after the timeout.
+    const JOB_WAIT_TIMEOUT_MS = 5000;
+    function waitForJobUpdate(appid, kind, sinceVersion) {
+        return Millennium.callServerMethod('skytools', 'WaitForJobUpdate', {
+            appid: appid,
+            kind: kind,
+            sinceVersion: sinceVersion || 0,
+            timeoutMs: JOB_WAIT_TIMEOUT_MS,
+            contentScriptQuery: ''
+        });
+    }
+
+    function queuedLabel(state) {
+        if (state && state.queuePosition) {
+            return lt('Queued (position {position})…').replace('{position}', state.queuePosition);
+        }
+        return lt('Queued…');
+    }
+
     // Preload translations asynchronously (no-op if backend unavailable)
     ensureTranslationsLoaded(false);
 
@@ -1046,25 +1074,30 @@
 
     // Poll fix download and extraction progress
     function pollFixProgress(appid, fixType) {
+        let version = 0;
         const poll = function () {
             try {
                 const overlayEl = document.querySelector('.skytools-overlay');
                 if (!overlayEl) return; // Stop if overlay was closed
 
-                Millennium.callServerMethod('skytools', 'GetApplyFixStatus', { appid: appid, contentScriptQuery: '' }).then(function (res) {
+                waitForJobUpdate(appid, 'fix', version).then(function (res) {
                     try {
                         const payload = typeof res === 'string' ? JSON.parse(res) : res;
                         if (payload && payload.success && payload.state) {
                             const state = payload.state;
+                            version = state.version || version;
                             const msgEl = document.getElementById('lt-fix-progress-msg');
 
-                            if (state.status === 'downloading') {
+                            if (state.status === 'queued') {
+                                if (msgEl) { msgEl.textContent = queuedLabel(state); msgEl.dataset.last = msgEl.textContent; }
+                                poll();
+                            } else if (state.status === 'downloading') {
                                 const pct = state.totalBytes > 0 ? Math.floor((state.bytesRead / state.totalBytes) * 100) : 0;
                                 if (msgEl) { msgEl.textContent = lt('Downloading: {percent}%').replace('{percent}', pct); msgEl.dataset.last = msgEl.textContent; }
-                                setTimeout(poll, 500);
+                                poll();
                             } else if (state.status === 'extracting') {
                                 if (msgEl) { msgEl.textContent = lt('Extracting to game folder...'); msgEl.dataset.last = msgEl.textContent; }
-                                setTimeout(poll, 500);
+                                poll();
                             } else if (state.status === 'cancelled') {
                                 if (msgEl) msgEl.textContent = lt('Cancelled: {reason}').replace('{reason}', state.error || lt('Cancelled by user'));
                                 replaceFixButtonsWithClose(overlayEl);
@@ -1079,7 +1112,7 @@
                                 return; // Stop polling
                             } else {
                                 // Continue polling for unknown states
-                                setTimeout(poll, 500);
+                                poll();
                             }
                         }
                     } catch (err) {
@@ -1090,7 +1123,7 @@
                 backendLog('SkyTools: pollFixProgress error: ' + err);
             }
         };
-        setTimeout(poll, 500);
+        poll();
     }
 
     // Show un-fix progress popup
@@ -1136,22 +1169,27 @@
 
     // Poll un-fix progress
     function pollUnfixProgress(appid) {
+        let version = 0;
         const poll = function () {
             try {
                 const overlayEl = document.querySelector('.skytools-unfix-overlay');
                 if (!overlayEl) return; // Stop if overlay was closed
 
-                Millennium.callServerMethod('skytools', 'GetUnfixStatus', { appid: appid, contentScriptQuery: '' }).then(function (res) {
+                waitForJobUpdate(appid, 'unfix', version).then(function (res) {
                     try {
                         const payload = typeof res === 'string' ? JSON.parse(res) : res;
                         if (payload && payload.success && payload.state) {
                             const state = payload.state;
+                            version = state.version || version;
                             const msgEl = document.getElementById('lt-unfix-progress-msg');
 
-                            if (state.status === 'removing') {
+                            if (state.status === 'queued') {
+                                if (msgEl) msgEl.textContent = queuedLabel(state);
+                                poll();
+                            } else if (state.status === 'removing') {
                                 if (msgEl) msgEl.textContent = state.progress || lt('Removing fix files...');
                                 // Continue polling
-                                setTimeout(poll, 500);
+                                poll();
                             } else if (state.status === 'done') {
                                 const filesRemoved = state.filesRemoved || 0;
                                 if (msgEl) msgEl.textContent = lt('Removed {count} files. Running Steam verification...').replace('{count}', filesRemoved);
@@ -1199,7 +1237,7 @@
                                 return; // Stop polling
                             } else {
                                 // Continue polling for unknown states
-                                setTimeout(poll, 500);
+                                poll();
                             }
                         }
                     } catch (err) {
@@ -1210,7 +1248,7 @@
                 backendLog('SkyTools: pollUnfixProgress error: ' + err);
             }
         };
-        setTimeout(poll, 500);
+        poll();
     }
 
     function fetchSettingsConfig(forceRefresh) {
@@ -1224,25 +1262,36 @@
             return Promise.reject(new Error(lt('SkyTools backend unavailable')));
         }
 
-        return Millennium.callServerMethod('skytools', 'GetSettingsConfig', { contentScriptQuery: '' }).then(function (res) {
+        const held = window.__SkyToolsSettings || null;
+        const heldEtags = (held && held.etags && typeof held.etags === 'object') ? held.etags : {};
+        return Millennium.callServerMethod('skytools', 'GetSettingsConfig', {
+            contentScriptQuery: '',
+            schemaEtag: heldEtags.schema || '',
+            valuesEtag: heldEtags.values || '',
+            translationsEtag: heldEtags.translations || ''
+        }).then(function (res) {
             const payload = typeof res === 'string' ? JSON.parse(res) : res;
             if (!payload || payload.success !== true) {
                 const errorMsg = (payload && payload.error) ? String(payload.error) : t('settings.error', 'Failed to load settings.');
                 throw new Error(errorMsg);
             }
+            // Sections listed as unchanged are omitted by the backend; reuse the held copies.
+            const previous = held || {};
             const config = {
                 schemaVersion: payload.schemaVersion || 0,
-                schema: Array.isArray(payload.schema) ? payload.schema : [],
-                values: (payload && payload.values && typeof payload.values === 'object') ? payload.values : {},
+                schema: Array.isArray(payload.schema) ? payload.schema : (Array.isArray(previous.schema) ? previous.schema : []),
+                values: (payload && payload.values && typeof payload.values === 'object') ? payload.values : (previous.values || {}),
                 language: payload && payload.language ? String(payload.language) : 'en',
-                locales: Array.isArray(payload && payload.locales) ? payload.locales : [],
-                translations: (payload && payload.translations && typeof payload.translations === 'object') ? payload.translations : {},
+                locales: Array.isArray(payload && payload.locales) ? payload.locales : (Array.isArray(previous.locales) ? previous.locales : []),
+                translations: (payload && payload.translations && typeof payload.translations === 'object') ? payload.translations : (previous.translations || {}),
+                etags: (payload && payload.etags && typeof payload.etags === 'object') ? payload.etags : {},
                 lastFetched: Date.now()
             };
             applyTranslationBundle({
                 language: config.language,
                 locales: config.locales,
-                strings: config.translations
+                strings: config.translations,
+                etag: config.etags.translations
             });
             window.__SkyToolsSettings = config;
             return config;
@@ -1801,11 +1850,11 @@
         }
 
         function pollUnfixStatus(appid, itemEl, deleteBtn, container) {
-            let pollCount = 0;
-            const maxPolls = 60;
+            const deadline = Date.now() + 30000;
+            let version = 0;
 
             function checkStatus() {
-                if (pollCount >= maxPolls) {
+                if (Date.now() >= deadline) {
                     alert(t('settings.installedFixes.deleteError', 'Failed to remove fix.') + ' (Timeout)');
                     deleteBtn.dataset.busy = '0';
                     deleteBtn.style.opacity = '1';
@@ -1813,9 +1862,7 @@
                     return;
                 }
 
-                pollCount++;
-
-                Millennium.callServerMethod('skytools', 'GetUnfixStatus', { appid: appid, contentScriptQuery: '' })
+                waitForJobUpdate(appid, 'unfix', version)
                     .then(function (res) {
                         const response = typeof res === 'string' ? JSON.parse(res) : res;
                         if (!response || !response.success) {
@@ -1825,6 +1872,7 @@
 
                         const state = response.state || {};
                         const status = state.status;
+                        version = state.version || version;
 
                         if (status === 'done' && state.success) {
                             // Success - remove item from list with animation
@@ -1857,7 +1905,7 @@
                             return;
                         } else {
                             // Still in progress
-                            setTimeout(checkStatus, 500);
+                            checkStatus();
                         }
                     })
                     .catch(function (err) {
@@ -2152,6 +2200,10 @@
                         if (response && response.translations && typeof response.translations === 'object') {
                             window.__SkyToolsSettings.translations = response.translations;
                         }
+                        if (window.__SkyToolsSettings.etags) {
+                            if (response && response.valuesEtag) window.__SkyToolsSettings.etags.values = response.valuesEtag;
+                            if (response && response.translationsEtag) window.__SkyToolsSettings.etags.translations = response.translationsEtag;
+                        }
                         if (response && response.language) {
                             window.__SkyToolsSettings.language = response.language;
                         }
@@ -2162,7 +2214,8 @@
                     applyTranslationBundle({
                         language: response.language || (window.__SkyToolsI18n && window.__SkyToolsI18n.language) || 'en',
                         locales: (window.__SkyToolsI18n && window.__SkyToolsI18n.locales) || (state.config && state.config.locales) || [],
-                        strings: response.translations
+                        strings: response.translations,
+                        etag: response.translationsEtag
                     });
                     applyStaticTranslations();
                     updateButtonTranslations();
@@ -2772,13 +2825,15 @@
     // Poll backend for progress and update progress bar and text
     function startPolling(appid) {
         let done = false;
-        const timer = setInterval(() => {
-            if (done) { clearInterval(timer); return; }
+        let version = 0;
+        const poll = function () {
+            if (done) return;
             try {
-                Millennium.callServerMethod('skytools', 'GetAddViaSkyToolsStatus', { appid, contentScriptQuery: '' }).then(function (res) {
+                waitForJobUpdate(appid, 'add', version).then(function (res) {
                     try {
                         const payload = typeof res === 'string' ? JSON.parse(res) : res;
                         const st = payload && payload.state ? payload.state : {};
+                        version = st.version || version;
 
                         // Try to find overlay (may or may not be visible)
                         const overlay = document.querySelector('.skytools-overlay');
@@ -2791,6 +2846,7 @@
                         // Update UI if overlay is present
                         if (st.currentApi && title) title.textContent = lt('SkyTools · {api}').replace('{api}', st.currentApi);
                         if (status) {
+                            if (st.status === 'queued') status.textContent = queuedLabel(st);
                             if (st.status === 'checking') status.textContent = lt('Checking availability…');
                             if (st.status === 'downloading') status.textContent = lt('Downloading…');
                             if (st.status === 'processing') status.textContent = lt('Processing package…');
@@ -2825,7 +2881,7 @@
                             if (wrap || percent) {
                                 setTimeout(function () { if (wrap) wrap.style.display = 'none'; if (percent) percent.style.display = 'none'; }, 300);
                             }
-                            done = true; clearInterval(timer);
+                            done = true;
                             runState.inProgress = false; runState.appid = null;
                             // remove button since game is added (works even if popup is hidden)
                             const btnEl = document.querySelector('.skytools-button');
@@ -2843,13 +2899,18 @@
                             if (hideBtn) hideBtn.innerHTML = '<span>' + lt('Close') + '</span>';
                             if (wrap) wrap.style.display = 'none';
                             if (percent) percent.style.display = 'none';
-                            done = true; clearInterval(timer);
+                            done = true;
                             runState.inProgress = false; runState.appid = null;
                         }
                     } catch (_) { }
+                    poll();
+                }, function () {
+                    // Bridge error: back off briefly instead of spinning
+                    setTimeout(poll, 1000);
                 });
-            } catch (_) { clearInterval(timer); }
-        }, 300);
+            } catch (_) { done = true; }
+        };
+        poll();
     }
 
     // Also try after a delay to catch dynamically loaded content
@@ -0,0 +1,30 @@
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+# Backend modules import each other as top-level modules (Millennium runs
+# them with backend/ on sys.path), so the tests do the same.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+# PluginUtils is injected by Millennium at runtime. Outside Steam, logger.py
+# gets a stand-in that forwards to the standard logging module.
+if importlib.util.find_spec("PluginUtils") is None:
+
+    class _Logger:
+        def __init__(self) -> None:
+            self._log = logging.getLogger("luatools")
+
+        def log(self, message: str) -> None:
+            self._log.info(message)
+
+        def warn(self, message: str) -> None:
+            self._log.warning(message)
+
+        def error(self, message: str) -> None:
+            self._log.error(message)
+
+    _plugin_utils = types.ModuleType("PluginUtils")
+    _plugin_utils.Logger = _Logger
+    sys.modules["PluginUtils"] = _plugin_utils
@@ -0,0 +1,153 @@
+"""Benchmarks of backend/vdf.py against the old line/regex parser.
+
+Synthetic libraryfolders.vdf, appmanifest and config.vdf files of realistic
+shape (a few MB for config.vdf) are parsed by both. Needs pytest-benchmark;
+the module is skipped without it.
+
+    python -m pytest tests/test_bench_vdf.py
+"""
+
+import re
+from typing import Dict
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from vdf import find_vdf_value, find_vdf_values, parse_vdf  # noqa: E402
+
+
+def legacy_parse_vdf(content: str) -> Dict[str, any]:
+    """The previous steam_utils._parse_vdf_simple, kept verbatim for comparison."""
+    result: Dict[str, any] = {}
+    stack = [result]
+    current_key = None
+
+    lines = content.split("\n")
+    tokens = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        parts = re.findall(r'"[^"]*"|\{|\}', line)
+        tokens.extend(parts)
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i].strip('"')
+
+        if tokens[i] == "{":
+            if current_key:
+                new_dict = {}
+                stack[-1][current_key] = new_dict
+                stack.append(new_dict)
+                current_key = None
+        elif tokens[i] == "}":
+            if len(stack) > 1:
+                stack.pop()
+        elif current_key is None:
+            current_key = token
+        else:
+            stack[-1][current_key] = token
+            current_key = None
+        i += 1
+
+    return result
+
+
+def _block(name: str, body: str, indent: int) -> str:
+    pad = "\t" * indent
+    return f'{pad}"{name}"\n{pad}{{\n{body}{pad}}}\n'
+
+
+def _pair(key: str, value: str, indent: int) -> str:
+    pad = "\t" * indent
+    return f'{pad}"{key}"\t\t"{value}"\n'
+
+
+def make_libraryfolders() -> str:
+    folders = []
+    for index in range(4):
+        apps = "".join(_pair(str(100000 + index * 10000 + n), str(n * 1048576), 3) for n in range(200))
+        body = (
+            _pair("path", f"D:/SteamLibrary{index}", 2)
+            + _pair("label", "", 2)
+            + _pair("contentid", str(7700000000 + index), 2)
+            + _pair("totalsize", "0", 2)
+            + _block("apps", apps, 2)
+        )
+        folders.append(_block(str(index), body, 1))
+    return _block("libraryfolders", "".join(folders), 0)
+
+
+def make_appmanifest() -> str:
+    depots = "".join(
+        _block(str(228990 + n), _pair("manifest", str(8000000000000000000 + n), 3) + _pair("size", str(n * 4096), 3), 2)
+        for n in range(100)
+    )
+    body = (
+        _pair("appid", "228980", 1)
+        + _pair("universe", "1", 1)
+        + _pair("name", "Steamworks Common Redistributables", 1)
+        + _pair("StateFlags", "4", 1)
+        + _pair("installdir", "Steamworks Shared", 1)
+        + _block("InstalledDepots", depots, 1)
+        + _block("UserConfig", _pair("language", "english", 2), 1)
+    )
+    return _block("AppState", body, 0)
+
+
+def make_config() -> str:
+    depots = "".join(_block(str(1000000 + n), _pair("DecryptionKey", f"{n:064x}", 6), 5) for n in range(5000))
+    apps = "".join(
+        _block(str(2000000 + n), _pair("LastPlayed", "1700000000", 6) + _pair("cloud", "1", 6), 5)
+        for n in range(2000)
+    )
+    steam = _block("depots", depots, 4) + _block("apps", apps, 4)
+    tree = _block("Steam", steam, 3)
+    tree = _block("Valve", tree, 2)
+    tree = _block("Software", tree, 1)
+    return _block("InstallConfigStore", tree, 0)
+
+
+SAMPLES = {
+    "libraryfolders": make_libraryfolders,
+    "appmanifest": make_appmanifest,
+    "config": make_config,
+}
+
+
+@pytest.fixture(scope="module", params=sorted(SAMPLES))
+def sample(request):
+    return SAMPLES[request.param]()
+
+
+@pytest.fixture(scope="module")
+def appmanifest():
+    return make_appmanifest()
+
+
+def test_legacy_parser(benchmark, sample):
+    benchmark.group = "parse"
+    assert benchmark(legacy_parse_vdf, sample) == parse_vdf(sample)
+
+
+def test_parse_vdf(benchmark, sample):
+    benchmark.group = "parse"
+    assert benchmark(parse_vdf, sample) == legacy_parse_vdf(sample)
+
+
+def test_find_vdf_value_early_exit(benchmark, appmanifest):
+    benchmark.group = "appmanifest lookup"
+    assert benchmark(find_vdf_value, appmanifest, "AppState", "installdir") == "Steamworks Shared"
+
+
+def test_find_vdf_values_early_exit(benchmark, appmanifest):
+    benchmark.group = "appmanifest lookup"
+    result = benchmark(find_vdf_values, appmanifest, ("AppState", "installdir"), ("AppState", "name"))
+    assert result == ["Steamworks Shared", "Steamworks Common Redistributables"]
+
+
+def test_parse_vdf_full_lookup(benchmark, appmanifest):
+    benchmark.group = "appmanifest lookup"
+    assert benchmark(lambda: parse_vdf(appmanifest)["AppState"]["installdir"]) == "Steamworks Shared"
@@ -0,0 +1,128 @@
+import httpx
+import pytest
+
+import host_health as hh
+from host_health import FAILURE_THRESHOLD, HostHealth, HostUnavailableError
+
+URL = "https://mirror.example/file.zip"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive both wall-clock and monotonic time as seen by host_health."""
+
+    class Clock:
+        now = 1_700_000_000.0
+
+        @classmethod
+        def advance(cls, seconds):
+            cls.now += seconds
+
+    monkeypatch.setattr(hh.time, "time", lambda: Clock.now)
+    monkeypatch.setattr(hh.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def health(tmp_path, clock):
+    breaker = HostHealth()
+    breaker.db_path = str(tmp_path / "cache.db")
+    yield breaker
+    breaker.close()
+
+
+def _open(breaker):
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.record_failure(URL, "HTTP 503")
+
+
+def _state(breaker):
+    return next(item["state"] for item in breaker.snapshot() if item["host"] == "mirror.example")
+
+
+def test_closed_until_threshold(health):
+    for _ in range(FAILURE_THRESHOLD - 1):
+        health.record_failure(URL, "HTTP 503")
+        assert not health.is_open(URL)
+    health.record_failure(URL, "HTTP 503")
+    assert health.is_open(URL)
+    assert _state(health) == "open"
+
+
+def test_half_open_allows_a_single_trial(health, clock):
+    _open(health)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert _state(health) == "half-open"
+
+    assert not health.is_open(URL)  # this caller is the trial
+    assert health.is_open(URL)
+    assert health.is_open(URL)
+    # Sorting for display/ordering must not steal or consume the trial.
+    assert health.order_by_health(["https://other.example/", URL], lambda url: url)[-1] == URL
+
+
+def test_successful_trial_closes(health, clock):
+    _open(health)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert not health.is_open(URL)
+    health.record_success(URL, 0.05)
+    assert _state(health) == "closed"
+    assert not health.is_open(URL)
+    assert not health.is_open(URL)
+
+
+def test_failed_trial_reopens_with_longer_cooldown(health, clock):
+    _open(health)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert not health.is_open(URL)
+    health.record_failure(URL, "HTTP 502")
+    assert _state(health) == "open"
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert health.is_open(URL)  # cooldown doubled
+    clock.advance(hh.BASE_COOLDOWN_SECONDS)
+    assert not health.is_open(URL)
+
+
+def test_unreported_trial_expires(health, clock):
+    _open(health)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert not health.is_open(URL)
+    assert health.is_open(URL)
+    clock.advance(hh.TRIAL_LEASE_SECONDS + 1)
+    assert not health.is_open(URL)  # a new trial is handed out
+
+
+def test_released_trial_goes_to_next_caller(health, clock):
+    _open(health)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert not health.is_open(URL)
+    health.release_trial(URL)
+    assert not health.is_open(URL)
+    assert health.is_open(URL)
+
+
+def test_call_counts_only_host_faults(health):
+    def local_error():
+        raise OSError("disk full")
+
+    for _ in range(FAILURE_THRESHOLD + 1):
+        with pytest.raises(OSError):
+            health.call(URL, local_error)
+    assert not health.is_open(URL)
+
+    too_many = httpx.Response(429)
+    for _ in range(FAILURE_THRESHOLD):
+        assert health.call(URL, lambda: too_many) is too_many
+    with pytest.raises(HostUnavailableError):
+        health.call(URL, lambda: httpx.Response(200))
+
+
+def test_state_survives_restart(health, clock, tmp_path):
+    _open(health)
+    restarted = HostHealth()
+    restarted.db_path = health.db_path
+    assert restarted.is_open(URL)
+    clock.advance(hh.BASE_COOLDOWN_SECONDS + 1)
+    assert not restarted.is_open(URL)
+    assert restarted.is_open(URL)
+    restarted.close()
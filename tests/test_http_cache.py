@@ -0,0 +1,121 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import http_cache
+from http_cache import conditional_get, is_cache_hit, validator_headers
+
+
+class _Origin:
+    """State of the stand-in server; tests change it between requests."""
+
+    def __init__(self) -> None:
+        self.etag = '"v1"'
+        self.last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        self.body = b'{"version": 1}'
+        self.requests = []
+
+
+@pytest.fixture
+def origin():
+    state = _Origin()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requests.append(dict(self.headers))
+            if self.headers.get("If-None-Match") == state.etag:
+                self.send_response(304)
+                self.send_header("ETag", state.etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(state.body)))
+            self.send_header("ETag", state.etag)
+            self.send_header("Last-Modified", state.last_modified)
+            self.end_headers()
+            self.wfile.write(state.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}/manifest.json"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_INDEX_FILE", str(tmp_path / "http_cache.json"))
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_BODY_DIR", str(tmp_path / "http_cache"))
+    monkeypatch.setattr(http_cache, "_INDEX", None)
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    with httpx.Client() as client:
+        yield client
+
+
+def test_first_get_stores_validators(origin, client):
+    response = conditional_get(client, origin.url)
+    assert response.status_code == 200
+    assert response.content == origin.body
+    assert not is_cache_hit(response)
+    assert "If-None-Match" not in origin.requests[0]
+    assert validator_headers(origin.url) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+
+
+def test_not_modified_is_served_from_cache(origin, client):
+    conditional_get(client, origin.url)
+    response = conditional_get(client, origin.url)
+    assert origin.requests[1]["If-None-Match"] == '"v1"'
+    assert origin.requests[1]["If-Modified-Since"] == origin.last_modified
+    assert response.status_code == 200
+    assert is_cache_hit(response)
+    assert response.content == b'{"version": 1}'
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.json() == {"version": 1}
+
+
+def test_changed_etag_replaces_entry(origin, client):
+    conditional_get(client, origin.url)
+    origin.etag = '"v2"'
+    origin.last_modified = "Thu, 02 Jan 2025 00:00:00 GMT"
+    origin.body = b'{"version": 2}'
+
+    response = conditional_get(client, origin.url)
+    assert response.status_code == 200
+    assert not is_cache_hit(response)
+    assert response.content == b'{"version": 2}'
+    assert validator_headers(origin.url)["If-None-Match"] == '"v2"'
+
+    # The replaced entry now answers the next 304.
+    cached = conditional_get(client, origin.url)
+    assert is_cache_hit(cached)
+    assert cached.content == b'{"version": 2}'
+    assert len(origin.requests) == 3
+
+
+def test_not_modified_without_body_refetches(origin, client):
+    conditional_get(client, origin.url)
+    os.remove(http_cache._body_path(origin.url))
+    response = conditional_get(client, origin.url)
+    assert response.status_code == 200
+    assert not is_cache_hit(response)
+    assert response.content == origin.body
+    # 304 first, then an unconditional retry.
+    assert "If-None-Match" not in origin.requests[2]
@@ -0,0 +1,78 @@
+import pytest
+
+import rate_limit
+from rate_limit import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze ``time.monotonic`` as seen by rate_limit; advance via ``clock.now``."""
+
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+
+def test_burst_then_paced(clock):
+    bucket = TokenBucket(rate_per_second=2.0, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.5)
+    assert waits[4] == pytest.approx(1.0)
+
+
+def test_reservations_after_penalize_are_spread(clock):
+    bucket = TokenBucket(rate_per_second=2.0, burst=3)
+    pause = bucket.penalize(retry_after=10)
+    rate = bucket.rate  # halved by the penalty
+    assert pause == 10
+    assert rate == pytest.approx(1.0)
+
+    callers = 8
+    waits = [bucket.reserve() for _ in range(callers)]
+
+    # Nobody goes before the server's Retry-After.
+    assert min(waits) >= pause
+    # At most a burst lands when the pause ends...
+    assert sum(1 for wait in waits if wait == pytest.approx(pause)) <= bucket.burst
+    # ...and the rest follow at the reduced rate.
+    assert waits == sorted(waits)
+    for earlier, later in zip(waits[bucket.burst - 1 :], waits[bucket.burst :]):
+        assert later - earlier == pytest.approx(1.0 / rate)
+    assert waits[-1] == pytest.approx(pause + (callers - bucket.burst) / rate)
+
+
+def test_reservations_after_penalize_are_spread_across_calls(clock):
+    bucket = TokenBucket(rate_per_second=2.0, burst=2)
+    bucket.penalize(retry_after=5)  # rate drops to 1/s
+    first = [bucket.reserve() for _ in range(4)]
+    clock.now += 3  # still inside the pause
+    second = [bucket.reserve() + 3 for _ in range(2)]
+    assert first + second == pytest.approx([5, 5, 6, 7, 8, 9])
+
+
+def test_reserve_respects_max_wait(clock):
+    bucket = TokenBucket(rate_per_second=1.0, burst=1)
+    bucket.penalize(retry_after=30)
+    assert bucket.reserve(max_wait=5) is None
+    # A refused reservation does not consume anything.
+    assert bucket.reserve() == pytest.approx(30)
+    assert bucket.reserve() == pytest.approx(30 + 1 / bucket.rate)
+
+
+def test_record_success_recovers_rate(clock):
+    bucket = TokenBucket(rate_per_second=4.0, burst=1)
+    bucket.penalize(retry_after=0)
+    assert bucket.rate == pytest.approx(2.0)
+    for _ in range(10):
+        bucket.record_success()
+    assert bucket.rate == pytest.approx(4.0)
+
+
+def test_parse_retry_after():
+    assert rate_limit.parse_retry_after("7") == 7.0
+    assert rate_limit.parse_retry_after("") is None
+    assert rate_limit.parse_retry_after("soon") is None
+    assert rate_limit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+
+import vdf
+from vdf import find_vdf_value, find_vdf_values, parse_vdf
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+APP_MANIFEST = """
+"AppState"
+{
+	"appid"		"228980"
+	"name"		"Steamworks Common Redistributables"
+	"installdir"		"Steamworks Shared"
+	"InstalledDepots"
+	{
+		"228990"
+		{
+			"manifest"		"1829726630299308803"
+			"size"		"39546677"
+		}
+	}
+	"UserConfig"
+	{
+		"language"		"english"
+	}
+}
+"""
+
+
+def test_libraryfolders_fixture():
+    content = (FIXTURES / "libraryfolders.vdf").read_text(encoding="utf-8")
+    parsed = parse_vdf(content)
+    folders = parsed["libraryfolders"]
+    assert sorted(folders) == ["0", "1"]
+    # Escaped backslashes come back as single ones, ready to use as a path.
+    assert folders["0"]["path"] == "C:\\Program Files (x86)\\Steam"
+    assert folders["1"]["path"] == "D:\\SteamLibrary"
+    assert folders["0"]["label"] == ""
+    assert folders["0"]["apps"] == {"228980": "175510343", "250820": "4982718464"}
+    assert folders["1"]["apps"] == {"1245620": "60372373815"}
+    assert find_vdf_value(content, "libraryfolders", "1", "label") == "Games"
+
+
+def test_escaped_quotes_and_backslashes():
+    content = r'''
+    "root"
+    {
+        "quoted"    "say \"hi\""
+        "path"      "C:\\Games\\"
+        "tabbed"    "a\tb\nc"
+        "brace"     "{not a block}"
+    }
+    '''
+    root = parse_vdf(content)["root"]
+    assert root["quoted"] == 'say "hi"'
+    assert root["path"] == "C:\\Games\\"
+    assert root["tabbed"] == "a\tb\nc"
+    assert root["brace"] == "{not a block}"
+
+
+def test_comments_and_conditionals_are_skipped():
+    content = """
+    // leading comment
+    "root"
+    {
+        "a"    "1"    // trailing comment
+        // "b"    "ignored"
+        "c"    "2"    [$WIN32]
+        "url"  "https://example.com/x"
+    }
+    """
+    assert parse_vdf(content) == {"root": {"a": "1", "c": "2", "url": "https://example.com/x"}}
+
+
+def test_bare_words_and_duplicate_keys():
+    content = 'root { key value "key" "later" other 3 }'
+    assert parse_vdf(content) == {"root": {"key": "later", "other": "3"}}
+
+
+def test_unbalanced_input_does_not_raise():
+    assert parse_vdf('"a" { "b" "1" } } }') == {"a": {"b": "1"}}
+    assert parse_vdf('"a" { "b" { "c" "1"') == {"a": {"b": {"c": "1"}}}
+    assert parse_vdf("") == {}
+
+
+def test_find_vdf_values_strings_and_subtrees():
+    installdir, depots, missing = find_vdf_values(
+        APP_MANIFEST,
+        ("AppState", "installdir"),
+        ("AppState", "InstalledDepots"),
+        ("AppState", "nope"),
+    )
+    assert installdir == "Steamworks Shared"
+    assert depots == {"228990": {"manifest": "1829726630299308803", "size": "39546677"}}
+    assert missing is None
+
+
+def test_find_vdf_value_matches_parse_vdf():
+    parsed = parse_vdf(APP_MANIFEST)["AppState"]
+    for key in ("appid", "name", "installdir"):
+        assert find_vdf_value(APP_MANIFEST, "AppState", key) == parsed[key]
+    assert find_vdf_value(APP_MANIFEST, "AppState", "UserConfig") == parsed["UserConfig"]
+
+
+@pytest.fixture
+def token_counter(monkeypatch):
+    consumed = []
+    original = vdf._tokens
+
+    def counting(content):
+        for token in original(content):
+            consumed.append(token)
+            yield token
+
+    monkeypatch.setattr(vdf, "_tokens", counting)
+    return consumed
+
+
+def test_find_vdf_value_stops_after_last_match(token_counter):
+    depots = "".join(f'"{n}" {{ "manifest" "{n}" }}\n' for n in range(1000))
+    content = f'"AppState" {{ "installdir" "Game" "InstalledDepots" {{ {depots} }} }}'
+    assert find_vdf_value(content, "AppState", "installdir") == "Game"
+    # "AppState", "{", "installdir", "Game" and at most one more token.
+    assert len(token_counter) <= 5
+
+
+def test_find_vdf_values_keeps_reading_until_every_path_is_seen(token_counter):
+    filler = "".join(f'"k{n}" "v{n}"\n' for n in range(100))
+    content = f'"root" {{ "first" "1" {filler} "last" "2" "tail" {{ {filler} }} }}'
+    assert find_vdf_values(content, ("root", "first"), ("root", "last")) == ["1", "2"]
+    assert len(token_counter) < 2 * 100 + 10